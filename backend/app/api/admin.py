@@ -0,0 +1,107 @@
+# backend/app/api/admin.py
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from ..core import profiling, slowlog
+from ..core.config import settings
+from ..core.database import engine, async_engine, replicas
+from ..core.pool import pool_status
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)):
+    """校验 X-Admin-Token 请求头；未配置 ADMIN_TOKEN（及 PROFILING_TOKEN）时管理接口不可用"""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="管理接口未启用（未设置 ADMIN_TOKEN）"
+        )
+    expected = settings.ADMIN_TOKEN.encode("utf-8")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token.encode("utf-8"), expected):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="缺少或无效的 X-Admin-Token"
+        )
+
+
+# 运维相关的接口（连接池指标、慢查询日志、请求剖析结果等），全部需要 X-Admin-Token
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+    dependencies=[Depends(require_admin_token)],
+)
+
+
+# -----------------------------------------------------
+# 连接池指标 (GET /admin/pool)
+# -----------------------------------------------------
+@router.get("/pool")
+def read_pool_status():
+    """
+    获取数据库连接池的配置、当前状态和累计指标。
+
+    - sync: 同步引擎（启动、迁移、导入导出，以及同步模式下的所有请求）
+    - async: 异步引擎（仅异步模式，否则为 null）
+    - replicas: 只读副本的健康状态和同步引擎连接池（未配置副本时为空列表）
+
+    waits / wait_time_seconds 持续增长说明连接池已耗尽，请求在等待连接，可调大 DB_POOL_SIZE / DB_MAX_OVERFLOW。
+    """
+    return {
+        "sync": pool_status(engine),
+        "async": pool_status(async_engine.sync_engine) if async_engine is not None else None,
+        "replicas": [
+            {**status, "pool": pool_status(replica.engine)}
+            for replica, status in zip(replicas.replicas, replicas.status())
+        ],
+    }
+
+
+# -----------------------------------------------------
+# 慢查询日志 (GET /admin/slow-queries)
+# -----------------------------------------------------
+@router.get("/slow-queries")
+def read_slow_queries(limit: Optional[int] = Query(None, ge=1, description="最多返回的条数")):
+    """
+    获取最近的慢查询（新的在前）：crud.task 中耗时超过 SLOW_QUERY_THRESHOLD 秒的 SQL。
+
+    每条包含 SQL、绑定参数（默认只有类型，SLOW_QUERY_LOG_PARAMETERS=true 时为实际值）、耗时、发起查询的 crud 函数和执行计划（首次读取时用主库的新连接执行 EXPLAIN），
+    plan_problems 列出执行计划中的全表扫描和额外排序。
+    """
+    return slowlog.recent(engine, limit)
+
+
+@router.delete("/slow-queries")
+def clear_slow_queries():
+    """清空慢查询日志（例如调整索引后重新观察）"""
+    return {"cleared": slowlog.clear()}
+
+
+# -----------------------------------------------------
+# 请求剖析结果 (GET /admin/profiles)
+# -----------------------------------------------------
+@router.get("/profiles")
+def read_profiles():
+    """
+    获取最近的请求剖析结果汇总（新的在前）。
+
+    请求带 X-Profile 请求头或 profile 查询参数（值为 PROFILING_TOKEN）时才会剖析，响应头 X-Profile-Id 为剖析编号。
+    """
+    return profiling.recent_profiles()
+
+
+@router.get("/profiles/{profile_id}")
+def read_profile(profile_id: int, format: str = Query("json", pattern="^(json|folded)$")):
+    """
+    获取一个请求的剖析结果。
+
+    - json: 请求信息，以及按自身采样数排序的函数（self 为位于栈顶的采样数，total 为出现在调用栈中的采样数）
+    - folded: 每行“外层;...;内层 采样数”，可直接交给 flamegraph.pl 或 speedscope 生成火焰图
+    """
+    profile = profiling.get_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="剖析结果不存在或已被新的结果替换")
+    if format == "folded":
+        return PlainTextResponse(profile.folded())
+    return {**profile.summary(), "functions": profile.functions()}
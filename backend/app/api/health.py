@@ -0,0 +1,47 @@
+# backend/app/api/health.py
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from .. import startup
+
+# 健康检查接口（供编排系统的存活 / 就绪探针使用），初始化完成前也可访问
+router = APIRouter(
+    prefix="/health",
+    tags=["Health"],
+)
+
+
+# -----------------------------------------------------
+# 1. 存活检查 (GET /health/live)
+# -----------------------------------------------------
+@router.get("/live")
+def read_liveness():
+    """
+    进程存活即返回 200，不访问数据库（数据库暂时不可用不应导致进程被重启）。
+
+    启动初始化失败（等待数据库超过 STARTUP_MAX_ATTEMPTS 次或初始化出错）后返回 503。
+    """
+    status_code = 503 if startup.state.failed else 200
+    return JSONResponse(startup.state.as_dict(), status_code=status_code)
+
+
+# -----------------------------------------------------
+# 2. 就绪检查 (GET /health/ready)
+# -----------------------------------------------------
+@router.get("/ready")
+async def read_readiness():
+    """
+    启动初始化已完成且数据库当前可连接时返回 200，否则返回 503。
+
+    返回启动进度：ready_seconds 为初始化耗时，first_request_seconds 为开始处理第一个业务请求的耗时（均从进程加载应用时算起）。
+    """
+    body = startup.state.as_dict()
+    body["database"] = "unknown"
+    if startup.state.ready:
+        try:
+            await startup.ping_database()
+            body["database"] = "ok"
+        except Exception as e:
+            body["database"] = f"error: {e!r}"
+    status_code = 200 if body["database"] == "ok" else 503
+    return JSONResponse(body, status_code=status_code)
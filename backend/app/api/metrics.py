@@ -0,0 +1,42 @@
+# backend/app/api/metrics.py
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ..core.database import engine, async_engine, replicas
+from ..core.metrics import metrics, render_pools, render_replicas
+from ..core.config import settings
+from ..core.pool import pool_status
+
+# Prometheus 抓取接口，初始化完成前也可访问
+router = APIRouter(
+    tags=["Metrics"],
+)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# -----------------------------------------------------
+# Prometheus 指标 (GET /metrics)
+# -----------------------------------------------------
+@router.get("/metrics", response_class=PlainTextResponse)
+def read_metrics():
+    """
+    以 Prometheus 文本格式输出指标。
+
+    - http_requests_total / http_request_duration_seconds: 按方法、路由模板、状态码统计的请求数和延迟直方图
+    - http_request_db_queries / http_request_db_seconds: 每个请求执行的 SQL 条数和数据库耗时直方图，
+      用于发现逐行查询（N+1）等回归
+    - db_pool_*: 各引擎连接池的状态和累计指标（engine 标签为 sync、async 或只读副本名）
+
+    METRICS_ENABLED=false 时只输出连接池指标。
+    """
+    pools = [("sync", pool_status(engine))]
+    if async_engine is not None:
+        pools.append(("async", pool_status(async_engine.sync_engine)))
+    pools += [(replica.name, pool_status(replica.engine)) for replica in replicas.replicas]
+
+    lines = metrics.render() if settings.METRICS_ENABLED else []
+    lines += render_pools(pools)
+    if replicas:
+        lines += render_replicas(replicas.status())
+    return PlainTextResponse("\n".join(lines) + "\n", media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,17 +1,52 @@
 # backend/app/api/tasks.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
+import asyncio
+import tempfile
+import time
+from starlette.concurrency import run_in_threadpool
 
 # 导入核心依赖和 CRUD 逻辑
-from ..core.database import get_db
+from ..core.config import settings
+from ..core.database import (
+    get_db, get_read_session, get_session, is_replica_session, read_session_factory, replicas, run_db, DBSession
+)
+from ..core import cache, changefeed, conditional, export, serialize
+from ..core.jsonstream import JSONStreamError, RecordError, iter_json_records, iter_ndjson_records
 from .. import crud
 
 # 显式导入 Pydantic 模型，确保路由签名和响应模型可以正确引用
-from ..schemas.task import Task, TaskCreate, TaskUpdate
-from pydantic import BaseModel 
+from ..schemas.task import (
+    Task, TaskCreate, TaskUpdate, TaskStats, ImportRowError, ImportSummary, TaskBatchRequest, TaskBatchResult,
+    TaskChanges
+)
+from pydantic import BaseModel, ValidationError
+
+# 游标分页：单页最大条数，以及携带下一页游标的响应头
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# 列表缓存命中情况（HIT / MISS）
+CACHE_STATUS_HEADER = "X-Cache"
+# 批量导入：每批插入耗时
+SERVER_TIMING_HEADER = "Server-Timing"
+# 变更事件流：无事件时发送心跳注释的间隔（秒），防止代理断开空闲连接；EventSource 断线后的重连间隔（毫秒）
+EVENTS_HEARTBEAT_SECONDS = 15
+EVENTS_RETRY_MS = 3000
+# 流式导入：按 NDJSON 解析的 Content-Type，以及返回的失败明细条数上限
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+MAX_IMPORT_ERRORS = 100
+# 流式导出：每次从数据库读取的行数
+EXPORT_BATCH_SIZE = 1000
+# 列式导入：上传文件超过该大小（字节）时暂存到磁盘；导入时读取的列
+COLUMNAR_SPOOL_SIZE = 32 * 1024 * 1024
+COLUMNAR_IMPORT_FIELDS = ("title", "description", "category", "priority", "due_date", "is_completed")
+
+# 说明：增删改查、统计和流式导入路由通过 get_session + run_db 访问数据库，DATABASE_URL 使用异步驱动时
+# 走 AsyncSession，不占用线程池；导入/导出属于批量操作，仍使用同步会话。
+# 配置了只读副本时，列表、统计和导出通过 get_read_session / read_session_factory 读取副本，其余路由访问主库。
 
 # 路由器实例，所有任务相关的路由都将添加到这里
 router = APIRouter(
@@ -19,11 +54,27 @@ router = APIRouter(
     tags=["Tasks"], # 用于 Swagger UI 分组
 )
 
+async def _check_not_modified(
+    request: Request,
+    db: DBSession,
+    depends_on_date: bool = False
+) -> Tuple[Dict[str, str], Optional[Response], int]:
+    """读取任务表版本号，生成 ETag 等响应头；请求的缓存仍然有效时同时返回 304 响应
+
+    在执行查询之前调用，版本未变化时只需一次主键查询。同时返回版本号，用作列表缓存的键。
+    """
+    table_version, last_modified = await run_db(db, crud.version.get_version)
+    etag = conditional.make_etag(request, table_version, depends_on_date=depends_on_date)
+    headers = conditional.validator_headers(etag, last_modified)
+    if conditional.is_not_modified(request, etag, last_modified):
+        return headers, conditional.not_modified_response(headers), table_version
+    return headers, None, table_version
+
 # -----------------------------------------------------
 # 1. CREATE: 添加待办事项 (POST /tasks/)
 # -----------------------------------------------------
 @router.post("/", response_model=Task, status_code=status.HTTP_201_CREATED)
-def create_task_endpoint(task: TaskCreate, db: Session = Depends(get_db)):
+async def create_task_endpoint(task: TaskCreate, db: DBSession = Depends(get_session)):
     """
     添加一个新的待办事项。
     
@@ -37,19 +88,23 @@ def create_task_endpoint(task: TaskCreate, db: Session = Depends(get_db)):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="任务标题不能为空。"
         )
-    return crud.task.create_task(db=db, task=task)
+    return await run_db(db, crud.task.create_task, task=task)
 
 # -----------------------------------------------------
 # 2. READ: 查看待办事项列表 (GET /tasks/)
 # -----------------------------------------------------
 @router.get("/", response_model=List[Task])
-def read_tasks_endpoint(
+async def read_tasks_endpoint(
+    request: Request,
     is_completed: Optional[bool] = None, # 过滤条件：是否完成
     category: Optional[str] = None,      # 扩展过滤条件：分类
-    sort_by: Optional[str] = None,        # 排序方式：priority, due_date, 或 None（默认创建时间）
+    sort_by: Optional[str] = None,        # 排序方式：priority, due_date, relevance, 或 None（默认创建时间）
     search: Optional[str] = None,        # 搜索关键词：在标题、描述、分类中搜索
     date_filter: Optional[str] = None,   # 日期筛选：overdue, today, tomorrow, this_week, this_month, no_due_date
-    db: Session = Depends(get_db)
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),  # 分页：每页条数，不传则返回全部
+    cursor: Optional[str] = None,        # 分页：上一页响应头 X-Next-Cursor 中的游标
+    fields: Optional[str] = None,        # 只返回指定字段（逗号分隔），如 id,title,is_completed
+    db: DBSession = Depends(get_read_session)
 ):
     """
     获取待办事项列表。
@@ -57,97 +112,366 @@ def read_tasks_endpoint(
     - 支持按完成状态 (`is_completed`) 过滤。
     - 支持按任务分类 (`category`) 过滤。
     - 支持排序：`priority`（按优先级）、`due_date`（按截止日期）、默认按创建时间倒序。
-    - 支持全文搜索 (`search`)：在标题、描述、分类中搜索关键词。
+    - 支持全文搜索 (`search`)：在标题、描述、分类中搜索关键词，使用全文索引（MySQL FULLTEXT / SQLite FTS5），
+      未指定 `sort_by` 或指定 `relevance` 时按相关度排序。
     - 支持日期筛选 (`date_filter`)：overdue（已过期）、today（今天到期）、tomorrow（明天到期）、this_week（本周到期）、this_month（本月到期）、no_due_date（无截止日期）。
+    - 支持游标分页：传入 `limit` 后只返回一页数据，若还有下一页，响应头 `X-Next-Cursor` 中给出下一页游标，
+      将其作为 `cursor` 参数（并保持其他参数不变）即可获取下一页。
+    - 不分页的列表按筛选条件缓存，任何写操作后失效；响应头 `X-Cache` 为 HIT / MISS。
+    - 列表只查询响应所需的列，按行元组直接编码为 JSON，不逐行经过 Pydantic；响应格式与 `Task` 模型一致。
+    - 支持稀疏字段 (`fields`)：逗号分隔的 `Task` 字段名，只查询并返回这些字段（`id` 总是返回），
+      例如列表卡片不需要 `description` 时可传 `fields=id,title,category,priority,due_date,is_completed`。
+    - 支持条件请求：响应带 `ETag`，请求带 `If-None-Match`（或 `If-Modified-Since`）且数据未变化时返回 304。
+    - 配置了只读副本时从副本读取；写操作响应头 `X-Read-Primary-Until` 中的时间之前带上该请求头，可读到自己刚写入的数据。
     """
-    tasks = crud.task.get_tasks(
-        db=db, 
-        is_completed=is_completed,
-        category=category,
-        sort_by=sort_by,
-        search=search,
-        date_filter=date_filter
+    try:
+        selected = crud.task.parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    validators, not_modified, table_version = await _check_not_modified(request, db, depends_on_date=bool(date_filter))
+    if not_modified is not None:
+        return not_modified
+    
+    if limit is None:
+        # 不分页的列表走缓存：缓存的是序列化后的 JSON，命中时不查询数据库、不经过 Pydantic
+        key = crud.task.tasks_cache_key(
+            is_completed=is_completed,
+            category=category,
+            sort_by=sort_by,
+            search=search,
+            date_filter=date_filter,
+            fields=selected
+        )
+        # 缓存键包含数据库中的表版本号，任何进程的写操作都会使其失效
+        body = await cache.cache_lookup(key, table_version)
+        if body is not None:
+            return Response(content=body, media_type="application/json", headers={**validators, CACHE_STATUS_HEADER: "HIT"})
+        rows = await run_db(
+            db,
+            crud.task.get_task_rows,
+            fields=selected,
+            is_completed=is_completed,
+            category=category,
+            sort_by=sort_by,
+            search=search,
+            date_filter=date_filter
+        )
+        body = serialize.encode_task_rows(rows, selected)
+        # 刚写入后副本可能尚未同步，此时从副本读到的结果不写入缓存
+        if not (is_replica_session(db) and replicas.recently_written()):
+            await cache.cache_store(key, table_version, body)
+        return Response(content=body, media_type="application/json", headers={**validators, CACHE_STATUS_HEADER: "MISS"})
+    
+    try:
+        rows, next_cursor = await run_db(
+            db,
+            crud.task.get_task_rows_page,
+            limit=limit,
+            cursor=cursor,
+            fields=selected,
+            is_completed=is_completed,
+            category=category,
+            sort_by=sort_by,
+            search=search,
+            date_filter=date_filter
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    headers = dict(validators)
+    if next_cursor is not None:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    return Response(content=serialize.encode_task_rows(rows, selected), media_type="application/json", headers=headers)
+
+# -----------------------------------------------------
+# 2.1 STATS: 任务统计 (GET /tasks/stats)
+# -----------------------------------------------------
+@router.get("/stats", response_model=TaskStats)
+async def read_task_stats_endpoint(request: Request, response: Response, db: DBSession = Depends(get_read_session)):
+    """
+    获取任务统计信息（不受筛选条件影响）。
+    
+    返回任务总数、已完成数、过期数、按分类和按优先级的完成情况，以及现有分类列表。
+    统计读取由写操作增量维护的计数表，耗时与任务总数无关，前端无需为统计再拉取全部任务。
+    支持条件请求（ETag / If-None-Match），过期数依赖当天日期，日期变化后 ETag 随之变化。
+    """
+    validators, not_modified, _ = await _check_not_modified(request, db, depends_on_date=True)
+    if not_modified is not None:
+        return not_modified
+    response.headers.update(validators)
+    return await run_db(db, crud.stats.get_task_stats)
+
+# -----------------------------------------------------
+# 2.2 EVENTS: 任务变更事件流 (GET /tasks/events)
+# -----------------------------------------------------
+@router.get("/events", response_class=StreamingResponse)
+async def task_events_endpoint(request: Request, since: Optional[str] = None):
+    """
+    以 Server-Sent Events 推送任务变更，客户端据此就地更新列表，无需每次写操作后重新获取整个列表。
+    
+    - 事件类型：`insert` / `update`（data 中带完整任务对象）、`delete`（只带 ID）、
+      `refresh`（批量操作或导入，或断线期间的事件无法补发，客户端应重新获取列表）。
+    - 每个事件带单调递增的序号，事件 ID 为 `{epoch}-{序号}`。断线重连时 EventSource 自动通过
+      `Last-Event-ID` 请求头带上最后收到的事件 ID（也可用 `since` 参数传入），服务端补发之后的事件。
+    - 事件只在本进程内传递，适用于单进程部署。
+    """
+    feed = changefeed.get_feed()
+    last_event_id = request.headers.get("last-event-id") or since
+    subscription, backlog = feed.subscribe(last_event_id)
+    
+    async def stream():
+        try:
+            yield f"retry: {EVENTS_RETRY_MS}\n\n".encode("ascii")
+            if backlog is None:
+                yield changefeed.format_event(feed, {"seq": feed.seq, "op": "refresh", "reason": "resume"})
+            for event in backlog or ():
+                yield changefeed.format_event(feed, event)
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), EVENTS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                yield changefeed.format_event(feed, event)
+                if subscription.overflowed and subscription.queue.empty():
+                    # 客户端处理过慢，期间的事件已被丢弃
+                    subscription.overflowed = False
+                    yield changefeed.format_event(feed, {"seq": feed.seq, "op": "refresh", "reason": "overflow"})
+        finally:
+            feed.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
-    return tasks
+
+# -----------------------------------------------------
+# 2.3 SYNC: 增量同步 (GET /tasks/changes)
+# -----------------------------------------------------
+@router.get("/changes", response_model=TaskChanges)
+async def read_task_changes_endpoint(
+    since: Optional[str] = None,  # 上次同步返回的水位线，不传则全量同步
+    limit: int = Query(500, ge=1, le=MAX_PAGE_SIZE),
+    db: DBSession = Depends(get_session)  # 水位线依赖已提交数据的可见性，始终读取主库
+):
+    """
+    增量同步：返回水位线 `since` 之后新增或更新的任务（`changes`）和删除的任务 ID（`deleted`）。
+    
+    - 按 (updated_at, id) 索引范围扫描，耗时与变更数量相关，与任务总数无关。
+    - 每次最多返回 `limit` 个变更和 `limit` 个删除；`has_more` 为 true 时用返回的 `watermark` 继续获取。
+    - 最后一页的水位线会回退 `SYNC_SAFETY_SECONDS` 秒，最近的变更可能在下次同步时重复返回，按 ID 覆盖即可。
+    - 删除记录保留 `SYNC_TOMBSTONE_RETENTION_DAYS` 天，水位线早于保留期时返回 410，客户端需要重新全量同步。
+    """
+    try:
+        result = await run_db(
+            db,
+            crud.sync.get_changes,
+            since=since,
+            limit=limit,
+            safety_seconds=settings.SYNC_SAFETY_SECONDS,
+            retention_days=settings.SYNC_TOMBSTONE_RETENTION_DAYS
+        )
+    except crud.sync.WatermarkExpired as e:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    body = serialize.dumps({
+        "changes": [dict(zip(serialize.TASK_FIELDS, row)) for row in result["changes"]],
+        "deleted": result["deleted"],
+        "watermark": result["watermark"],
+        "has_more": result["has_more"],
+    })
+    return Response(content=body, media_type="application/json")
 
 # -----------------------------------------------------
 # 3. UPDATE: 标记完成/更新事项 (PATCH /tasks/{task_id})
 # -----------------------------------------------------
 @router.patch("/{task_id}", response_model=Task)
-def update_task_endpoint(task_id: int, task_update: TaskUpdate, db: Session = Depends(get_db)):
+async def update_task_endpoint(task_id: int, task_update: TaskUpdate, db: DBSession = Depends(get_session)):
     """
     更新任务的标题、描述、分类或完成状态。
+    
+    直接执行 UPDATE ... RETURNING（不先查询任务），根据是否命中判断任务是否存在。
     """
-    db_task = crud.task.get_task(db, task_id=task_id)
-    if db_task is None:
+    task = await run_db(db, crud.task.update_task_by_id, task_id=task_id, task_update=task_update)
+    if task is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="任务未找到")
-        
-    return crud.task.update_task(db, db_task=db_task, task_update=task_update)
+    return task
 
 # -----------------------------------------------------
 # 4. DELETE: 删除待办事项 (DELETE /tasks/{task_id})
 # -----------------------------------------------------
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task_endpoint(task_id: int, db: Session = Depends(get_db)):
+async def delete_task_endpoint(task_id: int, db: DBSession = Depends(get_session)):
     """
     删除指定的待办事项。
+    
+    直接执行 DELETE（不先查询任务），根据是否命中判断任务是否存在。
     """
-    db_task = crud.task.get_task(db, task_id=task_id)
-    if db_task is None:
+    if not await run_db(db, crud.task.delete_task_by_id, task_id=task_id):
         # 如果找不到，抛出 404
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="任务未找到")
         
-    crud.task.delete_task(db, db_task=db_task)
     # 返回 204 No Content，不需要返回 body
     return None
 
+# -----------------------------------------------------
+# 4.1 BATCH: 批量更新/完成/删除 (POST /tasks/batch)
+# -----------------------------------------------------
+@router.post("/batch", response_model=TaskBatchResult)
+async def batch_tasks_endpoint(batch: TaskBatchRequest, db: DBSession = Depends(get_session)):
+    """
+    批量更新、标记完成或删除任务。
+    
+    - 目标任务由 `ids`（ID 列表）和/或 `filter`（与 `GET /tasks/` 相同的 is_completed、category、search、date_filter）选定，
+      同时指定时取交集。为避免误操作整张表，两者不能都为空。
+    - `action`：`update`（按 `changes` 修改字段）、`complete`（标记完成）、`delete`（删除）。
+    - 在一个事务中以一条 UPDATE / DELETE 语句完成，不逐条加载任务；返回实际影响的任务数。
+    
+    例如“将所有过期任务标记完成”：`{"action": "complete", "filter": {"date_filter": "overdue", "is_completed": false}}`。
+    """
+    filters = batch.filter.model_dump(exclude_none=True) if batch.filter else {}
+    if batch.ids is None and not filters:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="请指定任务 ID 列表或筛选条件。"
+        )
+    
+    if batch.action == "delete":
+        affected = await run_db(db, crud.task.batch_delete_tasks, ids=batch.ids, **filters)
+    else:
+        if batch.action == "complete":
+            changes: Dict[str, Any] = {"is_completed": True}
+        else:
+            changes = batch.changes.model_dump(exclude_unset=True) if batch.changes else {}
+            if not changes:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="请指定要修改的字段。")
+            if "title" in changes and (not changes["title"] or changes["title"].strip() == ""):
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="任务标题不能为空。")
+        affected = await run_db(db, crud.task.batch_update_tasks, changes=changes, ids=batch.ids, **filters)
+    
+    return TaskBatchResult(
+        action=batch.action,
+        affected=affected,
+        requested=len(batch.ids) if batch.ids is not None else None
+    )
+
 # -----------------------------------------------------
 # 5. EXPORT: 导出所有任务数据 (GET /tasks/export)
 # -----------------------------------------------------
-@router.get("/export", response_class=JSONResponse)
-def export_tasks_endpoint(db: Session = Depends(get_db)):
-    """
-    导出所有任务数据为 JSON 格式。
-    
-    返回包含所有任务数据的 JSON 对象，包括导出时间戳。
-    """
-    # 获取所有任务（不应用任何过滤）
-    all_tasks = crud.task.get_tasks(db=db)
-    
-    # 转换为字典格式
-    tasks_data = []
-    for task in all_tasks:
-        task_dict = {
-            "id": task.id,
-            "title": task.title,
-            "description": task.description,
-            "category": task.category,
-            "priority": task.priority,
-            "is_completed": task.is_completed,
-            "due_date": task.due_date.isoformat() if task.due_date is not None else None,
-            "created_at": task.created_at.isoformat(),
-            "updated_at": task.updated_at.isoformat()
-        }
-        tasks_data.append(task_dict)
-    
-    # 构建导出数据
-    export_data = {
-        "export_time": datetime.now().isoformat(),
-        "total_tasks": len(tasks_data),
-        "tasks": tasks_data
-    }
+@router.get("/export", response_class=StreamingResponse)
+def export_tasks_endpoint(
+    request: Request,
+    format: str = Query("json", pattern="^(json|ndjson|csv|arrow|parquet)$"),  # 导出格式
+    gzip: bool = False,                  # 是否 gzip 压缩（Content-Encoding: gzip）
+    is_completed: Optional[bool] = None, # 以下筛选和排序参数与 GET /tasks/ 相同
+    category: Optional[str] = None,
+    sort_by: Optional[str] = None,
+    search: Optional[str] = None,
+    date_filter: Optional[str] = None
+):
+    """
+    流式导出任务数据。
+    
+    - json（默认）: 与导入格式兼容的对象 {"export_time": ..., "tasks": [...], "total_tasks": N}
+    - ndjson: 每行一个任务对象，可直接用 POST /tasks/import/stream 导入
+    - csv: 首行为字段名
+    - arrow: Apache Arrow IPC 流格式（pyarrow.ipc.open_stream / pandas 读取），供数据分析使用
+    - parquet: Parquet 文件（zstd 压缩），每批任务为一个行组
     
-    return export_data
+    支持与任务列表相同的筛选和排序参数，不传时导出全部任务。任务通过服务端游标分批读取、边读边写，
+    第一批数据准备好即开始返回，内存占用与任务总数无关；`gzip=true` 时压缩后返回。
+    arrow / parquet 导出的文件可通过 POST /tasks/import/columnar 导入。
+    支持条件请求（ETag / If-None-Match），数据未变化时返回 304。
+    """
+    if format in export.COLUMNAR_FORMATS and not export.columnar_available():
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail="服务端未安装 pyarrow，不支持该导出格式。")
+    
+    # 条件请求：数据未变化时不再导出（配置了只读副本时从副本导出）
+    session_factory, (table_version, last_modified) = read_session_factory(request, crud.version.get_version)
+    etag = conditional.make_etag(request, table_version, depends_on_date=bool(date_filter))
+    validators = conditional.validator_headers(etag, last_modified)
+    if conditional.is_not_modified(request, etag, last_modified):
+        return conditional.not_modified_response(validators)
+    export_time = datetime.now()
+
+    def batches():
+        # 响应体在路由返回后才开始生成，会话由生成器自己管理，直到导出结束才关闭
+        db = session_factory()
+        try:
+            yield from crud.task.iter_export_batches(
+                db,
+                batch_size=EXPORT_BATCH_SIZE,
+                is_completed=is_completed,
+                category=category,
+                sort_by=sort_by,
+                search=search,
+                date_filter=date_filter
+            )
+        finally:
+            db.close()
+
+    def rows():
+        for batch in batches():
+            yield from batch
+
+    if format == "arrow":
+        content = export.iter_arrow(batches())
+    elif format == "parquet":
+        content = export.iter_parquet(batches())
+    elif format == "ndjson":
+        content = export.iter_ndjson(rows())
+    elif format == "csv":
+        content = export.iter_csv(rows())
+    else:
+        content = export.iter_json(rows(), export_time.isoformat())
+
+    filename = f"tasks_export_{export_time.date().isoformat()}.{format}"
+    headers = {**validators, "Content-Disposition": f'attachment; filename="{filename}"'}
+    if gzip:
+        content = export.gzip_stream(content)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(content, media_type=export.EXPORT_MEDIA_TYPES[format], headers=headers)
 
 # -----------------------------------------------------
 # 6. IMPORT: 批量导入任务数据 (POST /tasks/import)
 # -----------------------------------------------------
+def _parse_import_record(record: Any) -> TaskCreate:
+    """校验一条导入记录并转换为 TaskCreate（不包含 is_completed），不合法时抛出 ValueError
+
+    is_completed 只接受布尔值（或省略、null 表示未完成），不按真假值转换：字符串 "false" 是非空字符串，
+    转换后会被当成已完成。
+    """
+    if isinstance(record, RecordError):
+        raise record
+    if not isinstance(record, dict):
+        raise ValueError("任务数据格式错误。")
+    if not record.get("title") or not str(record.get("title")).strip():
+        raise ValueError("任务的标题不能为空。")
+    is_completed = record.get("is_completed")
+    if is_completed is not None and not isinstance(is_completed, bool):
+        raise ValueError(f"任务字段不合法（is_completed: 必须为 true 或 false，实际为 {is_completed!r}）。")
+    try:
+        return TaskCreate(
+            title=record["title"],
+            description=record.get("description"),
+            category=record.get("category"),
+            priority=record.get("priority"),
+            due_date=record.get("due_date")
+        )
+    except ValidationError as e:
+        fields = "；".join(f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}" for error in e.errors())
+        raise ValueError(f"任务字段不合法（{fields}）。")
+
 class ImportTasksRequest(BaseModel):
     """导入任务的请求模型"""
     tasks: List[dict]  # 使用 dict 以支持 is_completed 字段
 
 @router.post("/import", response_model=List[Task], status_code=status.HTTP_201_CREATED)
-def import_tasks_endpoint(request: ImportTasksRequest, db: Session = Depends(get_db)):
+def import_tasks_endpoint(request: ImportTasksRequest, response: Response, db: Session = Depends(get_db)):
     """
     批量导入任务数据。
     
@@ -165,6 +489,8 @@ def import_tasks_endpoint(request: ImportTasksRequest, db: Session = Depends(get
         ]
     }
     每个任务必须包含 title 字段，其他字段可选。
+    
+    任务按 IMPORT_BATCH_SIZE 分批插入，每批耗时通过 Server-Timing 响应头返回。
     """
     if not request.tasks or len(request.tasks) == 0:
         raise HTTPException(
@@ -177,29 +503,179 @@ def import_tasks_endpoint(request: ImportTasksRequest, db: Session = Depends(get
     # 验证并转换任务数据
     task_creates = []
     for i, task_dict in enumerate(tasks_data):
-        if not isinstance(task_dict, dict):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"第 {i+1} 个任务数据格式错误。"
-            )
-        
-        if not task_dict.get("title") or not str(task_dict.get("title")).strip():
+        try:
+            task_creates.append(_parse_import_record(task_dict))
+        except ValueError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"第 {i+1} 个任务的标题不能为空。"
+                detail=f"第 {i+1} 个{e}"
             )
-        
-        # 创建 TaskCreate 对象（不包含 is_completed）
-        task_create = TaskCreate(
-            title=task_dict["title"],
-            description=task_dict.get("description"),
-            category=task_dict.get("category"),
-            priority=task_dict.get("priority"),
-            due_date=task_dict.get("due_date")
-        )
-        task_creates.append(task_create)
     
     # 批量创建任务（传入原始数据以获取 is_completed）
-    created_tasks = crud.task.create_tasks_batch(db=db, tasks=task_creates, tasks_data=tasks_data)
+    created_tasks, timings = crud.task.bulk_insert_tasks(db=db, tasks=task_creates, tasks_data=tasks_data)
+    response.headers[SERVER_TIMING_HEADER] = ", ".join(
+        f"batch{i};desc=\"{timing['rows']} rows\";dur={timing['seconds'] * 1000:.1f}"
+        for i, timing in enumerate(timings, 1)
+    )
+    
+    return created_tasks
+
+# -----------------------------------------------------
+# 7. STREAM IMPORT: 流式导入大文件 (POST /tasks/import/stream)
+# -----------------------------------------------------
+@router.post("/import/stream", response_model=ImportSummary, status_code=status.HTTP_201_CREATED)
+async def import_tasks_stream_endpoint(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(json|ndjson)$", description="请求体格式，默认按 Content-Type 判断"),
+    db: DBSession = Depends(get_session)
+):
+    """
+    流式导入任务数据，适用于大文件。
+    
+    请求体直接是文件内容（不是表单），支持两种格式：
+    - json: 任务数组，或导出文件格式的对象 {"tasks": [...]}
+    - ndjson: 每行一个任务对象（Content-Type: application/x-ndjson）
+    
+    边读取边解析、逐条校验，每凑满 IMPORT_BATCH_SIZE 条有效记录插入并提交一批，内存占用与文件大小无关。
+    校验失败的记录不会中断导入，返回汇总结果和失败明细（最多 MAX_IMPORT_ERRORS 条）。
+    """
+    started = time.perf_counter()
+    if format is None:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+        format = "ndjson" if content_type in NDJSON_MEDIA_TYPES else "json"
+    if format == "ndjson":
+        records = iter_ndjson_records(request.stream())
+    else:
+        records = iter_json_records(request.stream())
+
+    imported = 0
+    batches = 0
+    failed = 0
+    errors: List[ImportRowError] = []
+    batch: List[dict] = []
+
+    async def flush():
+        nonlocal imported, batches, batch
+        if batch:
+            imported += len(await run_db(db, crud.task.insert_tasks_chunk, rows=batch))
+            batches += 1
+            batch = []
+
+    try:
+        async for row, record in records:
+            try:
+                task_create = _parse_import_record(record)
+            except ValueError as e:
+                failed += 1
+                if len(errors) < MAX_IMPORT_ERRORS:
+                    errors.append(ImportRowError(row=row, error=str(e)))
+                continue
+            batch.append(crud.task.task_row(task_create, record.get("is_completed", False)))
+            if len(batch) >= settings.IMPORT_BATCH_SIZE:
+                await flush()
+    except JSONStreamError as e:
+        # 已读到的有效记录照常写入，报告出错位置之前导入了多少条
+        await flush()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{e}（已导入 {imported} 条任务）"
+        )
+    await flush()
+
+    if imported == 0 and failed == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="任务列表不能为空。"
+        )
+    return ImportSummary(
+        imported=imported,
+        failed=failed,
+        errors=errors,
+        errors_truncated=failed > len(errors),
+        batches=batches,
+        elapsed_seconds=round(time.perf_counter() - started, 3),
+    )
+
+
+# -----------------------------------------------------
+# 8. COLUMNAR IMPORT: 导入列式文件 (POST /tasks/import/columnar)
+# -----------------------------------------------------
+@router.post("/import/columnar", response_model=ImportSummary, status_code=status.HTTP_201_CREATED)
+async def import_tasks_columnar_endpoint(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(arrow|parquet)$", description="文件格式，默认按 Content-Type 判断"),
+    db: DBSession = Depends(get_session)
+):
+    """
+    导入 GET /tasks/export?format=arrow|parquet 导出的列式文件。
     
-    return created_tasks
\ No newline at end of file
+    请求体直接是文件内容。文件先暂存（较大时写入临时文件），再按 RecordBatch 逐批读取：
+    每批按列取值、逐条校验后通过 create_tasks_batch 批量插入并提交，不逐行解析 JSON。
+    id、created_at、updated_at 列会被忽略，导入的任务使用新的 ID 和时间戳。
+    校验失败的记录跳过，返回汇总结果和失败明细（最多 MAX_IMPORT_ERRORS 条）。
+    """
+    if not export.columnar_available():
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail="服务端未安装 pyarrow，不支持列式导入。")
+    started = time.perf_counter()
+    if format is None:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+        format = "parquet" if content_type == export.EXPORT_MEDIA_TYPES["parquet"] else "arrow"
+
+    imported = 0
+    batches = 0
+    failed = 0
+    errors: List[ImportRowError] = []
+    with tempfile.SpooledTemporaryFile(max_size=COLUMNAR_SPOOL_SIZE) as upload:
+        async for chunk in request.stream():
+            await run_in_threadpool(upload.write, chunk)
+        upload.seek(0)
+
+        reader = export.iter_columnar_batches(upload, format, batch_size=settings.IMPORT_BATCH_SIZE)
+        row = 0
+        while True:
+            # 解码在线程池中进行，不阻塞事件循环
+            try:
+                columns = await run_in_threadpool(next, reader, None)
+            except Exception as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"{format} 文件格式错误: {e}（已导入 {imported} 条任务）"
+                )
+            if columns is None:
+                break
+            if "title" not in columns:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="文件缺少 title 列。")
+
+            size = len(columns["title"])
+            task_creates: List[TaskCreate] = []
+            tasks_data: List[dict] = []
+            for i in range(size):
+                row += 1
+                record = {name: values[i] for name, values in columns.items() if name in COLUMNAR_IMPORT_FIELDS}
+                try:
+                    task_creates.append(_parse_import_record(record))
+                except ValueError as e:
+                    failed += 1
+                    if len(errors) < MAX_IMPORT_ERRORS:
+                        errors.append(ImportRowError(row=row, error=str(e)))
+                    continue
+                tasks_data.append(record)
+            if task_creates:
+                imported += len(await run_db(
+                    db, crud.task.create_tasks_batch, tasks=task_creates, tasks_data=tasks_data
+                ))
+                batches += 1
+
+    if imported == 0 and failed == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="任务列表不能为空。"
+        )
+    return ImportSummary(
+        imported=imported,
+        failed=failed,
+        errors=errors,
+        errors_truncated=failed > len(errors),
+        batches=batches,
+        elapsed_seconds=round(time.perf_counter() - started, 3),
+    )
@@ -0,0 +1,69 @@
+# backend/app/cli.py
+"""
+后端管理命令
+
+用法（在 backend 目录下执行）：
+    python -m app.cli migrate              # 建表并执行数据库结构迁移（STARTUP_MIGRATE=off 时在启动服务前执行）
+    python -m app.cli rebuild-stats        # 根据 tasks 表重建任务计数表
+    python -m app.cli check-query-plans    # EXPLAIN 常用列表查询，出现全表扫描或额外排序时返回非零退出码
+"""
+import argparse
+import sys
+
+from .core.database import SessionLocal, engine
+from . import crud
+from .crud.query_plans import check_query_plans
+from .startup import setup_schema
+
+
+def migrate() -> int:
+    """建表并执行尚未执行的数据库结构迁移"""
+    applied = setup_schema(engine)
+    print(f"已执行迁移: {', '.join(applied)}" if applied else "数据库结构已是最新")
+    return 0
+
+
+def rebuild_stats() -> int:
+    """重建任务计数表，修复计数偏差"""
+    db = SessionLocal()
+    try:
+        keys = crud.stats.rebuild_task_counters(db)
+        print(f"任务计数表重建完成，共 {keys} 个计数键")
+    finally:
+        db.close()
+    return 0
+
+
+def check_plans() -> int:
+    """检查常用列表查询的执行计划，用作索引回归检查"""
+    db = SessionLocal()
+    try:
+        results = check_query_plans(db)
+    finally:
+        db.close()
+    failed = 0
+    for shape, plan, problems in results:
+        print(f"[{'FAIL' if problems else 'OK'}] {shape or '默认'}")
+        for line in plan:
+            print(f"    {line}")
+        failed += bool(problems)
+    print(f"共 {len(results)} 个查询，{failed} 个出现全表扫描或额外排序")
+    return 1 if failed else 0
+
+
+COMMANDS = {
+    "migrate": migrate,
+    "rebuild-stats": rebuild_stats,
+    "check-query-plans": check_plans,
+}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Todo List 后端管理命令")
+    parser.add_argument("command", choices=sorted(COMMANDS), help="要执行的命令")
+    args = parser.parse_args(argv)
+    return COMMANDS[args.command]()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+# backend/app/core/cache.py
+"""
+任务列表响应缓存
+
+缓存 GET /tasks/ 序列化后的 JSON 字节，命中时直接返回，不再查询数据库、不经过 Pydantic。
+
+失效方式为版本号：缓存键中包含任务表在 table_versions 中的版本号（条件请求生成 ETag 时已经读取），
+任何任务写操作都在同一事务中把版本号加一，旧版本的条目不再被访问（内存后端由 LRU 淘汰，Redis 后端由 TTL 过期）。
+版本号保存在数据库中，所有进程、实例看到的是同一个值，其他进程的写操作同样会使本进程的缓存失效。
+读取时先取版本号再在同一事务中查询，并以该版本号写入缓存，因此与写操作并发时不会以新版本号缓存旧数据。
+
+- MemoryCacheBackend：进程内 LRU，各进程分别缓存
+- RedisCacheBackend：Redis 兼容服务（Redis、Valkey、KeyDB 等），多进程/多实例共享缓存条目
+
+通过 Settings.CACHE_BACKEND 选择：memory（默认）、redis、off。
+"""
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class NullCacheBackend:
+    """不缓存"""
+    name = "off"
+    # get/set 是否会阻塞（需要放到线程池中调用）
+    blocking = False
+
+    def invalidate(self) -> None:
+        pass
+
+    def get(self, key: Hashable, version: int) -> Optional[bytes]:
+        return None
+
+    def set(self, key: Hashable, version: int, value: bytes) -> None:
+        pass
+
+
+class MemoryCacheBackend(NullCacheBackend):
+    """进程内 LRU 缓存（线程安全），按条目数和总字节数限制容量"""
+    name = "memory"
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[int, Hashable], bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        """本进程的写操作提交后清空条目，尽早释放旧版本占用的内存（正确性由版本号保证）"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def get(self, key: Hashable, version: int) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get((version, key))
+            if value is not None:
+                self._entries.move_to_end((version, key))
+            return value
+
+    def set(self, key: Hashable, version: int, value: bytes) -> None:
+        with self._lock:
+            if len(value) > self.max_bytes:
+                return  # 单条超过容量
+            old = self._entries.pop((version, key), None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[(version, key)] = value
+            self._size += len(value)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+
+class RedisCacheBackend(NullCacheBackend):
+    """Redis 兼容服务上的缓存，条目键为 {prefix}:{版本号}:{键摘要}"""
+    name = "redis"
+    blocking = True
+
+    def __init__(self, client: Any, prefix: str = "todo:tasks", ttl: int = 300):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def _entry_key(self, key: Hashable, version: int) -> str:
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return f"{self.prefix}:{version}:{digest}"
+
+    def get(self, key: Hashable, version: int) -> Optional[bytes]:
+        return self.client.get(self._entry_key(key, version))
+
+    def set(self, key: Hashable, version: int, value: bytes) -> None:
+        self.client.set(self._entry_key(key, version), value, ex=self.ttl)
+
+
+# 当前使用的缓存后端，setup_cache 之前不缓存
+_backend: NullCacheBackend = NullCacheBackend()
+
+
+def get_cache() -> NullCacheBackend:
+    """获取当前使用的缓存后端"""
+    return _backend
+
+
+def setup_cache() -> NullCacheBackend:
+    """根据配置创建缓存后端"""
+    global _backend
+    mode = settings.CACHE_BACKEND
+    if mode == "off":
+        backend: NullCacheBackend = NullCacheBackend()
+    elif mode == "memory":
+        backend = MemoryCacheBackend(max_entries=settings.CACHE_MAX_ENTRIES, max_bytes=settings.CACHE_MAX_BYTES)
+    elif mode == "redis":
+        import redis  # 仅 redis 后端需要安装 redis 包
+        backend = RedisCacheBackend(redis.Redis.from_url(settings.CACHE_REDIS_URL), ttl=settings.CACHE_TTL)
+    else:
+        raise ValueError(f"未知的缓存后端: {mode}")
+    _backend = backend
+    logger.info(f"列表缓存后端: {backend.name}")
+    return backend
+
+
+def invalidate_cache() -> None:
+    """任务写操作提交后调用，释放本进程中已失效的缓存条目（其他进程的条目随版本号变化自然失效）
+
+    缓存服务不可用时只记录日志，不影响写操作本身。
+    """
+    try:
+        _backend.invalidate()
+    except Exception as e:
+        logger.warning(f"列表缓存失效失败: {e}")
+
+
+async def cache_lookup(key: Hashable, version: int) -> Optional[bytes]:
+    """按任务表版本号读取缓存；缓存服务不可用时视为未命中"""
+    backend = _backend
+    try:
+        if backend.blocking:
+            return await run_in_threadpool(backend.get, key, version)
+        return backend.get(key, version)
+    except Exception as e:
+        logger.warning(f"读取列表缓存失败: {e}")
+        return None
+
+
+async def cache_store(key: Hashable, version: int, value: bytes) -> None:
+    """以查询前读取的任务表版本号写入缓存"""
+    backend = _backend
+    try:
+        if backend.blocking:
+            await run_in_threadpool(backend.set, key, version, value)
+        else:
+            backend.set(key, version, value)
+    except Exception as e:
+        logger.warning(f"写入列表缓存失败: {e}")
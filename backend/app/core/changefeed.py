@@ -0,0 +1,147 @@
+# backend/app/core/changefeed.py
+"""
+任务变更事件流
+
+crud 写操作提交后发布紧凑的变更事件，GET /tasks/events 以 Server-Sent Events 推送给所有连接的客户端，
+前端据此就地更新列表，其他标签页也能及时看到变化，而不必每次写操作后重新下载整个列表。
+
+事件：{"seq": 序号, "op": 操作, ...}
+- insert / update：{"id": 任务 ID, "task": 完整任务对象（与 GET /tasks/ 的元素相同）}
+- delete：{"id": 任务 ID}
+- refresh：批量操作或导入，变化的任务较多，客户端应重新获取列表；断线期间错过的事件无法补发时也发送该事件
+
+序号在进程内单调递增。事件 ID 为 “{epoch}-{序号}”，epoch 在进程启动时生成：客户端重连时带上最后收到的
+事件 ID（EventSource 自动发送 Last-Event-ID），只要该事件仍在最近 CHANGEFEED_BUFFER_SIZE 条之内就逐条补发，
+否则（或服务已重启）发送 refresh。事件只在本进程内传递，适用于单进程部署。
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, List, Optional, Set, Tuple
+
+from .config import settings
+from .serialize import TASK_FIELDS, dumps
+
+
+class Subscription:
+    """一个事件流连接：事件由发布方（可能在线程池中）投递到所属事件循环的队列中"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue_size: int):
+        self._loop = loop
+        self.queue: "asyncio.Queue[dict]" = asyncio.Queue(queue_size)
+        # 队列已满时丢弃后续事件并置位，由连接在队列取空后发送 refresh
+        self.overflowed = False
+
+    def deliver(self, event: dict) -> bool:
+        """投递事件（线程安全）；事件循环已关闭时返回 False"""
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            return False
+        return True
+
+    def _put(self, event: dict) -> None:
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class ChangeFeed:
+    """带序号和补发缓冲区的进程内发布/订阅"""
+
+    def __init__(self, buffer_size: int = 1000, queue_size: int = 1000):
+        self.epoch = format(time.time_ns() // 1000, "x")
+        self.queue_size = queue_size
+        self._seq = 0
+        self._buffer: Deque[dict] = deque(maxlen=buffer_size)
+        self._subscribers: Set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.epoch}-{seq}"
+
+    def publish(self, op: str, **payload: Any) -> dict:
+        """发布一个事件并投递给所有连接（在锁内投递，保证各连接收到的顺序与序号一致）"""
+        with self._lock:
+            self._seq += 1
+            event = {"seq": self._seq, "op": op, **payload}
+            self._buffer.append(event)
+            closed = [subscription for subscription in self._subscribers if not subscription.deliver(event)]
+            self._subscribers.difference_update(closed)
+        return event
+
+    def _replay(self, last_event_id: Optional[str]) -> Optional[List[dict]]:
+        """last_event_id 之后的事件；无法补发（ID 无效、服务已重启或超出缓冲区）时返回 None"""
+        epoch, _, seq_text = last_event_id.rpartition("-") if last_event_id else ("", "", "")
+        if epoch != self.epoch or not seq_text.isdigit():
+            return None
+        seq = int(seq_text)
+        if seq > self._seq:
+            return None
+        if seq < self._seq and (not self._buffer or self._buffer[0]["seq"] > seq + 1):
+            return None
+        return [event for event in self._buffer if event["seq"] > seq]
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Tuple[Subscription, Optional[List[dict]]]:
+        """在当前事件循环中建立连接，返回 (连接, 需要补发的事件)
+
+        未传 last_event_id 时补发列表为空；传了但无法补发时为 None，调用方应让客户端重新获取列表。
+        """
+        subscription = Subscription(asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            backlog = self._replay(last_event_id) if last_event_id else []
+            self._subscribers.add(subscription)
+        return subscription, backlog
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+
+_feed = ChangeFeed(settings.CHANGEFEED_BUFFER_SIZE, settings.CHANGEFEED_QUEUE_SIZE)
+
+
+def get_feed() -> ChangeFeed:
+    """获取进程内的变更事件流"""
+    return _feed
+
+
+def task_payload(task: Any) -> dict:
+    """任务对象或行（可按字段名取值）转换为事件中的任务对象"""
+    return {field: getattr(task, field) for field in TASK_FIELDS}
+
+
+def publish_task(op: str, task: Any) -> None:
+    """任务创建（insert）或更新（update）并提交后调用"""
+    _feed.publish(op, id=task.id, task=task_payload(task))
+
+
+def publish_delete(task_id: int) -> None:
+    """任务删除并提交后调用"""
+    _feed.publish("delete", id=task_id)
+
+
+def publish_refresh(reason: str) -> None:
+    """批量操作或导入提交后调用，通知客户端重新获取列表"""
+    _feed.publish("refresh", reason=reason)
+
+
+def format_event(feed: ChangeFeed, event: dict) -> bytes:
+    """编码为 SSE 消息"""
+    return b"id: %s\nevent: %s\ndata: %s\n\n" % (
+        feed.event_id(event["seq"]).encode("ascii"),
+        event["op"].encode("ascii"),
+        dumps(event),
+    )
@@ -0,0 +1,67 @@
+# backend/app/core/conditional.py
+"""
+条件请求（ETag / Last-Modified）
+
+ETag 由表版本号和请求的路径、查询参数生成：版本号在每次写操作时递增，同一 URL 的
+响应内容只会随版本号变化；结果依赖当天日期的接口（如过期统计、日期筛选）额外带上日期。
+客户端带 If-None-Match / If-Modified-Since 且版本未变化时直接返回 304，不再执行查询和序列化。
+"""
+import hashlib
+from datetime import date, datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response, status
+
+# 浏览器每次使用缓存前都要重新验证，避免依据 Last-Modified 启发式缓存导致列表不更新
+CACHE_CONTROL = "no-cache"
+
+
+def make_etag(request: Request, version: int, depends_on_date: bool = False) -> str:
+    """生成弱 ETag：W/"版本号-请求摘要\""""
+    parts = [request.url.path, *sorted(f"{key}={value}" for key, value in request.query_params.multi_items())]
+    if depends_on_date:
+        parts.append(date.today().isoformat())
+    digest = hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+    return f'W/"{version}-{digest}"'
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    """ETag、Last-Modified（UTC）和 Cache-Control 响应头"""
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    # Last-Modified 只精确到秒：最近一次写入就在当前这一秒内时不返回，
+    # 否则同一秒内的后续写入会被 If-Modified-Since 误判为未修改
+    now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    if last_modified is not None and last_modified < now:
+        headers["Last-Modified"] = format_datetime(last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+    return headers
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # 弱比较：忽略 W/ 前缀
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """请求的缓存是否仍然有效；有 If-None-Match 时只比较 ETag（RFC 9110 13.2.2）"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(tzinfo=timezone.utc) <= since
+    return False
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    """304 Not Modified（不带响应体）"""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
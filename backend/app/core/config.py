@@ -10,6 +10,72 @@ class Settings(BaseSettings):
         "mysql+pymysql://user:password@db:3306/todo_db"
     )
 
+    # 只读副本（逗号分隔的数据库 URL，驱动与 DATABASE_URL 相同）：列表、统计、导出等只读请求轮询分发到副本
+    DATABASE_REPLICA_URLS: str = os.getenv("DATABASE_REPLICA_URLS", "")
+    DB_REPLICA_CHECK_INTERVAL: float = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", "5"))  # 副本健康检查间隔秒数
+    # 读己之写：写请求之后多少秒内，带 X-Read-Primary-Until 请求头的读请求改走主库（应大于副本的复制延迟）
+    READ_YOUR_WRITES_SECONDS: float = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+    # 数据库连接池（同步引擎和异步引擎各自使用一个连接池，参数相同）
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))  # 常驻连接数
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))  # 超出常驻连接数后最多再建立的连接数
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "3600"))  # 连接最长存活秒数，应小于 MySQL wait_timeout；-1 表示不回收
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # 连接池耗尽时签出连接的最长等待秒数
+    # 连接预检策略：always（每次签出前 ping）、idle（空闲超过 DB_POOL_PRE_PING_IDLE 秒才 ping）、off（不 ping，依赖 pool_recycle）
+    DB_POOL_PRE_PING: str = os.getenv("DB_POOL_PRE_PING", "always")
+    DB_POOL_PRE_PING_IDLE: float = float(os.getenv("DB_POOL_PRE_PING_IDLE", "60"))
+
+    # 批量导入：每个 INSERT 批次的行数
+    IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+
+    # 任务列表缓存：memory（进程内 LRU，仅适用于单进程部署）、redis（Redis 兼容服务，多进程共享）、off（不缓存）
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "256"))  # 内存缓存最多保存的列表数
+    CACHE_MAX_BYTES: int = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))  # 内存缓存总字节数上限
+    CACHE_REDIS_URL: str = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    CACHE_TTL: int = int(os.getenv("CACHE_TTL", "300"))  # Redis 缓存条目的过期秒数
+
+    # 搜索后端：auto（按数据库类型选择全文索引）、fulltext（必须使用全文索引）、like（LIKE 模糊匹配）、
+    # memory（进程内 n-gram 索引，仅适用于单进程部署）
+    SEARCH_BACKEND: str = os.getenv("SEARCH_BACKEND", "auto")
+    SEARCH_NGRAM_SIZE: int = int(os.getenv("SEARCH_NGRAM_SIZE", "3"))  # 内存索引的 n-gram 长度
+    SEARCH_MAX_CANDIDATES: int = int(os.getenv("SEARCH_MAX_CANDIDATES", "10000"))  # 内存索引候选 ID 超过该数量时改用数据库搜索
+
+    # 变更事件流（GET /tasks/events）：断线重连时可补发的最近事件数，以及每个连接的待发送事件上限
+    CHANGEFEED_BUFFER_SIZE: int = int(os.getenv("CHANGEFEED_BUFFER_SIZE", "1000"))
+    CHANGEFEED_QUEUE_SIZE: int = int(os.getenv("CHANGEFEED_QUEUE_SIZE", "1000"))
+
+    # 增量同步（GET /tasks/changes）：水位线回退的秒数（补偿提交晚于更新时间的事务，期间的变更会重复返回），
+    # 以及删除记录的保留天数（水位线早于保留期的客户端需要全量同步）
+    SYNC_SAFETY_SECONDS: int = int(os.getenv("SYNC_SAFETY_SECONDS", "30"))
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30"))
+
+    # 启动初始化：auto 表示启动时建表并执行迁移；off 表示跳过，需先执行 `python -m app.cli migrate`
+    # （多进程部署时避免各进程同时执行 DDL），启动时只等待迁移完成
+    STARTUP_MIGRATE: str = os.getenv("STARTUP_MIGRATE", "auto")
+    STARTUP_MAX_ATTEMPTS: int = int(os.getenv("STARTUP_MAX_ATTEMPTS", "30"))  # 等待数据库就绪的最大尝试次数
+    STARTUP_RETRY_DELAY: float = float(os.getenv("STARTUP_RETRY_DELAY", "0.5"))  # 首次重试间隔秒数，之后每次翻倍
+    STARTUP_RETRY_MAX_DELAY: float = float(os.getenv("STARTUP_RETRY_MAX_DELAY", "5"))  # 重试间隔上限秒数
+    HEALTH_CHECK_TIMEOUT: float = float(os.getenv("HEALTH_CHECK_TIMEOUT", "2"))  # 就绪检查中数据库探测的超时秒数
+
+    # 请求指标（GET /metrics）：关闭后不再记录各路由的请求数、延迟和数据库查询统计，只输出连接池指标
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+    # 按需性能剖析：请求带 X-Profile 请求头或 profile 查询参数、且值等于 PROFILING_TOKEN 时对该请求采样调用栈
+    # （为空表示不可用），保存最近 PROFILING_MAX_PROFILES 个结果，通过 GET /admin/profiles 查看
+    PROFILING_TOKEN: str = os.getenv("PROFILING_TOKEN", "")
+    PROFILING_INTERVAL: float = float(os.getenv("PROFILING_INTERVAL", "0.005"))  # 采样间隔秒数
+    PROFILING_MAX_PROFILES: int = int(os.getenv("PROFILING_MAX_PROFILES", "20"))
+    # 慢查询日志：crud.task 中执行的 SQL 耗时超过 SLOW_QUERY_THRESHOLD 秒时记录 SQL、参数、耗时和执行计划（负数表示关闭），
+    # 保存最近 SLOW_QUERY_LOG_SIZE 条，通过 GET /admin/slow-queries 查看
+    SLOW_QUERY_THRESHOLD: float = float(os.getenv("SLOW_QUERY_THRESHOLD", "0.2"))
+    SLOW_QUERY_LOG_SIZE: int = int(os.getenv("SLOW_QUERY_LOG_SIZE", "100"))
+    # 慢查询日志是否返回绑定参数的值（可能包含任务内容等数据）；默认只返回参数类型
+    SLOW_QUERY_LOG_PARAMETERS: bool = os.getenv("SLOW_QUERY_LOG_PARAMETERS", "false").lower() == "true"
+    # 管理接口（/admin/ 下的连接池状态、慢查询日志、剖析结果）的访问令牌，请求需带 X-Admin-Token 请求头；
+    # 未设置时使用 PROFILING_TOKEN，两者都为空时管理接口不可用
+    ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "") or PROFILING_TOKEN
+
     # 密钥：用于 JWT token、session 加密等（生产环境必须从环境变量设置）
     SECRET_KEY: str = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
 
@@ -1,22 +1,111 @@
 # backend/app/core/database.py
-from sqlalchemy import create_engine
+from typing import Any, AsyncIterator, Callable, Optional, Tuple, TypeVar, Union
+
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
 from .config import settings
+from .metrics import instrument_queries
+from .pool import instrument_engine, pool_options
+from .profiling import tracked
+from .replicas import Replica, ReplicaSet, is_connection_error, reads_primary
+from .slowlog import instrument_slow_queries
+
+T = TypeVar("T")
+
+# 异步驱动 -> 对应的同步驱动。DATABASE_URL 使用异步驱动（如 mysql+aiomysql://、sqlite+aiosqlite://）时，
+# 任务 API 通过 AsyncEngine/AsyncSession 访问数据库，不再占用线程池；
+# 启动建表、迁移、管理命令等仍使用同一数据库的同步引擎。
+ASYNC_DRIVERS = {
+    "aiomysql": "pymysql",
+    "asyncmy": "pymysql",
+    "aiosqlite": None,  # SQLite 使用内置的 pysqlite 驱动
+}
+
+database_url = make_url(settings.DATABASE_URL)
+ASYNC_MODE = database_url.get_driver_name() in ASYNC_DRIVERS
+
+
+def _sync_url(url):
+    """将异步驱动的数据库 URL 转换为同步驱动的 URL"""
+    if url.get_driver_name() not in ASYNC_DRIVERS:
+        return url
+    sync_driver = ASYNC_DRIVERS[url.get_driver_name()]
+    backend = url.get_backend_name()
+    return url.set(drivername=f"{backend}+{sync_driver}" if sync_driver else backend)
+
+
+def _instrument(engine) -> None:
+    """注册连接池指标、请求查询统计和慢查询日志（异步引擎传入 async_engine.sync_engine）"""
+    instrument_engine(engine)
+    instrument_queries(engine)
+    instrument_slow_queries(engine)
+
 
 # 创建数据库引擎
+# 连接池参数（大小、溢出、回收时间、等待超时、预检策略）见 Settings.DB_POOL_*
 engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,  # 连接前检查连接是否有效
-    echo=False  # 是否打印 SQL 语句，调试时可设为 True
+    _sync_url(database_url),
+    echo=False,  # 是否打印 SQL 语句，调试时可设为 True
+    **pool_options(_sync_url(database_url))
 )
+_instrument(engine)
 
 # 创建数据库会话工厂
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 异步引擎和会话工厂（仅异步模式）
+# expire_on_commit=False：提交后仍可直接读取对象属性，避免在事件循环中触发隐式加载
+async_engine: Optional[AsyncEngine] = None
+AsyncSessionLocal: Optional[async_sessionmaker] = None
+if ASYNC_MODE:
+    async_engine = create_async_engine(database_url, echo=False, **pool_options(database_url, is_async=True))
+    _instrument(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
+
+
+
+def _create_replica(url: URL) -> Replica:
+    """为只读副本创建引擎和会话工厂（连接池参数与主库相同）"""
+    replica_engine = create_engine(_sync_url(url), echo=False, **pool_options(_sync_url(url)))
+    _instrument(replica_engine)
+    async_factory = None
+    if ASYNC_MODE:
+        replica_async_engine = create_async_engine(url, echo=False, **pool_options(url, is_async=True))
+        _instrument(replica_async_engine.sync_engine)
+        async_factory = async_sessionmaker(bind=replica_async_engine, autoflush=False, expire_on_commit=False)
+    return Replica(
+        url,
+        replica_engine,
+        sessionmaker(autocommit=False, autoflush=False, bind=replica_engine),
+        async_factory
+    )
+
+
+# 只读副本（未配置 DATABASE_REPLICA_URLS 时为空，所有请求访问主库）
+replicas = ReplicaSet([
+    _create_replica(make_url(replica_url.strip()))
+    for replica_url in settings.DATABASE_REPLICA_URLS.split(",")
+    if replica_url.strip()
+])
+
+# 会话 info 中记录所用副本的键
+_REPLICA_KEY = "replica"
+# 副本连接失败后，副本会话 info 中记录改用的主库会话的键
+_PRIMARY_SESSION_KEY = "primary_session"
+
 # ORM 模型基类
 Base = declarative_base()
 
+# 任务 API 使用的会话类型：同步模式为 Session，异步模式为 AsyncSession
+DBSession = Union[Session, AsyncSession]
+
 
 def get_db():
     """FastAPI 依赖注入：获取数据库会话"""
@@ -24,4 +113,107 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+if AsyncSessionLocal is not None:
+    async def get_session() -> AsyncIterator[DBSession]:
+        """FastAPI 依赖注入：获取异步数据库会话，配合 run_db 使用"""
+        async with AsyncSessionLocal() as db:  # type: ignore[misc]
+            yield db
+else:
+    # 同步模式直接使用 get_db：FastAPI 为同步依赖的清理使用独立的线程限额，
+    # 线程池被占满时会话仍能及时关闭、归还连接
+    get_session = get_db  # type: ignore[assignment]
+
+
+def _choose_replica(request: Request) -> Optional[Replica]:
+    """只读请求使用的副本；未配置副本、请求要求读己之写或没有健康的副本时返回 None（访问主库）"""
+    if not replicas or reads_primary(request.headers):
+        return None
+    return replicas.choose()
+
+
+async def _close(db: DBSession) -> None:
+    if isinstance(db, AsyncSession):
+        await db.close()
+    else:
+        await run_in_threadpool(db.close)
+
+
+async def get_read_session(request: Request) -> AsyncIterator[DBSession]:
+    """FastAPI 依赖注入：只读请求的会话，配置了只读副本时轮询使用健康的副本
+
+    异步模式为 AsyncSession，同步模式为 Session（创建时不连接数据库，关闭放到线程池中执行）。
+    副本连接失败后 run_db 改用的主库会话也在这里关闭。
+    """
+    replica = _choose_replica(request)
+    if ASYNC_MODE:
+        db = (replica.async_session_factory if replica else AsyncSessionLocal)()  # type: ignore[misc]
+    else:
+        db = (replica.session_factory if replica else SessionLocal)()
+    if replica is not None:
+        db.info[_REPLICA_KEY] = replica
+    try:
+        yield db
+    finally:
+        primary = db.info.pop(_PRIMARY_SESSION_KEY, None)
+        if primary is not None:
+            await _close(primary)
+        await _close(db)
+
+
+def read_session_factory(request: Request, fn: Callable[[Session], T]) -> Tuple[sessionmaker, T]:
+    """选择只读请求的同步会话工厂（导出等自行管理会话的场景），并在新会话上执行 fn(session)
+
+    副本连接失败时将其标记为不健康，改用主库执行。返回 (实际使用的会话工厂, fn 的结果)，
+    后续查询使用同一个会话工厂，与 fn 读到的数据来自同一个数据库。
+    """
+    replica = _choose_replica(request)
+    if replica is not None:
+        try:
+            with replica.session_factory() as db:
+                return replica.session_factory, fn(db)
+        except exc.DBAPIError as e:
+            if not is_connection_error(e):
+                raise
+            replica.mark_down(e)
+    with SessionLocal() as db:
+        return SessionLocal, fn(db)
+
+
+def is_replica_session(db: DBSession) -> bool:
+    """会话是否在访问只读副本（数据可能落后于主库）"""
+    return _REPLICA_KEY in db.info
+
+
+async def _run(db: DBSession, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(tracked(fn), db, *args, **kwargs)
+
+
+async def run_db(db: DBSession, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """在数据库会话上执行同步的 crud 函数 fn(session, *args, **kwargs)
+
+    - 异步会话：通过 AsyncSession.run_sync 执行，数据库 I/O 由异步驱动完成，不占用线程池
+    - 同步会话：放到线程池中执行，与普通 def 路由的行为一致
+
+    只读副本连接失败时将其标记为不健康，会话改为访问主库并重试（只读副本上只执行只读查询，可以安全重试）。
+    """
+    primary = db.info.get(_PRIMARY_SESSION_KEY)
+    if primary is not None:
+        return await _run(primary, fn, *args, **kwargs)
+    try:
+        return await _run(db, fn, *args, **kwargs)
+    except exc.DBAPIError as e:
+        replica = db.info.get(_REPLICA_KEY)
+        if replica is None or not is_connection_error(e):
+            raise
+        replica.mark_down(e)
+
+    # 副本会话不再使用：在主库上新开一个会话重试，本请求之后的 run_db 也使用该会话
+    del db.info[_REPLICA_KEY]
+    primary = (AsyncSessionLocal if isinstance(db, AsyncSession) else SessionLocal)()  # type: ignore[misc]
+    db.info[_PRIMARY_SESSION_KEY] = primary
+    return await _run(primary, fn, *args, **kwargs)
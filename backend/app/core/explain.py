@@ -0,0 +1,45 @@
+# backend/app/core/explain.py
+"""EXPLAIN 查询计划工具：获取 SQL 的执行计划，并识别全表扫描和额外排序（filesort）"""
+from typing import Any, List, Optional
+
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import ClauseElement
+
+
+def explain_sql(conn: Connection, sql: str, params: Optional[Any] = None) -> List[str]:
+    """获取一条原始 SQL 的执行计划，每个计划步骤一行文本"""
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        result = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params)  # type: ignore[arg-type]
+        return [row[3] for row in result]
+    if dialect == "mysql":
+        result = conn.exec_driver_sql(f"EXPLAIN {sql}", params)  # type: ignore[arg-type]
+        return [
+            "table={table} type={type} key={key} rows={rows} Extra={Extra}".format(**row)
+            for row in result.mappings()
+        ]
+    result = conn.exec_driver_sql(f"EXPLAIN {sql}", params)  # type: ignore[arg-type]
+    return [" ".join(str(value) for value in row) for row in result]
+
+
+def explain_statement(conn: Connection, statement: ClauseElement) -> List[str]:
+    """获取一个 SQLAlchemy 语句的执行计划（参数以字面量形式内联）"""
+    compiled = statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    return explain_sql(conn, str(compiled))
+
+
+def plan_problems(dialect: str, plan: List[str]) -> List[str]:
+    """从执行计划中找出全表扫描和额外排序步骤"""
+    problems = []
+    for line in plan:
+        if dialect == "sqlite":
+            if "USE TEMP B-TREE" in line:
+                problems.append(f"额外排序: {line}")
+            elif line.startswith("SCAN") and "USING" not in line:
+                problems.append(f"全表扫描: {line}")
+        elif dialect == "mysql":
+            if "Using filesort" in line:
+                problems.append(f"额外排序: {line}")
+            if " type=ALL " in line:
+                problems.append(f"全表扫描: {line}")
+    return problems
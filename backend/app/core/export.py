@@ -0,0 +1,215 @@
+# backend/app/core/export.py
+"""
+流式导出任务数据
+
+将按服务端游标逐批读取的任务行（元组）编码为 JSON / NDJSON / CSV 字节块，
+每凑满约 CHUNK_SIZE 字节产出一块，可直接作为 StreamingResponse 的内容；内存占用与任务总数无关。
+
+列式格式（Arrow IPC 流、Parquet）供数据分析使用：每批行按列转置后直接构造 RecordBatch，
+不经过逐行字典；读取同样按 RecordBatch 逐批进行。列式格式依赖 pyarrow，未安装时不可用。
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from typing import IO, Iterable, Iterator, List, Optional, Sequence
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - 列式格式为可选功能
+    pa = None
+    ipc = None
+    pq = None
+
+# 导出字段（与 crud.task.EXPORT_COLUMNS 顺序一致）
+EXPORT_FIELDS = (
+    "id", "title", "description", "category", "priority",
+    "is_completed", "due_date", "created_at", "updated_at",
+)
+
+EXPORT_MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# 列式格式
+COLUMNAR_FORMATS = ("arrow", "parquet")
+
+# 每个输出块的目标大小（字节）
+CHUNK_SIZE = 64 * 1024
+
+
+def _jsonable(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _row_json(row: Sequence) -> str:
+    return json.dumps(
+        {field: _jsonable(value) for field, value in zip(EXPORT_FIELDS, row)},
+        ensure_ascii=False
+    )
+
+
+def _chunked(pieces: Iterable[str]) -> Iterator[bytes]:
+    """将小段文本合并为约 CHUNK_SIZE 字节的块"""
+    buffer: list = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= CHUNK_SIZE:
+            yield "".join(buffer).encode("utf-8")
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def iter_ndjson(rows: Iterable[Sequence]) -> Iterator[bytes]:
+    """NDJSON：每行一个任务对象，可由 POST /tasks/import/stream 直接导入"""
+    return _chunked(_row_json(row) + "\n" for row in rows)
+
+
+def iter_json(rows: Iterable[Sequence], export_time: str) -> Iterator[bytes]:
+    """JSON：与原导出格式相同的对象，total_tasks 在写完任务列表后才能确定，放在最后"""
+    def pieces():
+        yield '{"export_time": ' + json.dumps(export_time) + ', "tasks": ['
+        total = 0
+        for row in rows:
+            yield ("," if total else "") + "\n" + _row_json(row)
+            total += 1
+        yield '\n], "total_tasks": ' + str(total) + "}\n"
+    return _chunked(pieces())
+
+
+def iter_csv(rows: Iterable[Sequence]) -> Iterator[bytes]:
+    """CSV：首行为字段名，布尔值写为 true/false，空值写为空字符串；带 BOM 以便 Excel 识别 UTF-8"""
+    def pieces():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        yield "\ufeff"
+        writer.writerow(EXPORT_FIELDS)
+        for row in rows:
+            writer.writerow([
+                ("true" if value else "false") if isinstance(value, bool) else _jsonable(value)
+                for value in row
+            ])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+    return _chunked(pieces())
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """对字节块流做 gzip 压缩（逐块压缩，不缓存全部内容）"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def columnar_available() -> bool:
+    """是否可以使用列式格式（已安装 pyarrow）"""
+    return pa is not None
+
+
+def _arrow_schema():
+    assert pa is not None, "列式格式需要安装 pyarrow"
+    return pa.schema([
+        ("id", pa.int64()),
+        ("title", pa.string()),
+        ("description", pa.string()),
+        ("category", pa.string()),
+        ("priority", pa.int8()),
+        ("is_completed", pa.bool_()),
+        ("due_date", pa.date32()),
+        ("created_at", pa.timestamp("s")),
+        ("updated_at", pa.timestamp("s")),
+    ])
+
+
+def _record_batch(schema, rows: Sequence[Sequence]):
+    """将一批行按列转置后构造 RecordBatch"""
+    assert pa is not None, "列式格式需要安装 pyarrow"
+    columns = list(zip(*rows))
+    return pa.RecordBatch.from_arrays(
+        [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+        schema=schema
+    )
+
+
+class _DrainableSink:
+    """只追加写入的输出流，写入的数据可随时取走（供 pyarrow 写入器逐批产出字节）"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_arrow(batches: Iterable[Sequence[Sequence]]) -> Iterator[bytes]:
+    """Arrow IPC 流格式：每批行写为一个 RecordBatch（pyarrow.ipc.open_stream 读取）"""
+    assert ipc is not None, "列式格式需要安装 pyarrow"
+    schema = _arrow_schema()
+    sink = _DrainableSink()
+    with ipc.new_stream(sink, schema) as writer:
+        for rows in batches:
+            if rows:
+                writer.write_batch(_record_batch(schema, rows))
+                yield sink.drain()
+    yield sink.drain()
+
+
+def iter_parquet(batches: Iterable[Sequence[Sequence]], compression: str = "zstd") -> Iterator[bytes]:
+    """Parquet：每批行写为一个行组，文件尾部的元数据在最后写出"""
+    assert pq is not None, "列式格式需要安装 pyarrow"
+    schema = _arrow_schema()
+    sink = _DrainableSink()
+    with pq.ParquetWriter(sink, schema, compression=compression) as writer:
+        for rows in batches:
+            if rows:
+                writer.write_batch(_record_batch(schema, rows))
+                yield sink.drain()
+    yield sink.drain()
+
+
+def iter_columnar_batches(file: IO[bytes], format: str, batch_size: Optional[int] = None) -> Iterator[dict]:
+    """逐批读取 Arrow IPC 流 / Parquet 文件，每批返回 {列名: 值列表}"""
+    assert pq is not None and ipc is not None, "列式格式需要安装 pyarrow"
+    if format == "parquet":
+        batches = pq.ParquetFile(file).iter_batches(batch_size=batch_size or 65536)
+    else:
+        batches = ipc.open_stream(file)
+    for batch in batches:
+        yield batch.to_pydict()
@@ -0,0 +1,167 @@
+# backend/app/core/jsonstream.py
+"""
+增量解析上传的 JSON / NDJSON
+
+从字节块的异步迭代器（如 Request.stream()）中逐条取出记录，内存中只保留当前未解析完的一小段文本，
+与文件大小无关。
+
+- iter_json_records：顶层为数组，或为包含该数组字段的对象（如导出文件 {"export_time": ..., "tasks": [...]}）
+- iter_ndjson_records：每行一个 JSON 值，单行格式错误只影响该行
+"""
+import codecs
+import json
+from typing import Any, AsyncIterator, Optional, Tuple
+
+_WHITESPACE = " \t\r\n"
+
+
+class JSONStreamError(ValueError):
+    """文档结构错误，无法继续解析"""
+    pass
+
+
+class RecordError(ValueError):
+    """单条记录错误（如 NDJSON 的某一行不是合法 JSON），不影响后续记录"""
+    pass
+
+
+class _JSONStreamReader:
+    """在增量读入的文本缓冲区上逐个解析 JSON 值"""
+
+    def __init__(self, chunks: AsyncIterator[bytes], max_value_size: int):
+        self._chunks = chunks.__aiter__()
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._max_value_size = max_value_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    async def _fill(self) -> bool:
+        """读入下一块数据，已读完时返回 False"""
+        if self._eof:
+            return False
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self._eof = True
+            text = self._utf8.decode(b"", final=True)
+        else:
+            text = self._utf8.decode(chunk)
+        # 丢弃已解析的部分，缓冲区只保留未解析的文本
+        self._buf = self._buf[self._pos:] + text
+        self._pos = 0
+        return True
+
+    async def peek(self) -> Optional[str]:
+        """跳过空白并返回下一个字符（不消费），已到结尾时返回 None"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not await self._fill():
+                return None
+
+    async def expect(self, chars: str) -> str:
+        """消费下一个字符，该字符必须是 chars 之一"""
+        char = await self.peek()
+        if char is None or char not in chars:
+            raise JSONStreamError(f"应为 {' 或 '.join(repr(c) for c in chars)}，实际为 {char!r}")
+        self._pos += 1
+        return char
+
+    async def value(self) -> Any:
+        """解析下一个完整的 JSON 值，数据不完整时继续读入"""
+        await self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as e:
+                if len(self._buf) - self._pos > self._max_value_size:
+                    raise JSONStreamError(f"单条记录超过 {self._max_value_size} 个字符") from e
+                if not await self._fill():
+                    raise JSONStreamError(f"JSON 格式错误: {e.msg}") from e
+                continue
+            # 数字可能被数据块截断（如 "12" 之后还有 "3"），到达缓冲区末尾时需要再读入确认
+            if end == len(self._buf) and not self._eof and isinstance(value, (int, float)):
+                await self._fill()
+                continue
+            self._pos = end
+            return value
+
+    async def array_items(self) -> AsyncIterator[Any]:
+        """逐个解析数组元素"""
+        await self.expect("[")
+        if await self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield await self.value()
+            if await self.expect(",]") == "]":
+                return
+
+
+async def iter_json_records(
+    chunks: AsyncIterator[bytes],
+    key: str = "tasks",
+    max_value_size: int = 1 << 20
+) -> AsyncIterator[Tuple[int, Any]]:
+    """逐条产出 JSON 文档中的记录 (序号, 记录)，序号从 1 开始
+
+    文档为数组时产出数组元素；为对象时产出其中 key 字段数组的元素，其他字段解析后丢弃。
+    文档结构错误时抛出 JSONStreamError（已产出的记录不受影响）。
+    """
+    reader = _JSONStreamReader(chunks, max_value_size)
+    first = await reader.peek()
+    if first == "[":
+        items = reader.array_items()
+    elif first == "{":
+        await reader.expect("{")
+        while True:
+            if await reader.peek() == "}":
+                raise JSONStreamError(f"缺少 \"{key}\" 数组字段")
+            name = await reader.value()
+            await reader.expect(":")
+            if name == key:
+                if await reader.peek() != "[":
+                    raise JSONStreamError(f"\"{key}\" 字段应为数组")
+                items = reader.array_items()
+                break
+            await reader.value()
+            if await reader.expect(",}") == "}":
+                raise JSONStreamError(f"缺少 \"{key}\" 数组字段")
+    else:
+        raise JSONStreamError("JSON 文档应为数组或对象")
+
+    index = 0
+    async for item in items:
+        index += 1
+        yield index, item
+
+
+async def iter_ndjson_records(
+    chunks: AsyncIterator[bytes],
+    max_line_size: int = 1 << 20
+) -> AsyncIterator[Tuple[int, Any]]:
+    """逐行产出 NDJSON 记录 (行号, 记录)，空行跳过；某一行不是合法 JSON 时该行的记录为 RecordError"""
+    buf = b""
+    line_no = 0
+    async for chunk in chunks:
+        buf += chunk
+        *lines, buf = buf.split(b"\n")
+        if len(buf) > max_line_size:
+            raise JSONStreamError(f"第 {line_no + len(lines) + 1} 行超过 {max_line_size} 字节")
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                yield line_no, _parse_line(line, line_no)
+    if buf.strip():
+        yield line_no + 1, _parse_line(buf, line_no + 1)
+
+
+def _parse_line(line: bytes, line_no: int) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return RecordError(f"第 {line_no} 行不是合法的 JSON: {e}")
@@ -0,0 +1,267 @@
+# backend/app/core/metrics.py
+"""
+请求与数据库查询指标（Prometheus 文本格式，见 GET /metrics）
+
+- MetricsMiddleware 按路由模板（如 /tasks/{task_id}，不含具体 ID，避免标签过多）和请求方法记录请求数（按状态码）和延迟直方图
+- instrument_queries 在引擎上注册 before/after_cursor_execute 事件，统计每条 SQL 的耗时，
+  累加到当前请求（contextvar，线程池和异步引擎的 greenlet 中同样可见）；每个请求结束时按路由记录
+  查询条数和数据库耗时的直方图。逐行查询（N+1）会表现为查询条数直方图的突然升高
+- 不在请求中执行的查询（启动初始化、后台任务）单独计数
+"""
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+
+# 延迟直方图的桶上限（秒），数据库耗时使用同一组桶
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 每个请求查询条数直方图的桶上限
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500, 1000)
+
+# 未匹配任何路由的请求（404、CORS 预检等）使用的路由标签
+UNMATCHED_ROUTE = "<unmatched>"
+
+_QUERY_START = "metrics_query_start"
+
+
+class Histogram:
+    """累积直方图：每个桶记录不超过上限的观测次数"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for i, upper in enumerate(self.buckets):
+            if value <= upper:
+                self.counts[i] += 1
+
+
+class RequestDBStats:
+    """一个请求执行的查询条数和数据库耗时"""
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+# 当前请求的查询统计；线程池中执行的函数复制了请求的上下文，修改的是同一个对象
+_current_request: ContextVar[Optional[RequestDBStats]] = ContextVar("metrics_request", default=None)
+
+
+def current_request_stats() -> Optional[RequestDBStats]:
+    """当前请求到目前为止的查询统计（未启用请求指标或不在请求中时为 None）"""
+    return _current_request.get()
+
+
+class MetricsRegistry:
+    """按（方法, 路由）汇总的请求指标（线程安全）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.db_queries: Dict[Tuple[str, str], Histogram] = {}
+        self.db_seconds: Dict[Tuple[str, str], Histogram] = {}
+        self.in_progress = 0
+        self.background_queries = 0
+        self.background_query_seconds = 0.0
+
+    def record_request(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        seconds: Optional[float],
+        db_stats: RequestDBStats
+    ) -> None:
+        """记录一个已完成的请求；seconds 为 None 时（事件流等长连接）只计数，不记录延迟"""
+        key = (method, route)
+        with self._lock:
+            self.requests[(method, route, status)] = self.requests.get((method, route, status), 0) + 1
+            if seconds is not None:
+                self.latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(seconds)
+            self.db_queries.setdefault(key, Histogram(QUERY_COUNT_BUCKETS)).observe(db_stats.queries)
+            self.db_seconds.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(db_stats.seconds)
+
+    def record_background_query(self, seconds: float) -> None:
+        with self._lock:
+            self.background_queries += 1
+            self.background_query_seconds += seconds
+
+    def incr_in_progress(self, value: int) -> None:
+        with self._lock:
+            self.in_progress += value
+
+    def render(self) -> List[str]:
+        """请求指标的 Prometheus 文本格式（不含结尾换行）"""
+        with self._lock:
+            lines = [
+                "# HELP http_requests_total 已完成的 HTTP 请求数",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route, status), count in sorted(self.requests.items()):
+                lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+            lines += [
+                "# HELP http_requests_in_progress 正在处理的 HTTP 请求数",
+                "# TYPE http_requests_in_progress gauge",
+                f"http_requests_in_progress {self.in_progress}",
+            ]
+            lines += _render_histograms(
+                "http_request_duration_seconds", "HTTP 请求处理耗时（秒，至响应发送完毕）", self.latency
+            )
+            lines += _render_histograms("http_request_db_queries", "每个 HTTP 请求执行的 SQL 条数", self.db_queries)
+            lines += _render_histograms("http_request_db_seconds", "每个 HTTP 请求的数据库耗时（秒）", self.db_seconds)
+            lines += [
+                "# HELP db_background_queries_total 不属于任何 HTTP 请求的 SQL 条数（启动初始化、后台任务）",
+                "# TYPE db_background_queries_total counter",
+                f"db_background_queries_total {self.background_queries}",
+                "# HELP db_background_query_seconds_total 不属于任何 HTTP 请求的 SQL 总耗时（秒）",
+                "# TYPE db_background_query_seconds_total counter",
+                f"db_background_query_seconds_total {_number(self.background_query_seconds)}",
+            ]
+        return lines
+
+
+metrics = MetricsRegistry()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _render_histograms(name: str, help_text: str, histograms: Dict[Tuple[str, str], Histogram]) -> List[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for (method, route), histogram in sorted(histograms.items()):
+        for upper, count in zip(histogram.buckets, histogram.counts):
+            lines.append(f"{name}_bucket{_labels(method=method, route=route, le=_number(upper))} {count}")
+        lines.append(f"{name}_bucket{_labels(method=method, route=route, le='+Inf')} {histogram.count}")
+        lines.append(f"{name}_sum{_labels(method=method, route=route)} {_number(histogram.sum)}")
+        lines.append(f"{name}_count{_labels(method=method, route=route)} {histogram.count}")
+    return lines
+
+
+# 连接池指标：pool_status 的字段 -> (指标名, 类型, 说明)
+_POOL_METRICS = [
+    ("pool_size", "db_pool_size", "gauge", "连接池常驻连接数"),
+    ("max_overflow", "db_pool_max_overflow", "gauge", "连接池最多溢出连接数"),
+    ("checked_out", "db_pool_checked_out", "gauge", "已签出的连接数"),
+    ("checked_in", "db_pool_checked_in", "gauge", "池中空闲的连接数"),
+    ("overflow", "db_pool_overflow", "gauge", "当前溢出连接数"),
+    ("peak_overflow", "db_pool_peak_overflow", "gauge", "溢出连接数峰值"),
+    ("checkouts", "db_pool_checkouts_total", "counter", "连接签出次数"),
+    ("connects", "db_pool_connects_total", "counter", "新建连接数"),
+    ("invalidations", "db_pool_invalidations_total", "counter", "连接失效次数"),
+    ("pings", "db_pool_pings_total", "counter", "空闲预检次数"),
+    ("waits", "db_pool_waits_total", "counter", "因连接池耗尽而等待的签出次数"),
+    ("wait_time_seconds", "db_pool_wait_seconds_total", "counter", "等待连接的总时长（秒）"),
+    ("max_wait_seconds", "db_pool_max_wait_seconds", "gauge", "等待连接的最长时长（秒）"),
+    ("timeouts", "db_pool_timeouts_total", "counter", "签出连接超时次数"),
+]
+
+
+def render_pools(pools: Iterable[Tuple[str, dict]]) -> List[str]:
+    """连接池指标的 Prometheus 文本格式；pools 为 (引擎名, pool_status 返回值)"""
+    pools = list(pools)
+    lines = []
+    for field, name, metric_type, help_text in _POOL_METRICS:
+        samples = [(engine_name, status[field]) for engine_name, status in pools if status.get(field) is not None]
+        if not samples:
+            continue
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+        lines += [f"{name}{_labels(engine=engine_name)} {_number(value)}" for engine_name, value in samples]
+    return lines
+
+
+def render_replicas(statuses: Iterable[dict]) -> List[str]:
+    """只读副本健康状态的 Prometheus 文本格式；statuses 为 ReplicaSet.status() 的返回值"""
+    lines = ["# HELP db_replica_up 只读副本是否健康", "# TYPE db_replica_up gauge"]
+    lines += [f"db_replica_up{_labels(replica=status['name'])} {int(status['healthy'])}" for status in statuses]
+    return lines
+
+
+def instrument_queries(engine: Engine) -> None:
+    """统计引擎执行的每条 SQL 的耗时，累加到当前请求（异步引擎传入 async_engine.sync_engine）"""
+    if not settings.METRICS_ENABLED:
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(_QUERY_START, []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info[_QUERY_START].pop()
+        stats = _current_request.get()
+        if stats is None:
+            metrics.record_background_query(elapsed)
+        else:
+            stats.queries += 1
+            stats.seconds += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        # 执行出错时不会触发 after_cursor_execute，丢弃本条语句的开始时间（失败的查询不计入）；
+        # 语句执行完才会弹出开始时间，栈非空说明出错的正是刚开始执行的这条语句
+        # （ExceptionContext.cursor 在部分出错路径上未赋值，不能用它判断）
+        conn = exception_context.connection
+        if conn is not None and conn.info.get(_QUERY_START):
+            conn.info[_QUERY_START].pop()
+
+
+class MetricsMiddleware:
+    """记录每个请求的路由、状态码、耗时，以及请求期间执行的查询条数和数据库耗时"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        db_stats = RequestDBStats()
+        token = _current_request.set(db_stats)
+        status = 500
+        streaming = False
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, streaming
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                for key, value in message.get("headers", []):
+                    if key.lower() == b"content-type" and value.startswith(b"text/event-stream"):
+                        # 事件流是长连接，持续时间不是处理耗时
+                        streaming = True
+            await send(message)
+
+        metrics.incr_in_progress(1)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.incr_in_progress(-1)
+            _current_request.reset(token)
+            # 路由匹配后 Starlette 把匹配到的路由写入 scope
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+            metrics.record_request(scope["method"], route, status, None if streaming else elapsed, db_stats)
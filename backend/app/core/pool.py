@@ -0,0 +1,189 @@
+# backend/app/core/pool.py
+"""
+数据库连接池配置与指标
+
+- 连接池参数（pool_size、max_overflow、pool_recycle、pool_timeout、预检策略）来自 Settings
+- 统计签出/归还次数、新建连接数、失效次数、等待次数与等待时长、溢出连接使用情况、签出超时次数，
+  用于判断延迟尖刺是否来自连接池耗尽
+"""
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, URL
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from .config import settings
+
+# 预检策略：always（每次签出都 ping）、idle（连接空闲超过 DB_POOL_PRE_PING_IDLE 秒才 ping）、off（不 ping）
+PRE_PING_STRATEGIES = ("always", "idle", "off")
+
+_LAST_CHECKIN = "last_checkin"
+
+
+class PoolMetrics:
+    """连接池累计指标（线程安全）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.pings = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+        self.timeouts = 0
+        self.peak_overflow = 0
+
+    def incr(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + value)
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        """记录一次因连接池耗尽而等待的签出"""
+        with self._lock:
+            self.waits += 1
+            self.wait_time += seconds
+            self.max_wait = max(self.max_wait, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def record_overflow(self, overflow: int) -> None:
+        with self._lock:
+            self.peak_overflow = max(self.peak_overflow, overflow)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "pings": self.pings,
+                "waits": self.waits,
+                "wait_time_seconds": round(self.wait_time, 6),
+                "max_wait_seconds": round(self.max_wait, 6),
+                "timeouts": self.timeouts,
+                "peak_overflow": self.peak_overflow,
+            }
+
+
+class _InstrumentedPoolMixin:
+    """在 QueuePool 取连接的过程中统计等待时长和溢出连接数"""
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        metrics = self.metrics
+        if metrics is None:
+            return super()._do_get()  # type: ignore[misc]
+        # 已签出的连接数达到 pool_size + max_overflow 时，本次签出需要等待其他连接归还
+        exhausted = (
+            self._max_overflow > -1  # type: ignore[attr-defined]
+            and self.checkedout() >= self.size() + self._max_overflow  # type: ignore[attr-defined]
+        )
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()  # type: ignore[misc]
+        except exc.TimeoutError:
+            metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        if exhausted:
+            metrics.record_wait(time.perf_counter() - start)
+        metrics.record_overflow(self.overflow())  # type: ignore[attr-defined]
+        return conn
+
+    def recreate(self):
+        # engine.dispose() 会重建连接池，指标需要延续
+        pool = super().recreate()  # type: ignore[misc]
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_options(url: URL, is_async: bool = False) -> dict:
+    """根据配置生成 create_engine / create_async_engine 的连接池参数"""
+    if settings.DB_POOL_PRE_PING not in PRE_PING_STRATEGIES:
+        raise ValueError(f"未知的连接预检策略: {settings.DB_POOL_PRE_PING}")
+    options: dict = {"pool_pre_ping": settings.DB_POOL_PRE_PING == "always"}
+    # SQLite 内存数据库使用单连接池，不支持队列池参数
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+    options.update(
+        poolclass=InstrumentedAsyncAdaptedQueuePool if is_async else InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    return options
+
+
+def instrument_engine(engine: Engine) -> PoolMetrics:
+    """为引擎的连接池注册指标统计和空闲预检（异步引擎传入 async_engine.sync_engine）"""
+    metrics = PoolMetrics()
+    if isinstance(engine.pool, _InstrumentedPoolMixin):
+        engine.pool.metrics = metrics
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.incr("connects")
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.incr("checkouts")
+        if settings.DB_POOL_PRE_PING != "idle":
+            return
+        last_checkin = connection_record.info.get(_LAST_CHECKIN)
+        if last_checkin is None or time.monotonic() - last_checkin < settings.DB_POOL_PRE_PING_IDLE:
+            return
+        metrics.incr("pings")
+        try:
+            engine.dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            # 抛出 DisconnectionError 后连接池会丢弃该连接并重新签出
+            raise exc.DisconnectionError(f"空闲连接预检失败: {e}") from e
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        metrics.incr("checkins")
+        connection_record.info[_LAST_CHECKIN] = time.monotonic()
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.incr("invalidations")
+
+    @event.listens_for(engine, "soft_invalidate")
+    def _on_soft_invalidate(dbapi_connection, connection_record, exception):
+        metrics.incr("invalidations")
+
+    return metrics
+
+
+def pool_status(engine: Engine) -> dict:
+    """连接池当前状态、配置和累计指标"""
+    pool = engine.pool
+    status: dict = {"pool_class": type(pool).__name__, "pre_ping": settings.DB_POOL_PRE_PING}
+    if isinstance(pool, QueuePool):
+        status.update(
+            pool_size=pool.size(),
+            max_overflow=pool._max_overflow,  # type: ignore[attr-defined]
+            timeout=pool.timeout(),
+            recycle=pool._recycle,  # type: ignore[attr-defined]
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+        )
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        status.update(metrics.snapshot())
+    return status
@@ -0,0 +1,255 @@
+# backend/app/core/profiling.py
+"""
+按需性能剖析：对单个请求采样调用栈
+
+- 请求带 X-Profile 请求头或 profile 查询参数、且值等于 PROFILING_TOKEN 时（未配置 PROFILING_TOKEN 时不可用），
+  后台线程每 PROFILING_INTERVAL 秒对处理该请求的线程采样一次调用栈；profile 参数在路由处理前去掉，
+  请求的其他行为（缓存、ETag）不受影响
+- 采样的线程：事件循环线程（异步路由和异步引擎的查询），以及通过 run_db 在线程池中执行 crud 函数的线程。
+  异步模式下事件循环线程同时在处理其他请求，并发较高时结果中会混入其他请求的调用栈
+- 结果保存在最近 PROFILING_MAX_PROFILES 个的环形缓冲区中，响应头 X-Profile-Id 给出编号，
+  通过 GET /admin/profiles/{profile_id} 查看（JSON 汇总，或 folded 格式供火焰图工具使用）
+"""
+import functools
+import hmac
+import itertools
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+from .metrics import current_request_stats
+
+T = TypeVar("T")
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_QUERY_PARAM = "profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+# 调用栈最多保留的层数（从最内层算起）
+MAX_STACK_DEPTH = 100
+# 汇总中列出的函数数
+TOP_FUNCTIONS = 50
+
+
+class SamplingProfiler:
+    """后台线程定期读取 sys._current_frames()，统计已登记线程的调用栈出现次数"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._threads: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    @contextmanager
+    def track_current_thread(self) -> Iterator[None]:
+        """在 with 块执行期间对当前线程采样（同一线程可嵌套登记）"""
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads[ident] = self._threads.get(ident, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._threads[ident] -= 1
+                if not self._threads[ident]:
+                    del self._threads[ident]
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            with self._lock:
+                threads = list(self._threads)
+            frames = sys._current_frames()
+            for ident in threads:
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.stacks[_stack(frame)] += 1
+                    self.samples += 1
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({frame.f_globals.get('__name__', '?')}:{code.co_firstlineno})"
+
+
+def _stack(frame) -> Tuple[str, ...]:
+    """调用栈（最外层在前）"""
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return tuple(labels)
+
+
+class Profile:
+    """一个请求的剖析结果"""
+
+    def __init__(self, profile_id: int, method: str, path: str, query: str):
+        self.id = profile_id
+        self.time = datetime.now()
+        self.method = method
+        self.path = path
+        self.query = query
+        self.status = 0
+        self.seconds = 0.0
+        self.interval = settings.PROFILING_INTERVAL
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self.db_queries: Optional[int] = None
+        self.db_seconds: Optional[float] = None
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "time": self.time.isoformat(timespec="milliseconds"),
+            "method": self.method,
+            "path": self.path,
+            "query": self.query,
+            "status": self.status,
+            "duration_ms": round(self.seconds * 1000, 3),
+            "interval_ms": round(self.interval * 1000, 3),
+            "samples": self.samples,
+            "db_queries": self.db_queries,
+            "db_ms": round(self.db_seconds * 1000, 3) if self.db_seconds is not None else None,
+        }
+
+    def functions(self, limit: int = TOP_FUNCTIONS) -> List[dict]:
+        """按自身采样数（位于栈顶的次数）排序的函数，total 为出现在栈中的采样数"""
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for stack, count in self.stacks.items():
+            self_counts[stack[-1]] += count
+            for label in set(stack):
+                total_counts[label] += count
+        samples = self.samples or 1
+        return [
+            {
+                "function": label,
+                "self": self_counts[label],
+                "total": total,
+                "self_percent": round(self_counts[label] * 100 / samples, 1),
+                "total_percent": round(total * 100 / samples, 1),
+            }
+            for label, total in sorted(total_counts.items(), key=lambda item: (-self_counts[item[0]], -item[1]))[:limit]
+        ]
+
+    def folded(self) -> str:
+        """folded 格式（每行“外层;...;内层 采样数”），可直接用于 flamegraph.pl / speedscope"""
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common())
+
+
+_ids = itertools.count(1)
+_lock = threading.Lock()
+_profiles: deque = deque(maxlen=max(settings.PROFILING_MAX_PROFILES, 1))
+
+# 当前请求的采样器（未剖析时为 None）
+_active_profiler: ContextVar[Optional[SamplingProfiler]] = ContextVar("active_profiler", default=None)
+
+
+def get_profile(profile_id: int) -> Optional[Profile]:
+    with _lock:
+        for profile in _profiles:
+            if profile.id == profile_id:
+                return profile
+    return None
+
+
+def recent_profiles() -> List[dict]:
+    """最近的剖析结果汇总（新的在前）"""
+    with _lock:
+        profiles = list(_profiles)
+    return [profile.summary() for profile in reversed(profiles)]
+
+
+def tracked(fn: Callable[..., T]) -> Callable[..., T]:
+    """当前请求正在剖析时，返回在执行期间登记当前线程的 fn（用于交给线程池执行的函数）；否则原样返回"""
+    profiler = _active_profiler.get()
+    if profiler is None:
+        return fn
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with profiler.track_current_thread():
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def _requested(scope: Scope) -> Tuple[bool, bytes]:
+    """请求是否要求剖析，以及去掉 profile 参数后的查询字符串"""
+    token = settings.PROFILING_TOKEN
+    query_string = scope.get("query_string", b"")
+    if not token:
+        return False, query_string
+    values = [value for key, value in scope["headers"] if key == PROFILE_HEADER.lower().encode("latin-1")]
+    params = parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)
+    if any(key == PROFILE_QUERY_PARAM for key, _ in params):
+        values += [value.encode("latin-1") for key, value in params if key == PROFILE_QUERY_PARAM]
+        query_string = urlencode([(key, value) for key, value in params if key != PROFILE_QUERY_PARAM]).encode("latin-1")
+    requested = any(hmac.compare_digest(value, token.encode("utf-8")) for value in values)
+    return requested, query_string
+
+
+class ProfilingMiddleware:
+    """对带有效剖析标记的请求采样调用栈，结果存入环形缓冲区，响应头给出剖析编号"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        requested, query_string = _requested(scope)
+        if not requested:
+            await self.app(scope, receive, send)
+            return
+
+        # 原地修改 scope：外层中间件（请求指标）在请求结束后读取路由匹配结果
+        scope["query_string"] = query_string
+        profile = Profile(next(_ids), scope["method"], scope["path"], query_string.decode("latin-1"))
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                MutableHeaders(scope=message)[PROFILE_ID_HEADER] = str(profile.id)
+            await send(message)
+
+        profiler = SamplingProfiler(profile.interval)
+        token = _active_profiler.set(profiler)
+        start = time.perf_counter()
+        profiler.start()
+        try:
+            with profiler.track_current_thread():
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            profile.seconds = time.perf_counter() - start
+            _active_profiler.reset(token)
+            profile.samples = profiler.samples
+            profile.stacks = profiler.stacks
+            db_stats = current_request_stats()
+            if db_stats is not None:
+                profile.db_queries = db_stats.queries
+                profile.db_seconds = db_stats.seconds
+            with _lock:
+                _profiles.append(profile)
@@ -0,0 +1,150 @@
+# backend/app/core/replicas.py
+"""
+读写分离：只读请求分发到只读副本
+
+- 配置 DATABASE_REPLICA_URLS（逗号分隔）后，任务列表、统计和导出的只读请求按轮询分发到健康的副本，
+  写操作和其他请求仍然访问主库；没有健康的副本时读请求退回主库
+- 健康检查：后台每 DB_REPLICA_CHECK_INTERVAL 秒对每个副本执行 SELECT 1；请求中连接副本失败时
+  立即标记为不健康并改用主库重试（只读查询可以安全重试），直到健康检查再次成功
+- 读己之写：写请求成功后响应头 X-Read-Primary-Until 给出一个时间戳（Unix 秒），客户端在此之前的读请求带上该请求头，
+  读请求改走主库，避免刚修改完就从复制延迟中的副本读到旧数据（窗口为 READ_YOUR_WRITES_SECONDS 秒）
+"""
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from typing import Any, List, Mapping, Optional
+
+from sqlalchemy import exc, text
+from sqlalchemy.engine import Engine, URL
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+READ_YOUR_WRITES_HEADER = "X-Read-Primary-Until"
+
+# 只读请求不设置读己之写的时间窗口
+_READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class Replica:
+    """一个只读副本：同步引擎（健康检查、导出）及对应的会话工厂，异步模式下另有异步会话工厂"""
+
+    def __init__(self, url: URL, engine: Engine, session_factory: Any, async_session_factory: Any = None):
+        self.name = url.render_as_string(hide_password=True)
+        self.engine = engine
+        self.session_factory = session_factory
+        self.async_session_factory = async_session_factory
+        self.healthy = True
+        self.last_error: Optional[str] = None
+        self.failures = 0
+
+    def mark_down(self, error: Exception) -> None:
+        if self.healthy:
+            logger.warning(f"只读副本 {self.name} 不可用，读请求改走主库: {error}")
+        self.healthy = False
+        self.last_error = str(error)
+        self.failures += 1
+
+    def ping(self) -> None:
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+
+class ReplicaSet:
+    """只读副本集合：轮询选择健康的副本，并记录本进程最近一次写操作的时间"""
+
+    def __init__(self, replicas: List[Replica]):
+        self.replicas = replicas
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self.last_write_at = 0.0
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def choose(self) -> Optional[Replica]:
+        """按轮询顺序返回下一个健康的副本，都不健康时返回 None"""
+        with self._lock:
+            start = next(self._counter)
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if replica.healthy:
+                return replica
+        return None
+
+    def check_health(self) -> None:
+        """对每个副本执行 SELECT 1，更新健康状态（同步，在线程中执行）"""
+        for replica in self.replicas:
+            try:
+                replica.ping()
+            except Exception as e:
+                replica.mark_down(e)
+                continue
+            if not replica.healthy:
+                logger.info(f"只读副本 {replica.name} 已恢复")
+            replica.healthy = True
+            replica.last_error = None
+
+    def note_write(self) -> None:
+        self.last_write_at = time.monotonic()
+
+    def recently_written(self) -> bool:
+        """本进程在读己之写的时间窗口内执行过写操作（此时副本上的数据可能还是旧的）"""
+        return time.monotonic() - self.last_write_at < settings.READ_YOUR_WRITES_SECONDS
+
+    def status(self) -> List[dict]:
+        return [
+            {"name": replica.name, "healthy": replica.healthy, "failures": replica.failures, "last_error": replica.last_error}
+            for replica in self.replicas
+        ]
+
+
+def reads_primary(headers: Mapping[str, str]) -> bool:
+    """请求带有未过期的读己之写时间戳，应读取主库"""
+    value = headers.get(READ_YOUR_WRITES_HEADER.lower())
+    if not value:
+        return False
+    try:
+        return float(value) > time.time()
+    except ValueError:
+        return False
+
+
+def is_connection_error(error: exc.DBAPIError) -> bool:
+    """连接层面的错误（数据库不可达、连接断开），换一个数据库重试可能成功"""
+    return error.connection_invalidated or isinstance(error, (exc.OperationalError, exc.InterfaceError))
+
+
+async def monitor(replica_set: ReplicaSet, interval: float) -> None:
+    """后台定期检查副本健康状态（在 lifespan 中运行）"""
+    while True:
+        await run_in_threadpool(replica_set.check_health)
+        await asyncio.sleep(interval)
+
+
+class ReadYourWritesMiddleware:
+    """写请求成功后在响应头中给出读己之写的截止时间，并记录本进程最近一次写操作的时间"""
+
+    def __init__(self, app: ASGIApp, replica_set: ReplicaSet):
+        self.app = app
+        self.replica_set = replica_set
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in _READ_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                self.replica_set.note_write()
+                headers = MutableHeaders(scope=message)
+                headers[READ_YOUR_WRITES_HEADER] = f"{time.time() + settings.READ_YOUR_WRITES_SECONDS:.3f}"
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
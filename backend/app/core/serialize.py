@@ -0,0 +1,45 @@
+# backend/app/core/serialize.py
+"""
+任务列表的快速序列化
+
+列表接口直接查询所需列的行元组（不构造 ORM 对象），按响应模型 schemas.Task 的字段顺序
+编码为 JSON 字节，不再逐行经过 Pydantic 校验。数据库列类型已保证字段类型与响应模型一致，
+输出与 TypeAdapter(List[Task]).dump_json 的结果逐字节相同（紧凑格式、ISO 8601 日期时间、不转义非 ASCII 字符）。
+
+安装了 orjson 时使用 orjson 编码，否则退回标准库 json。
+"""
+import json
+from datetime import date, datetime
+from typing import Iterable, Sequence
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 为可选依赖
+    orjson = None
+
+# 响应字段（与 schemas.Task 的字段顺序、crud.task.LIST_COLUMNS 的列顺序一致）
+TASK_FIELDS = (
+    "title", "description", "category", "priority", "due_date",
+    "id", "is_completed", "created_at", "updated_at",
+)
+
+
+def _default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"无法序列化的类型: {type(value).__name__}")
+
+
+def dumps(value) -> bytes:
+    """编码为紧凑的 UTF-8 JSON 字节"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def encode_task_rows(rows: Iterable[Sequence], fields: Sequence[str] = TASK_FIELDS) -> bytes:
+    """将任务行元组编码为 JSON 数组
+
+    每行的前 len(fields) 列依次对应 fields 中的字段（默认全部字段），之后多出的列（如分页游标所需的排序键）忽略。
+    """
+    return dumps([dict(zip(fields, row)) for row in rows])
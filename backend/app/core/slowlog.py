@@ -0,0 +1,175 @@
+# backend/app/core/slowlog.py
+"""
+慢查询日志
+
+- 在引擎上注册 before/after_cursor_execute 事件，crud.task 中执行的 SQL 耗时超过 SLOW_QUERY_THRESHOLD 秒时，
+  记录 SQL、绑定参数、耗时和发起查询的 crud 函数，保存在最近 SLOW_QUERY_LOG_SIZE 条的环形缓冲区中；
+  绑定参数只用于获取执行计划，读取日志时默认只返回参数类型（SLOW_QUERY_LOG_PARAMETERS=true 时返回值）
+- 执行计划（EXPLAIN）在读取日志时才获取（见 explain_entry）：记录时连接上的结果集可能还未读完（流式导出），
+  不能在同一连接上执行其他语句；每条记录只获取一次
+"""
+import itertools
+import logging
+import sys
+import threading
+import time
+from collections import deque
+from datetime import date, datetime
+from typing import Any, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import settings
+from .explain import explain_sql, plan_problems
+
+logger = logging.getLogger(__name__)
+
+# 记录慢查询的来源模块（app.crud.task）
+SOURCE_MODULE = __name__.rsplit(".core.", 1)[0] + ".crud.task"
+# 可以获取执行计划的语句
+EXPLAIN_PREFIXES = ("SELECT", "WITH", "UPDATE", "DELETE")
+# 参数中字符串的最大显示长度
+MAX_PARAM_LENGTH = 200
+
+_QUERY_START = "slowlog_query_start"
+
+_ids = itertools.count(1)
+_lock = threading.Lock()
+_entries: deque = deque(maxlen=max(settings.SLOW_QUERY_LOG_SIZE, 1))
+
+
+class SlowQuery:
+    """一条慢查询记录"""
+
+    def __init__(self, statement: str, parameters: Any, seconds: float, source: str, dialect: str, executemany: bool):
+        self.id = next(_ids)
+        self.time = datetime.now()
+        self.statement = statement
+        self.parameters = parameters
+        self.seconds = seconds
+        self.source = source
+        self.dialect = dialect
+        self.executemany = executemany
+        self.plan: Optional[List[str]] = None
+        self.plan_error: Optional[str] = None
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "time": self.time.isoformat(timespec="milliseconds"),
+            "duration_ms": round(self.seconds * 1000, 3),
+            "source": self.source,
+            "sql": self.statement,
+            "parameters": _display(self.parameters) if settings.SLOW_QUERY_LOG_PARAMETERS else _redact(self.parameters),
+            "executemany": self.executemany,
+            "plan": self.plan,
+            "plan_problems": plan_problems(self.dialect, self.plan) if self.plan else [],
+            "plan_error": self.plan_error,
+        }
+
+
+def _display(value: Any) -> Any:
+    """绑定参数转换为可序列化为 JSON 的形式，过长的字符串截断"""
+    if isinstance(value, dict):
+        return {str(key): _display(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_display(item) for item in value]
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return f"<{len(value)} bytes>"
+    if isinstance(value, str) and len(value) > MAX_PARAM_LENGTH:
+        return value[:MAX_PARAM_LENGTH] + "…"
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return repr(value)
+
+
+def _redact(value: Any) -> Any:
+    """绑定参数只保留结构和类型（如 "<str>"），不返回值"""
+    if isinstance(value, dict):
+        return {str(key): _redact(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_redact(item) for item in value]
+    if value is None:
+        return None
+    return f"<{type(value).__name__}>"
+
+
+def _source() -> Optional[str]:
+    """调用栈中最外层的 crud.task 函数（如 get_tasks:120），不是由 crud.task 发起的查询返回 None"""
+    source = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        if frame.f_globals.get("__name__") == SOURCE_MODULE:
+            source = f"{frame.f_code.co_name}:{frame.f_lineno}"
+        frame = frame.f_back
+    return source
+
+
+def record(statement: str, parameters: Any, seconds: float, dialect: str, executemany: bool) -> None:
+    source = _source()
+    if source is None:
+        return
+    entry = SlowQuery(statement, parameters, seconds, source, dialect, executemany)
+    with _lock:
+        _entries.append(entry)
+    logger.warning(f"慢查询 {seconds * 1000:.1f}ms ({source}): {' '.join(statement.split())[:300]}")
+
+
+def instrument_slow_queries(engine: Engine) -> None:
+    """记录引擎上 crud.task 发起的慢查询（异步引擎传入 async_engine.sync_engine）；SLOW_QUERY_THRESHOLD 为负数时不注册"""
+    if settings.SLOW_QUERY_THRESHOLD < 0:
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(_QUERY_START, []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info[_QUERY_START].pop()
+        if elapsed >= settings.SLOW_QUERY_THRESHOLD:
+            record(statement, parameters, elapsed, conn.dialect.name, executemany)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        # 出错的语句不会触发 after_cursor_execute，丢弃其开始时间（见 metrics.instrument_queries）
+        conn = exception_context.connection
+        if conn is not None and conn.info.get(_QUERY_START):
+            conn.info[_QUERY_START].pop()
+
+
+def explain_entry(engine: Engine, entry: SlowQuery) -> None:
+    """获取一条慢查询的执行计划（使用同步引擎的新连接，每条记录只获取一次）"""
+    if entry.plan is not None or entry.plan_error is not None:
+        return
+    if entry.executemany or not entry.statement.lstrip().upper().startswith(EXPLAIN_PREFIXES):
+        entry.plan_error = "该语句不支持 EXPLAIN"
+        return
+    try:
+        with engine.connect() as conn:
+            entry.plan = explain_sql(conn, entry.statement, entry.parameters)
+    except Exception as e:
+        entry.plan_error = f"{type(e).__name__}: {e}"
+
+
+def recent(engine: Engine, limit: Optional[int] = None) -> List[dict]:
+    """最近的慢查询（新的在前），附带执行计划"""
+    with _lock:
+        entries = list(_entries)
+    entries.reverse()
+    if limit is not None:
+        entries = entries[:limit]
+    for entry in entries:
+        explain_entry(engine, entry)
+    return [entry.as_dict() for entry in entries]
+
+
+def clear() -> int:
+    """清空慢查询日志，返回清除的条数"""
+    with _lock:
+        count = len(_entries)
+        _entries.clear()
+    return count
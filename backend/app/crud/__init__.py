@@ -1,6 +1,4 @@
 # backend/app/crud/__init__.py
-from . import task
-
-__all__ = ["task"]
-
+from . import task, stats, search, version, sync
 
+__all__ = ["task", "stats", "search", "version", "sync"]
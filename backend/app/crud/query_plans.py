@@ -0,0 +1,41 @@
+# backend/app/crud/query_plans.py
+from typing import List, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..core.explain import explain_statement, plan_problems
+from . import task as task_crud
+
+# 常用的列表查询组合（与前端的筛选/排序方式对应），每个组合都应由组合索引直接提供顺序，
+# 不应出现全表扫描或额外排序。搜索依赖全文索引，不在此列。
+COMMON_QUERY_SHAPES = [
+    {},
+    {"sort_by": "priority"},
+    {"sort_by": "created_at"},
+    {"category": "工作"},
+    {"category": "工作", "sort_by": "priority"},
+    {"is_completed": False},
+    {"date_filter": "overdue"},
+    {"date_filter": "today"},
+    {"date_filter": "this_week"},
+    {"date_filter": "no_due_date"},
+    {"category": "工作", "date_filter": "this_month"},
+]
+
+# 列表页一次取的行数
+PAGE_SIZE = 50
+
+
+def check_query_plans(db: Session) -> List[Tuple[dict, List[str], List[str]]]:
+    """对常用查询执行 EXPLAIN
+
+    Returns:
+        [(查询参数, 执行计划, 问题列表)]，问题列表为空表示该查询可以由索引直接完成
+    """
+    conn = db.connection()
+    results = []
+    for shape in COMMON_QUERY_SHAPES:
+        statement = task_crud.tasks_query(db, **shape).limit(PAGE_SIZE).statement
+        plan = explain_statement(conn, statement)
+        results.append((shape, plan, plan_problems(conn.dialect.name, plan)))
+    return results
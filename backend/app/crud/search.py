@@ -0,0 +1,327 @@
+# backend/app/crud/search.py
+"""
+任务全文搜索后端
+
+- LikeSearchBackend：LIKE '%关键词%' 模糊匹配，任何数据库可用，不支持相关度排序
+- MySQLFullTextSearchBackend：MySQL FULLTEXT 索引（ngram 分词器，支持中文），生产环境使用
+- SQLiteFTS5SearchBackend：SQLite FTS5 虚拟表（trigram 分词器，支持中文子串），本地/测试环境使用
+- NgramMemorySearchBackend：进程内 n-gram 倒排索引，先在内存中求出候选 ID，再按主键查询数据库
+
+通过 Settings.SEARCH_BACKEND 选择：auto（默认，按数据库类型自动选择）、like、fulltext、memory。
+全文索引无法处理过短的关键词（ngram 为 2 个字符，trigram 为 3 个字符），此时自动退回 LIKE 匹配。
+"""
+import logging
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, column, false, func, inspect, literal_column, or_, select, table, text
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.elements import ColumnElement
+
+from ..core.config import settings
+from ..models.task import Task, task_fulltext_index
+
+logger = logging.getLogger(__name__)
+
+
+def _split_terms(search: str) -> List[str]:
+    """按空白拆分搜索关键词"""
+    return [term for term in re.split(r"\s+", search.strip()) if term]
+
+
+class LikeSearchBackend:
+    """LIKE 模糊匹配（无索引，兼容所有数据库）"""
+    name = "like"
+    # 是否需要 crud 写操作调用 index_tasks / remove_tasks 维护进程内索引
+    tracks_writes = False
+
+    def setup(self, engine: Engine) -> None:
+        pass
+
+    def index_tasks(self, tasks: Iterable[Any]) -> None:
+        """任务创建或更新并提交后调用，用于维护进程内索引（数据库索引无需处理）
+
+        Args:
+            tasks: Task 对象，或包含 id、title、description、category 列的查询结果行（UPDATE ... RETURNING 等）
+        """
+        pass
+
+    def remove_tasks(self, task_ids: Iterable[int]) -> None:
+        """任务删除并提交后调用，用于维护进程内索引（数据库索引无需处理）"""
+        pass
+
+    def apply(self, query: Query, search: str) -> Tuple[Query, Optional[ColumnElement]]:
+        """在查询上追加搜索条件，返回 (查询, 相关度表达式)；相关度越大越相关，不支持时为 None"""
+        search_term = f"%{search.strip()}%"
+        query = query.filter(
+            or_(
+                Task.title.like(search_term),
+                Task.description.like(search_term),
+                Task.category.like(search_term)
+            )
+        )
+        return query, None
+
+
+class MySQLFullTextSearchBackend(LikeSearchBackend):
+    """MySQL FULLTEXT 索引 + ngram 分词器"""
+    name = "mysql_fulltext"
+    # ngram 分词器的默认 ngram_token_size
+    min_term_length = 2
+
+    def setup(self, engine: Engine) -> None:
+        # 新建表时索引由 create_all 创建；已有的表在这里补建
+        existing = {index["name"] for index in inspect(engine).get_indexes(Task.__tablename__)}
+        if task_fulltext_index.name not in existing:
+            logger.info(f"创建全文索引 {task_fulltext_index.name} ...")
+            task_fulltext_index.create(bind=engine)
+
+    def apply(self, query: Query, search: str) -> Tuple[Query, Optional[ColumnElement]]:
+        terms = _split_terms(search)
+        if any(len(term) < self.min_term_length for term in terms):
+            return super().apply(query, search)
+        # 布尔模式：每个关键词作为必须出现的短语
+        against = " ".join('+"{}"'.format(term.replace('"', " ")) for term in terms)
+        score = match(Task.title, Task.description, Task.category, against=against).in_boolean_mode()
+        return query.filter(score), score
+
+
+class SQLiteFTS5SearchBackend(LikeSearchBackend):
+    """SQLite FTS5 外部内容虚拟表 + trigram 分词器，通过触发器与 tasks 表保持同步"""
+    name = "sqlite_fts5"
+    # trigram 分词器最少需要 3 个字符
+    min_term_length = 3
+    table = "tasks_fts"
+
+    def _update_trigger_sql(self) -> str:
+        # 只在被索引的列变化时更新索引：切换完成状态、修改优先级等不需要先删除再插入全文索引条目
+        return (
+            f"CREATE TRIGGER {self.table}_au AFTER UPDATE OF title, description, category ON tasks BEGIN "
+            f"INSERT INTO {self.table}({self.table}, rowid, title, description, category) "
+            "VALUES ('delete', old.id, old.title, old.description, old.category); "
+            f"INSERT INTO {self.table}(rowid, title, description, category) "
+            "VALUES (new.id, new.title, new.description, new.category); END"
+        )
+
+    def setup(self, engine: Engine) -> None:
+        with engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": self.table}
+            ).first()
+            if exists:
+                # 旧版本创建的更新触发器对任意列的更新都会触发，替换为只监听被索引的列
+                trigger = conn.execute(
+                    text("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = :name"),
+                    {"name": f"{self.table}_au"}
+                ).scalar()
+                if trigger is not None and " UPDATE OF " not in trigger.upper():
+                    logger.info(f"更新全文索引触发器 {self.table}_au ...")
+                    conn.execute(text(f"DROP TRIGGER {self.table}_au"))
+                    conn.execute(text(self._update_trigger_sql()))
+                return
+            logger.info(f"创建 FTS5 全文索引 {self.table} ...")
+            conn.execute(text(
+                f"CREATE VIRTUAL TABLE {self.table} USING fts5("
+                "title, description, category, "
+                "content='tasks', content_rowid='id', tokenize='trigram')"
+            ))
+            conn.execute(text(
+                f"CREATE TRIGGER {self.table}_ai AFTER INSERT ON tasks BEGIN "
+                f"INSERT INTO {self.table}(rowid, title, description, category) "
+                "VALUES (new.id, new.title, new.description, new.category); END"
+            ))
+            conn.execute(text(
+                f"CREATE TRIGGER {self.table}_ad AFTER DELETE ON tasks BEGIN "
+                f"INSERT INTO {self.table}({self.table}, rowid, title, description, category) "
+                "VALUES ('delete', old.id, old.title, old.description, old.category); END"
+            ))
+            conn.execute(text(self._update_trigger_sql()))
+            # 为已有数据建立索引
+            conn.execute(text(f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')"))
+
+    def apply(self, query: Query, search: str) -> Tuple[Query, Optional[ColumnElement]]:
+        terms = _split_terms(search)
+        if any(len(term) < self.min_term_length for term in terms):
+            return super().apply(query, search)
+        # 每个关键词作为一个短语，多个短语之间为 AND 关系
+        expression = " ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+        fts_table = table(self.table, column("rowid"))
+        fts = literal_column(self.table)
+        query = (
+            query.join(fts_table, fts_table.c.rowid == Task.id)
+            .filter(fts.op("MATCH")(expression))
+        )
+        # bm25 越小越相关，取反后与其他后端一致（越大越相关）
+        return query, -func.bm25(fts)
+
+
+class NgramMemorySearchBackend(LikeSearchBackend):
+    """进程内 n-gram 倒排索引
+
+    启动时从数据库加载 title/description/category 建立 n-gram -> 任务 ID 的倒排表，
+    之后由 crud 写操作在提交后同步更新。搜索时对每个关键词的所有 n-gram 求交集得到候选 ID，
+    再以 `id IN (...)` 加 LIKE 复核的方式按主键查询，避免全表扫描；中文子串同样适用。
+
+    关键词短于 n、候选过多或索引尚未建立时，交给 fallback 后端（数据库全文索引或 LIKE）处理。
+    索引只反映本进程内的写操作，适用于单进程部署。
+    """
+    name = "memory_ngram"
+    tracks_writes = True
+
+    def __init__(
+        self,
+        fallback: Optional[LikeSearchBackend] = None,
+        ngram_size: int = 3,
+        max_candidates: int = 10000
+    ):
+        self.fallback = fallback or LikeSearchBackend()
+        self.ngram_size = ngram_size
+        self.max_candidates = max_candidates
+        self._postings: Dict[str, Set[int]] = {}
+        self._doc_grams: Dict[int, frozenset] = {}
+        self._lock = threading.Lock()
+        self._ready = False
+
+    def _grams(self, *fields: Optional[str]) -> frozenset:
+        """计算多个字段的 n-gram 集合（不跨字段，忽略大小写）"""
+        n = self.ngram_size
+        grams = set()
+        for value in fields:
+            if value:
+                value = value.lower()
+                grams.update(value[i:i + n] for i in range(len(value) - n + 1))
+        return frozenset(grams)
+
+    def _add(self, task_id: int, grams: frozenset) -> None:
+        self._discard(task_id)
+        self._doc_grams[task_id] = grams
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(task_id)
+
+    def _discard(self, task_id: int) -> None:
+        for gram in self._doc_grams.pop(task_id, ()):
+            ids = self._postings.get(gram)
+            if ids is not None:
+                ids.discard(task_id)
+                if not ids:
+                    del self._postings[gram]
+
+    def setup(self, engine: Engine) -> None:
+        self.fallback.setup(engine)
+        stmt = select(Task.id, Task.title, Task.description, Task.category)
+        with self._lock:
+            self._postings.clear()
+            self._doc_grams.clear()
+            with engine.connect() as conn:
+                result = conn.execution_options(stream_results=True, yield_per=10000).execute(stmt)
+                for task_id, title, description, category in result:
+                    self._add(task_id, self._grams(title, description, category))
+            self._ready = True
+        logger.info(f"内存 n-gram 索引建立完成：{len(self._doc_grams)} 个任务，{len(self._postings)} 个 n-gram")
+
+    def index_tasks(self, tasks: Iterable[Any]) -> None:
+        entries = [
+            (int(task.id), self._grams(task.title, task.description, task.category))
+            for task in tasks
+        ]
+        with self._lock:
+            for task_id, grams in entries:
+                self._add(task_id, grams)
+
+    def remove_tasks(self, task_ids: Iterable[int]) -> None:
+        with self._lock:
+            for task_id in task_ids:
+                self._discard(task_id)
+
+    def candidate_ids(self, terms: List[str]) -> Optional[Set[int]]:
+        """求同时包含所有关键词的候选任务 ID；无法用索引回答时返回 None"""
+        if not self._ready or any(len(term) < self.ngram_size for term in terms):
+            return None
+        # 先处理倒排表最短的 n-gram，交集尽早缩小
+        grams = {gram for term in terms for gram in self._grams(term)}
+        with self._lock:
+            postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+            if not postings or not postings[0]:
+                return set()
+            candidates = set(postings[0])
+            for ids in postings[1:]:
+                candidates &= ids
+                if not candidates:
+                    break
+        return candidates
+
+    def apply(self, query: Query, search: str) -> Tuple[Query, Optional[ColumnElement]]:
+        terms = _split_terms(search)
+        candidates = self.candidate_ids(terms)
+        if candidates is None or len(candidates) > self.max_candidates:
+            return self.fallback.apply(query, search)
+        if not candidates:
+            return query.filter(false()), None
+        # n-gram 命中不代表子串命中，用 LIKE 在候选行上复核
+        return query.filter(
+            Task.id.in_(candidates),
+            and_(*[
+                or_(
+                    Task.title.like(f"%{term}%"),
+                    Task.description.like(f"%{term}%"),
+                    Task.category.like(f"%{term}%")
+                )
+                for term in terms
+            ])
+        ), None
+
+
+_BACKENDS = {
+    "like": LikeSearchBackend,
+    "mysql": MySQLFullTextSearchBackend,
+    "sqlite": SQLiteFTS5SearchBackend,
+}
+
+# 当前使用的搜索后端，setup_search_backend 之前默认使用 LIKE
+_backend: LikeSearchBackend = LikeSearchBackend()
+
+
+def get_search_backend() -> LikeSearchBackend:
+    """获取当前使用的搜索后端"""
+    return _backend
+
+
+def setup_search_backend(engine: Engine) -> LikeSearchBackend:
+    """根据配置和数据库类型选择搜索后端并创建所需索引
+
+    全文索引创建失败（如 SQLite 未编译 FTS5）时退回 LIKE 匹配。
+    """
+    global _backend
+    mode = settings.SEARCH_BACKEND
+    backend_cls = LikeSearchBackend
+    if mode in ("auto", "fulltext", "memory"):
+        backend_cls = _BACKENDS.get(engine.dialect.name, LikeSearchBackend)
+    elif mode != "like":
+        raise ValueError(f"未知的搜索后端: {mode}")
+
+    backend = backend_cls()
+    try:
+        backend.setup(engine)
+    except Exception as e:
+        if mode == "fulltext":
+            raise
+        logger.warning(f"全文索引不可用，退回 LIKE 搜索: {e}")
+        backend = LikeSearchBackend()
+
+    if mode == "memory":
+        # 内存索引在前，数据库全文索引 / LIKE 作为短关键词和宽泛查询的后备
+        memory_backend = NgramMemorySearchBackend(
+            fallback=backend,
+            ngram_size=settings.SEARCH_NGRAM_SIZE,
+            max_candidates=settings.SEARCH_MAX_CANDIDATES
+        )
+        memory_backend.setup(engine)
+        backend = memory_backend
+
+    _backend = backend
+    logger.info(f"搜索后端: {backend.name}")
+    return backend
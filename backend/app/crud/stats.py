@@ -0,0 +1,151 @@
+# backend/app/crud/stats.py
+from collections import Counter
+from datetime import date
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import func, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..models.task import Task, TaskCounter
+
+# 计数键：(分类, 优先级, 完成状态)
+CounterKey = Tuple[str, int, bool]
+
+
+def counter_key(category: Optional[str], priority: Optional[int], is_completed: Optional[bool]) -> CounterKey:
+    """将任务字段归一化为计数键（空分类记为 ""，空优先级记为 0）"""
+    return (category or "", priority or 0, bool(is_completed))
+
+
+def task_counter_key(task: Task) -> CounterKey:
+    """获取一个任务对应的计数键"""
+    return counter_key(task.category, task.priority, task.is_completed)  # type: ignore[arg-type]
+
+
+def _bump_counter(db: Session, key: CounterKey, delta: int) -> None:
+    """对单个计数键增加 delta（可为负数），键不存在时创建"""
+    category, priority, is_completed = key
+    dialect = db.get_bind().dialect.name
+    values = {"category": category, "priority": priority, "is_completed": is_completed, "count": delta}
+
+    if dialect == "mysql":
+        stmt = mysql_insert(TaskCounter).values(**values)
+        db.execute(stmt.on_duplicate_key_update(count=TaskCounter.count + delta))
+        return
+    if dialect == "sqlite":
+        stmt = sqlite_insert(TaskCounter).values(**values)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["category", "priority", "is_completed"],
+            set_={"count": TaskCounter.count + delta}
+        ))
+        return
+
+    # 其他数据库：先 UPDATE，没有命中再 INSERT
+    result = db.execute(
+        update(TaskCounter)
+        .where(
+            TaskCounter.category == category,
+            TaskCounter.priority == priority,
+            TaskCounter.is_completed == is_completed
+        )
+        .values(count=TaskCounter.count + delta)
+    )
+    if result.rowcount == 0:  # type: ignore[attr-defined]
+        db.add(TaskCounter(**values))
+
+
+def bump_task_counters(db: Session, deltas: Iterable[Tuple[CounterKey, int]]) -> None:
+    """按计数键批量更新计数
+
+    在调用方提交事务之前执行，计数变化与任务写入处于同一事务中。
+    """
+    merged: Counter = Counter()
+    for key, delta in deltas:
+        merged[key] += delta
+    for key, delta in merged.items():
+        if delta:
+            _bump_counter(db, key, delta)
+
+
+def rebuild_task_counters(db: Session) -> int:
+    """根据 tasks 表重建计数表，用于修复计数偏差
+
+    Returns:
+        重建后的计数键数量
+    """
+    rows = (
+        db.query(Task.category, Task.priority, Task.is_completed, func.count(Task.id))
+        .group_by(Task.category, Task.priority, Task.is_completed)
+        .all()
+    )
+    merged: Counter = Counter()
+    for category, priority, is_completed, count in rows:
+        merged[counter_key(category, priority, is_completed)] += count
+
+    db.query(TaskCounter).delete(synchronize_session=False)
+    db.add_all([
+        TaskCounter(category=category, priority=priority, is_completed=is_completed, count=count)
+        for (category, priority, is_completed), count in merged.items()
+    ])
+    db.commit()
+    return len(merged)
+
+
+def ensure_task_counters(db: Session) -> None:
+    """计数表为空但已有任务时（如首次升级到计数表版本）自动重建"""
+    if db.query(TaskCounter.id).first() is None and db.query(Task.id).first() is not None:
+        rebuild_task_counters(db)
+
+
+def get_task_stats(db: Session) -> dict:
+    """获取任务统计信息（总数、完成数、过期数、按分类/优先级统计、分类列表）
+
+    分类和优先级统计直接读取计数表，耗时只与分类数量相关，与任务总数无关；
+    过期数依赖当前日期无法预先计数，通过 (is_completed, has_due_date, due_date) 组合索引范围查询得到。
+    """
+    by_category: dict = {}
+    by_priority: dict = {1: [0, 0], 2: [0, 0], 3: [0, 0]}
+    total = 0
+    completed = 0
+    for category, priority, is_completed, count in db.query(
+        TaskCounter.category, TaskCounter.priority, TaskCounter.is_completed, TaskCounter.count
+    ).filter(TaskCounter.count != 0):
+        done = count if is_completed else 0
+        total += count
+        completed += done
+        category_counts = by_category.setdefault(category or None, [0, 0])
+        category_counts[0] += count
+        category_counts[1] += done
+        # 优先级为空时按“中”优先级统计，与创建任务时的默认值一致
+        priority_counts = by_priority.setdefault(priority or 2, [0, 0])
+        priority_counts[0] += count
+        priority_counts[1] += done
+
+    # 过期任务：未完成且截止日期早于今天
+    overdue = (
+        db.query(func.count(Task.id))
+        .filter(
+            Task.is_completed == False,  # noqa: E712
+            Task.has_due_date == True,  # noqa: E712
+            Task.due_date < date.today()
+        )
+        .scalar()
+    )
+
+    return {
+        "total": total,
+        "completed": completed,
+        "overdue": overdue or 0,
+        "categories": sorted(category for category, counts in by_category.items() if category and counts[0] > 0),
+        "category_stats": [
+            {"category": category, "total": counts[0], "completed": counts[1]}
+            for category, counts in sorted(by_category.items(), key=lambda item: -item[1][0])
+            if counts[0] > 0
+        ],
+        "priority_stats": [
+            {"priority": priority, "total": counts[0], "completed": counts[1]}
+            for priority, counts in sorted(by_priority.items())
+        ],
+    }
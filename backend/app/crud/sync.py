@@ -0,0 +1,170 @@
+# backend/app/crud/sync.py
+"""
+增量同步：返回水位线之后新增/更新的任务和已删除任务的 ID
+
+水位线记录两个位置：任务按 (updated_at, id) 的位置和删除记录按 (deleted_at, task_id) 的位置，
+两者分别由 ix_tasks_updated_order、ix_task_tombstones_deleted_order 索引做范围扫描，耗时与变更数量相关，
+与任务总数无关。
+
+更新时间取自语句执行时的数据库时间，事务提交可能晚于该时间：最后一页返回的水位线为
+“数据库当前时间 - SYNC_SAFETY_SECONDS”，这段时间内的变更在下次同步时会重复返回（按 ID 覆盖即可），
+保证提交较晚的变更不会被跳过。
+"""
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple, TypeVar, Union
+
+from sqlalchemy import delete, exists, func, insert, select, type_coerce
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Insert, Select
+
+from ..models.task import Task, TaskTombstone, TimestampType
+from . import task as task_crud
+
+# 水位线中的一个位置：(时间, ID)，表示该位置及之前的记录都已同步
+Position = Tuple[datetime, int]
+
+# 各数据库方言的 INSERT 语句类型（dialects.mysql.Insert / dialects.sqlite.Insert 均继承自 Insert）
+InsertT = TypeVar("InsertT", bound=Insert)
+
+
+class WatermarkExpired(ValueError):
+    """水位线早于删除记录的保留期，无法确定期间删除了哪些任务，客户端需要全量同步"""
+    pass
+
+
+def record_tombstones(db: Session, task_ids: Union[List[int], Select]) -> None:
+    """记录被删除的任务（在删除任务的同一事务内调用）
+
+    Args:
+        task_ids: 任务 ID 列表，或返回任务 ID 的 SELECT（须在删除任务之前执行）
+    """
+    if not isinstance(task_ids, Select) and not task_ids:
+        return
+
+    def with_rows(stmt: InsertT) -> InsertT:
+        if isinstance(task_ids, Select):
+            return stmt.from_select(["task_id", "deleted_at"], task_ids.add_columns(func.now()))
+        return stmt.values([{"task_id": task_id, "deleted_at": func.now()} for task_id in task_ids])
+
+    # 同一 ID 再次被删除（SQLite 可能复用最大的 ID）时更新删除时间
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        mysql_stmt = with_rows(mysql_insert(TaskTombstone))
+        db.execute(mysql_stmt.on_duplicate_key_update(deleted_at=mysql_stmt.inserted.deleted_at))
+    elif dialect == "sqlite":
+        sqlite_stmt = with_rows(sqlite_insert(TaskTombstone))
+        db.execute(sqlite_stmt.on_conflict_do_update(
+            index_elements=["task_id"], set_={"deleted_at": sqlite_stmt.excluded.deleted_at}
+        ))
+    else:
+        db.execute(delete(TaskTombstone).where(TaskTombstone.task_id.in_(task_ids)))
+        db.execute(with_rows(insert(TaskTombstone)))
+
+def prune_tombstones(db: Session, retention_days: int) -> int:
+    """删除超过保留期的删除记录，返回删除的条数"""
+    cutoff = _db_now(db) - timedelta(days=retention_days)
+    result = db.execute(delete(TaskTombstone).where(TaskTombstone.deleted_at < cutoff))
+    db.commit()
+    return result.rowcount  # type: ignore[attr-defined]
+
+
+def _db_now(db: Session) -> datetime:
+    """数据库当前时间（与 updated_at / deleted_at 的默认值来源一致）"""
+    return db.execute(select(type_coerce(func.now(), TimestampType))).scalar_one().replace(microsecond=0)
+
+
+def encode_watermark(tasks_position: Position, tombstones_position: Position) -> str:
+    payload = {
+        "t": [tasks_position[0].isoformat(), tasks_position[1]],
+        "d": [tombstones_position[0].isoformat(), tombstones_position[1]],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_watermark(watermark: str) -> Tuple[Position, Position]:
+    """解析水位线，无效时抛出 ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(watermark + "=" * (-len(watermark) % 4))
+        payload = json.loads(raw)
+        return (
+            (datetime.fromisoformat(payload["t"][0]), int(payload["t"][1])),
+            (datetime.fromisoformat(payload["d"][0]), int(payload["d"][1])),
+        )
+    except (ValueError, KeyError, TypeError, IndexError, binascii.Error) as e:
+        raise ValueError(f"无效的同步水位线: {e}") from e
+
+
+def get_changes(
+    db: Session,
+    since: Optional[str] = None,
+    limit: int = 500,
+    safety_seconds: int = 30,
+    retention_days: int = 30
+) -> dict:
+    """获取水位线之后的变更
+
+    每次最多返回 limit 个变更的任务和 limit 个删除的任务 ID；has_more 为 true 时用返回的水位线继续获取。
+    不传 since 时为全量同步：返回全部任务，删除记录从当前时间开始跟踪。
+
+    Returns:
+        {"changes": [任务行], "deleted": [任务 ID], "watermark": 新水位线, "has_more": 是否还有更多变更}
+
+    Raises:
+        ValueError: 水位线无效
+        WatermarkExpired: 水位线早于删除记录的保留期
+    """
+    now = _db_now(db)
+    # 最后一页返回的水位线（ID 为 -1 表示该秒内的记录都未同步）
+    cutoff: Position = (now - timedelta(seconds=safety_seconds), -1)
+    if since:
+        tasks_position, tombstones_position = decode_watermark(since)
+        if tombstones_position[0] < now - timedelta(days=retention_days):
+            raise WatermarkExpired("同步水位线已过期，请重新全量同步（不带 since 参数）")
+    else:
+        tasks_position, tombstones_position = (datetime.min, -1), cutoff
+
+    rows = db.execute(
+        select(*task_crud.LIST_COLUMNS)
+        .where(task_crud._keyset_condition([
+            (Task.updated_at, True, tasks_position[0]),
+            (Task.id, True, tasks_position[1]),
+        ]))
+        .order_by(Task.updated_at, Task.id)
+        .limit(limit + 1)
+    ).all()
+    tombstones = db.execute(
+        select(TaskTombstone.task_id, TaskTombstone.deleted_at)
+        .where(
+            task_crud._keyset_condition([
+                (TaskTombstone.deleted_at, True, tombstones_position[0]),
+                (TaskTombstone.task_id, True, tombstones_position[1]),
+            ]),
+            # ID 被复用（任务已重新创建）的删除记录不再返回
+            ~exists().where(Task.id == TaskTombstone.task_id)
+        )
+        .order_by(TaskTombstone.deleted_at, TaskTombstone.task_id)
+        .limit(limit + 1)
+    ).all()
+
+    has_more = len(rows) > limit or len(tombstones) > limit
+    rows, tombstones = rows[:limit], tombstones[:limit]
+    if rows:
+        tasks_position = (rows[-1].updated_at, rows[-1].id)
+    if tombstones:
+        tombstones_position = (tombstones[-1].deleted_at, tombstones[-1].task_id)
+    if not has_more:
+        # 截至当前的变更都已返回：水位线统一回退到 cutoff，之后的变更下次重复返回
+        tasks_position = tombstones_position = cutoff
+
+    return {
+        "changes": rows,
+        "deleted": [task_id for task_id, _ in tombstones],
+        "watermark": encode_watermark(tasks_position, tombstones_position),
+        "has_more": has_more,
+    }
@@ -1,10 +1,25 @@
 # backend/app/crud/task.py
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, case, or_
-from typing import List, Optional
+from sqlalchemy.orm import Session, Query
+from sqlalchemy import desc, or_, and_, delete, func, insert, select, tuple_, update
+from sqlalchemy.sql.elements import ColumnElement
+from typing import Any, Iterator, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+import base64
+import binascii
+import json
+import logging
+import time
 
+from ..core import cache, changefeed
+from ..core.config import settings
 from ..models.task import Task
 from ..schemas.task import TaskCreate, TaskUpdate
+from . import stats
+from . import version
+from . import sync
+from . import search as search_backend
+
+logger = logging.getLogger(__name__)
 
 
 def create_task(db: Session, task: TaskCreate) -> Task:
@@ -17,86 +32,484 @@ def create_task(db: Session, task: TaskCreate) -> Task:
         due_date=task.due_date
     )
     db.add(db_task)
+    stats.bump_task_counters(db, [(stats.task_counter_key(db_task), 1)])
+    version.bump_version(db)
     db.commit()
     db.refresh(db_task)
+    search_backend.get_search_backend().index_tasks([db_task])
+    cache.invalidate_cache()
+    changefeed.publish_task("insert", db_task)
     return db_task
 
 
-def get_tasks(
-    db: Session, 
+def _filter_tasks_query(
+    query: Query,
     is_completed: Optional[bool] = None,
     category: Optional[str] = None,
-    sort_by: Optional[str] = None,
     search: Optional[str] = None,
     date_filter: Optional[str] = None
-) -> List[Task]:
-    """获取任务列表，支持按完成状态和分类过滤，支持排序，支持全文搜索，支持日期筛选"""
-    from datetime import date, timedelta
-    from sqlalchemy import and_, or_
-    
-    query = db.query(Task)
-    
+) -> Tuple[Query, Optional[ColumnElement]]:
+    """在查询上应用完成状态、分类、日期筛选和全文搜索条件
+
+    Returns:
+        (查询, 搜索相关度表达式)；未搜索或搜索后端不支持相关度时相关度为 None
+    """
     if is_completed is not None:
         query = query.filter(Task.is_completed == is_completed)
     
     if category is not None:
         query = query.filter(Task.category == category)
     
-    # 日期筛选
+    # 日期筛选（同时限定 has_due_date，使截止日期相关的组合索引可以按前缀命中）
     if date_filter:
         today = date.today()
         tomorrow = today + timedelta(days=1)
         week_end = today + timedelta(days=7)
         month_end = today + timedelta(days=30)
         
+        has_due_date = Task.has_due_date == True  # noqa: E712
         if date_filter == "overdue":
             # 已过期：截止日期小于今天
-            query = query.filter(Task.due_date < today)
+            query = query.filter(has_due_date, Task.due_date < today)
         elif date_filter == "today":
             # 今天到期
-            query = query.filter(Task.due_date == today)
+            query = query.filter(has_due_date, Task.due_date == today)
         elif date_filter == "tomorrow":
             # 明天到期
-            query = query.filter(Task.due_date == tomorrow)
+            query = query.filter(has_due_date, Task.due_date == tomorrow)
         elif date_filter == "this_week":
             # 本周到期：今天到7天后
-            query = query.filter(and_(Task.due_date >= today, Task.due_date <= week_end))
+            query = query.filter(has_due_date, and_(Task.due_date >= today, Task.due_date <= week_end))
         elif date_filter == "this_month":
             # 本月到期：今天到30天后
-            query = query.filter(and_(Task.due_date >= today, Task.due_date <= month_end))
+            query = query.filter(has_due_date, and_(Task.due_date >= today, Task.due_date <= month_end))
         elif date_filter == "no_due_date":
             # 无截止日期
-            query = query.filter(Task.due_date.is_(None))
+            query = query.filter(Task.has_due_date == False)  # noqa: E712
     
-    # 全文搜索：在标题、描述、分类中搜索关键词
+    # 全文搜索：在标题、描述、分类中搜索关键词（由配置的搜索后端决定使用全文索引还是 LIKE）
+    score = None
     if search and search.strip():
-        search_term = f"%{search.strip()}%"
-        query = query.filter(
-            or_(
-                Task.title.like(search_term),
-                Task.description.like(search_term),
-                Task.category.like(search_term)
-            )
-        )
+        query, score = search_backend.get_search_backend().apply(query, search)
     
-    # 排序逻辑
+    return query, score
+
+
+# -----------------------------------------------------
+# 游标分页（Keyset Pagination）
+# -----------------------------------------------------
+# 游标中记录上一页最后一行的排序键，下一页直接用 WHERE 条件从该位置继续，
+# 不使用 OFFSET，因此翻页深度不影响查询耗时。所有排序都以 id 作为最终的
+# 唯一排序键，保证顺序稳定、翻页不重不漏。
+
+def _sort_mode(sort_by: Optional[str], ranked: bool = False) -> str:
+    """将 sort_by 参数归一化为排序模式：relevance、priority、due_date（默认）或 created_at
+
+    ranked 表示本次查询是否有搜索相关度；有相关度且未指定排序（或指定 relevance）时按相关度排序，
+    没有相关度时 relevance 退回默认排序。
+    """
+    if ranked and sort_by in (None, "relevance"):
+        return "relevance"
     if sort_by == "priority":
+        return "priority"
+    if sort_by in ("due_date", "relevance") or sort_by is None:
+        return "due_date"
+    return "created_at"
+
+
+def _order_tasks_query(
+    query: Query,
+    sort_by: Optional[str] = None,
+    score: Optional[ColumnElement] = None
+) -> Query:
+    """按排序模式为查询添加 ORDER BY"""
+    mode = _sort_mode(sort_by, ranked=score is not None)
+    if mode == "relevance" and score is not None:
+        # 按搜索相关度降序（最相关的在前）
+        return query.order_by(desc(score), desc(Task.id))
+    if mode == "priority":
         # 按优先级升序（1=高优先级在前），然后按创建时间倒序
-        query = query.order_by(Task.priority.asc(), desc(Task.created_at))
-    elif sort_by == "due_date" or sort_by is None:
+        return query.order_by(Task.priority.asc(), desc(Task.created_at), desc(Task.id))
+    if mode == "due_date":
         # 按截止日期升序（即将到期的在前），无截止日期的在最后，然后按优先级
-        # 这是默认排序方式
-        query = query.order_by(
-            case((Task.due_date.is_(None), 1), else_=0),
+        # 这是默认排序方式；用生成列 has_due_date 代替 CASE 表达式，可以直接按组合索引顺序读取
+        return query.order_by(
+            desc(Task.has_due_date),
             Task.due_date.asc(),
             Task.priority.asc(),
-            desc(Task.created_at)
+            desc(Task.created_at),
+            desc(Task.id)
         )
+    # 其他情况：按创建时间倒序排列（最新的在前）
+    return query.order_by(desc(Task.created_at), desc(Task.id))
+
+
+def _keyset_segments(keys: List[Tuple[Any, bool, Any]]) -> List[ColumnElement]:
+    """把字典序的“排在该位置之后”拆成按排序先后排列、互不重叠的若干段条件
+
+    keys 为 (列, 是否升序, 上一行的值) 列表。末尾方向相同的几列合并为行值比较 (k2, k3) > (v2, v3)
+    （降序列使用 <），于是 keys = [k1, k2, k3] 拆成：
+    k1 = v1 AND (k2, k3) > (v2, v3)；k1 > v1。
+    每段都是“等值前缀 + 一个范围”，可以直接在组合索引中定位并按索引顺序读取；
+    展开成一个 OR 条件时 SQLite 只能从索引开头逐行过滤，翻页越深越慢。
+    """
+    split = len(keys) - 1
+    while split > 0 and keys[split - 1][1] == keys[-1][1]:
+        split -= 1
+    tail = keys[split:]
+    if len(tail) == 1:
+        column, ascending, value = tail[0]
+        tail_condition = column > value if ascending else column < value
     else:
-        # 其他情况：按创建时间倒序排列（最新的在前）
-        query = query.order_by(desc(Task.created_at))
+        columns = tuple_(*(column for column, _, _ in tail))
+        values = tuple(value for _, _, value in tail)
+        tail_condition = columns > values if tail[0][1] else columns < values
+
+    def prefix(n: int) -> List[ColumnElement]:
+        return [column == value for column, _, value in keys[:n]]
+
+    segments = [and_(*prefix(split), tail_condition)]
+    for i in range(split - 1, -1, -1):
+        column, ascending, value = keys[i]
+        segments.append(and_(*prefix(i), column > value if ascending else column < value))
+    return segments
+
+
+def _keyset_condition(keys: List[Tuple[Any, bool, Any]]) -> ColumnElement:
+    """构造字典序的“排在该位置之后”条件（_keyset_segments 各段的 OR）
+
+    只有一段（各列方向相同，即一个行值比较）时可以直接用索引定位；分页查询按段分别执行，见 _get_page。
+    """
+    segments = _keyset_segments(keys)
+    return segments[0] if len(segments) == 1 else or_(*segments)
+
+
+def encode_cursor(task: Task, sort_by: Optional[str] = None, relevance: Optional[float] = None) -> str:
+    """根据一行任务的排序键（按相关度排序时还包括相关度）生成不透明游标"""
+    mode = _sort_mode(sort_by, ranked=relevance is not None)
+    payload = {
+        "m": mode,
+        "id": task.id,
+        "c": task.created_at.isoformat() if task.created_at is not None else None,
+        "p": task.priority,
+    }
+    if mode == "due_date":
+        payload["d"] = task.due_date.isoformat() if task.due_date is not None else None
+    if mode == "relevance":
+        payload["r"] = relevance
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: Optional[str] = None, ranked: bool = False) -> dict:
+    """解析游标，游标无效或与当前排序方式不匹配时抛出 ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if payload["m"] != _sort_mode(sort_by, ranked):
+            raise ValueError("游标与当前排序方式不匹配")
+        return {
+            "mode": payload["m"],
+            "id": int(payload["id"]),
+            "created_at": datetime.fromisoformat(payload["c"]) if payload["c"] else None,
+            # 优先级是优先级排序和默认排序的排序键，不能为空（NULL 无法参与范围比较）
+            "priority": int(payload["p"]),
+            "due_date": date.fromisoformat(payload["d"]) if payload.get("d") else None,
+            "relevance": float(payload["r"]) if payload.get("r") is not None else None,
+        }
+    except (ValueError, KeyError, TypeError, binascii.Error) as e:
+        raise ValueError(f"无效的分页游标: {e}") from e
+
+
+def _cursor_segments(cursor: dict, score: Optional[ColumnElement] = None) -> List[ColumnElement]:
+    """“从游标位置之后继续”的过滤条件，按排序先后拆成若干段（见 _keyset_segments）"""
+    mode = cursor["mode"]
+    if mode == "relevance":
+        return _keyset_segments([
+            (score, False, cursor["relevance"]),
+            (Task.id, False, cursor["id"]),
+        ])
+    tail = [
+        (Task.created_at, False, cursor["created_at"]),
+        (Task.id, False, cursor["id"]),
+    ]
+    if mode == "priority":
+        return _keyset_segments([(Task.priority, True, cursor["priority"])] + tail)
+    if mode == "due_date":
+        rest = [(Task.priority, True, cursor["priority"])] + tail
+        if cursor["due_date"] is None:
+            # 上一页停在“无截止日期”区段：只需在该区段内继续（due_date IS NULL 作为等值前缀，按组合索引定位）
+            return [
+                and_(Task.has_due_date == False, Task.due_date.is_(None), segment)  # noqa: E712
+                for segment in _keyset_segments(rest)
+            ]
+        # 仍在“有截止日期”区段：同区段内继续，或进入排在最后的无截止日期区段（has_due_date 降序）
+        return _keyset_segments(
+            [(Task.has_due_date, False, 1), (Task.due_date, True, cursor["due_date"])] + rest
+        )
+    return _keyset_segments(tail)
+
+
+def tasks_query(
+    db: Session,
+    is_completed: Optional[bool] = None,
+    category: Optional[str] = None,
+    sort_by: Optional[str] = None,
+    search: Optional[str] = None,
+    date_filter: Optional[str] = None
+) -> Query:
+    """构造带筛选和排序条件的任务列表查询（不执行）"""
+    query, score = _filter_tasks_query(
+        db.query(Task),
+        is_completed=is_completed,
+        category=category,
+        search=search,
+        date_filter=date_filter
+    )
+    return _order_tasks_query(query, sort_by, score)
+
+
+def tasks_cache_key(
+    is_completed: Optional[bool] = None,
+    category: Optional[str] = None,
+    sort_by: Optional[str] = None,
+    search: Optional[str] = None,
+    date_filter: Optional[str] = None,
+    fields: Optional[Tuple[str, ...]] = None
+) -> Tuple:
+    """get_tasks 结果的缓存键：归一化后的 (is_completed, category, 排序模式, search, date_filter, 字段)
+
+    结果相同的参数组合尽量映射到同一个键；日期筛选的结果依赖当天日期，此时键中带上日期。
+    fields 应为 parse_fields 的结果（已按固定顺序排列）。
+    """
+    search = search.strip() if search and search.strip() else None
+    date_filter = date_filter or None
+    return (
+        is_completed,
+        category,
+        _sort_mode(sort_by, ranked=search is not None),
+        search,
+        date_filter,
+        date.today().isoformat() if date_filter else None,
+        fields or tuple(LIST_FIELD_COLUMNS),
+    )
+
+
+def get_tasks(
+    db: Session, 
+    is_completed: Optional[bool] = None,
+    category: Optional[str] = None,
+    sort_by: Optional[str] = None,
+    search: Optional[str] = None,
+    date_filter: Optional[str] = None
+) -> List[Task]:
+    """获取任务列表，支持按完成状态和分类过滤，支持排序，支持全文搜索，支持日期筛选"""
+    return tasks_query(
+        db,
+        is_completed=is_completed,
+        category=category,
+        sort_by=sort_by,
+        search=search,
+        date_filter=date_filter
+    ).all()
+
+
+# 列表接口查询的列（与 core.serialize.TASK_FIELDS、schemas.Task 的字段顺序一致）
+LIST_COLUMNS = (
+    Task.title, Task.description, Task.category, Task.priority, Task.due_date,
+    Task.id, Task.is_completed, Task.created_at, Task.updated_at,
+)
+
+
+# 字段名 -> 列
+LIST_FIELD_COLUMNS = {column.key: column for column in LIST_COLUMNS}
+
+# 生成分页游标需要读取的列（encode_cursor 用到的排序键）
+CURSOR_FIELDS = ("id", "created_at", "priority", "due_date")
+
+
+def parse_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """解析 fields 参数（逗号分隔的字段名），返回按 LIST_COLUMNS 顺序排列的字段名
+
+    不传时返回全部字段；id 总是包含在内。
+
+    Raises:
+        ValueError: 包含未知字段
+    """
+    if not fields:
+        return tuple(LIST_FIELD_COLUMNS)
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - LIST_FIELD_COLUMNS.keys()
+    if unknown:
+        raise ValueError(f"未知的字段: {', '.join(sorted(unknown))}（可选：{', '.join(LIST_FIELD_COLUMNS)}）")
+    requested.add("id")
+    return tuple(name for name in LIST_FIELD_COLUMNS if name in requested)
+
+
+def get_task_rows(
+    db: Session,
+    fields: Optional[Tuple[str, ...]] = None,
+    is_completed: Optional[bool] = None,
+    category: Optional[str] = None,
+    sort_by: Optional[str] = None,
+    search: Optional[str] = None,
+    date_filter: Optional[str] = None
+) -> List[Tuple]:
+    """与 get_tasks 相同的筛选和排序，只查询 fields 对应的列（默认全部），返回行元组（不构造 ORM 对象）"""
+    columns = [LIST_FIELD_COLUMNS[name] for name in fields] if fields else LIST_COLUMNS
+    return tasks_query(
+        db,
+        is_completed=is_completed,
+        category=category,
+        sort_by=sort_by,
+        search=search,
+        date_filter=date_filter
+    ).with_entities(*columns).all()
+
+
+# 导出的列（与 core.export.EXPORT_FIELDS 顺序一致）
+EXPORT_COLUMNS = (
+    Task.id, Task.title, Task.description, Task.category, Task.priority,
+    Task.is_completed, Task.due_date, Task.created_at, Task.updated_at,
+)
+
+
+def iter_export_batches(
+    db: Session,
+    batch_size: int = 1000,
+    is_completed: Optional[bool] = None,
+    category: Optional[str] = None,
+    sort_by: Optional[str] = None,
+    search: Optional[str] = None,
+    date_filter: Optional[str] = None
+) -> Iterator[List[Tuple]]:
+    """按筛选和排序条件分批产出导出的任务行（元组列表，列顺序同 EXPORT_COLUMNS）
+
+    通过服务端游标（yield_per）每次从数据库读取 batch_size 行，不构造 ORM 对象，内存占用与任务总数无关。
+    """
+    stmt = tasks_query(
+        db,
+        is_completed=is_completed,
+        category=category,
+        sort_by=sort_by,
+        search=search,
+        date_filter=date_filter
+    ).with_entities(*EXPORT_COLUMNS).statement
+    result = db.execute(stmt, execution_options={"yield_per": batch_size})
+    for partition in result.partitions():
+        yield partition  # type: ignore[misc]
+
+
+def iter_export_rows(db: Session, batch_size: int = 1000, **filters: Any) -> Iterator[Tuple]:
+    """逐行产出导出的任务（参数同 iter_export_batches）"""
+    for batch in iter_export_batches(db, batch_size=batch_size, **filters):
+        yield from batch
+
+
+def _get_page(
+    db: Session,
+    entities: Tuple,
+    limit: int,
+    cursor: Optional[str] = None,
+    is_completed: Optional[bool] = None,
+    category: Optional[str] = None,
+    sort_by: Optional[str] = None,
+    search: Optional[str] = None,
+    date_filter: Optional[str] = None
+) -> Tuple[List[Any], Optional[str]]:
+    """按游标查询一页 entities（Task 实体或若干列），返回 (当前页, 下一页游标)"""
+    query, score = _filter_tasks_query(
+        db.query(*entities),
+        is_completed=is_completed,
+        category=category,
+        search=search,
+        date_filter=date_filter
+    )
+    by_relevance = _sort_mode(sort_by, ranked=score is not None) == "relevance"
+    if by_relevance:
+        # 按相关度分页时需要取出最后一行的相关度写入游标
+        query = query.add_columns(score.label("relevance"))  # type: ignore[union-attr]
     
-    return query.all()
+    # 多取一行用于判断是否还有下一页
+    if cursor:
+        # 按段依次查询，每段都能在索引中直接定位，取满一页即停止；翻页深度不影响耗时
+        rows = []
+        for segment in _cursor_segments(decode_cursor(cursor, sort_by, ranked=score is not None), score):
+            rows += _order_tasks_query(query.filter(segment), sort_by, score).limit(limit + 1 - len(rows)).all()
+            if len(rows) > limit:
+                break
+    else:
+        rows = _order_tasks_query(query, sort_by, score).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if has_more:
+        # 行元组同样可以按列名取值，可直接用于生成游标
+        last = rows[-1][0] if by_relevance and len(entities) == 1 else rows[-1]
+        next_cursor = encode_cursor(last, sort_by, rows[-1][-1] if by_relevance else None)
+    if by_relevance:
+        rows = [row[0] for row in rows] if len(entities) == 1 else [row[:-1] for row in rows]
+    return rows, next_cursor
+
+
+def get_tasks_page(
+    db: Session,
+    limit: int,
+    cursor: Optional[str] = None,
+    is_completed: Optional[bool] = None,
+    category: Optional[str] = None,
+    sort_by: Optional[str] = None,
+    search: Optional[str] = None,
+    date_filter: Optional[str] = None
+) -> Tuple[List[Task], Optional[str]]:
+    """按游标分页获取任务列表
+
+    Returns:
+        (当前页任务列表, 下一页游标)；没有更多数据时下一页游标为 None
+
+    Raises:
+        ValueError: 游标无效
+    """
+    return _get_page(
+        db, (Task,), limit,
+        cursor=cursor,
+        is_completed=is_completed,
+        category=category,
+        sort_by=sort_by,
+        search=search,
+        date_filter=date_filter
+    )
+
+
+def get_task_rows_page(
+    db: Session,
+    limit: int,
+    cursor: Optional[str] = None,
+    fields: Optional[Tuple[str, ...]] = None,
+    is_completed: Optional[bool] = None,
+    category: Optional[str] = None,
+    sort_by: Optional[str] = None,
+    search: Optional[str] = None,
+    date_filter: Optional[str] = None
+) -> Tuple[List[Tuple], Optional[str]]:
+    """与 get_tasks_page 相同，只查询 fields 对应的列（默认全部）并返回行元组
+
+    行中前面是 fields 对应的列，之后追加生成游标所需、但 fields 中没有的列。
+
+    Raises:
+        ValueError: 游标无效
+    """
+    fields = fields or tuple(LIST_FIELD_COLUMNS)
+    names = fields + tuple(name for name in CURSOR_FIELDS if name not in fields)
+    return _get_page(
+        db, tuple(LIST_FIELD_COLUMNS[name] for name in names), limit,
+        cursor=cursor,
+        is_completed=is_completed,
+        category=category,
+        sort_by=sort_by,
+        search=search,
+        date_filter=date_filter
+    )
 
 
 def get_task(db: Session, task_id: int) -> Optional[Task]:
@@ -107,50 +520,417 @@ def get_task(db: Session, task_id: int) -> Optional[Task]:
 def update_task(db: Session, db_task: Task, task_update: TaskUpdate) -> Task:
     """更新任务"""
     update_data = task_update.model_dump(exclude_unset=True)
+    old_key = stats.task_counter_key(db_task)
     
     for field, value in update_data.items():
         setattr(db_task, field, value)
     
+    new_key = stats.task_counter_key(db_task)
+    if new_key != old_key:
+        stats.bump_task_counters(db, [(old_key, -1), (new_key, 1)])
+    version.bump_version(db)
     db.commit()
     db.refresh(db_task)
+    search_backend.get_search_backend().index_tasks([db_task])
+    cache.invalidate_cache()
+    changefeed.publish_task("update", db_task)
     return db_task
 
 
 def delete_task(db: Session, db_task: Task) -> None:
     """删除任务"""
+    task_id: int = db_task.id  # type: ignore[assignment]
     db.delete(db_task)
+    stats.bump_task_counters(db, [(stats.task_counter_key(db_task), -1)])
+    sync.record_tombstones(db, [task_id])
+    version.bump_version(db)
     db.commit()
+    search_backend.get_search_backend().remove_tasks([task_id])
+    cache.invalidate_cache()
+    changefeed.publish_delete(task_id)
 
 
-def create_tasks_batch(db: Session, tasks: List[TaskCreate], tasks_data: Optional[List[dict]] = None) -> List[Task]:
-    """批量创建任务
-    
+# 修改后需要同步进程内搜索索引的字段
+SEARCH_FIELDS = ("title", "description", "category")
+
+
+def _execute_returning(db: Session, stmt, task_id: int) -> Optional[Any]:
+    """执行针对单个任务的 UPDATE，返回更新后的行（LIST_COLUMNS），没有命中时返回 None
+
+    支持 UPDATE ... RETURNING 的数据库一次往返完成；否则（MySQL）按受影响行数判断是否命中，
+    命中后再查询一次。MySQL 驱动按“匹配行数”返回 rowcount，值未变化时同样视为命中。
+    """
+    if db.get_bind().dialect.update_returning:
+        return db.execute(stmt.returning(*LIST_COLUMNS)).first()
+    if db.execute(stmt).rowcount == 0:  # type: ignore[attr-defined]
+        return None
+    return db.execute(select(*LIST_COLUMNS).where(Task.id == task_id)).first()
+
+
+def update_task_by_id(db: Session, task_id: int, task_update: TaskUpdate) -> Optional[Any]:
+    """按 ID 直接更新任务，不先加载 ORM 对象；任务不存在时返回 None
+
+    - 不修改计数键字段（分类、优先级、完成状态）：一条 UPDATE ... RETURNING
+    - 只修改完成状态（最常见的切换完成）：UPDATE ... WHERE id = ? AND is_completed IS NOT ? RETURNING，
+      命中即说明状态发生了翻转，旧计数键可由返回的新值推出；未命中时（任务不存在或状态本来就是该值）
+      再按前一种情况更新其余字段
+    - 修改分类或优先级：需要旧计数键，先 SELECT ... FOR UPDATE 再 UPDATE
+
+    Returns:
+        更新后的任务行（列同 LIST_COLUMNS，可按列名取值），任务不存在时为 None
+    """
+    changes = task_update.model_dump(exclude_unset=True)
+    table = Task.__table__
+    deltas: List[Tuple[stats.CounterKey, int]] = []
+
+    def update_by_id(values: dict):
+        return update(table).where(table.c.id == task_id).values(**values)
+
+    sets_completed = "is_completed" in changes and changes["is_completed"] is not None
+    if "category" in changes or "priority" in changes or ("is_completed" in changes and not sets_completed):
+        old = db.execute(
+            select(Task.category, Task.priority, Task.is_completed).where(Task.id == task_id).with_for_update()
+        ).first()
+        if old is None:
+            db.rollback()
+            return None
+        row = _execute_returning(db, update_by_id(changes), task_id)
+        if row is None:
+            # 已持有行锁，正常不会发生；按任务不存在处理
+            db.rollback()
+            return None
+        old_key = stats.counter_key(*old)
+        new_key = stats.counter_key(row.category, row.priority, row.is_completed)
+        if new_key != old_key:
+            deltas = [(old_key, -1), (new_key, 1)]
+    elif sets_completed:
+        value = bool(changes["is_completed"])
+        row = _execute_returning(db, update_by_id(changes).where(table.c.is_completed.is_not(value)), task_id)
+        if row is not None:
+            deltas = [
+                (stats.counter_key(row.category, row.priority, not value), -1),
+                (stats.counter_key(row.category, row.priority, value), 1),
+            ]
+        else:
+            rest = {field: new for field, new in changes.items() if field != "is_completed"}
+            if rest:
+                row = _execute_returning(db, update_by_id(rest), task_id)
+            else:
+                row = db.execute(select(*LIST_COLUMNS).where(Task.id == task_id)).first()
+    elif changes:
+        row = _execute_returning(db, update_by_id(changes), task_id)
+    else:
+        row = db.execute(select(*LIST_COLUMNS).where(Task.id == task_id)).first()
+
+    if row is None:
+        db.rollback()
+        return None
+    stats.bump_task_counters(db, deltas)
+    version.bump_version(db)
+    db.commit()
+    if any(field in changes for field in SEARCH_FIELDS):
+        search_backend.get_search_backend().index_tasks([row])
+    cache.invalidate_cache()
+    changefeed.publish_task("update", row)
+    return row
+
+
+def delete_task_by_id(db: Session, task_id: int) -> bool:
+    """按 ID 直接删除任务，不先加载 ORM 对象
+
+    支持 DELETE ... RETURNING 的数据库一次往返完成（返回的分类、优先级、完成状态用于调整计数），
+    否则先 SELECT ... FOR UPDATE 取出计数键再删除。
+
+    Returns:
+        任务存在并已删除时为 True
+    """
+    table = Task.__table__
+    stmt = delete(table).where(table.c.id == task_id)
+    key_columns = (table.c.category, table.c.priority, table.c.is_completed)
+    if db.get_bind().dialect.delete_returning:
+        old = db.execute(stmt.returning(*key_columns)).first()
+    else:
+        old = db.execute(select(*key_columns).where(table.c.id == task_id).with_for_update()).first()
+        if old is not None:
+            db.execute(stmt)
+    if old is None:
+        db.rollback()
+        return False
+    stats.bump_task_counters(db, [(stats.counter_key(*old), -1)])
+    sync.record_tombstones(db, [task_id])
+    version.bump_version(db)
+    db.commit()
+    search_backend.get_search_backend().remove_tasks([task_id])
+    cache.invalidate_cache()
+    changefeed.publish_delete(task_id)
+    return True
+
+
+def _batch_target(
+    db: Session,
+    ids: Optional[List[int]] = None,
+    is_completed: Optional[bool] = None,
+    category: Optional[str] = None,
+    search: Optional[str] = None,
+    date_filter: Optional[str] = None
+) -> ColumnElement:
+    """批量操作的目标行条件：ID 列表与筛选条件（与 get_tasks 相同）同时满足
+
+    筛选可能包含连接（如 FTS5），因此先在子查询中选出目标 ID；
+    MySQL 不允许 UPDATE/DELETE 的子查询直接读取目标表，外面再包一层派生表使其先物化。
+    """
+    query, _ = _filter_tasks_query(
+        db.query(Task.id),
+        is_completed=is_completed,
+        category=category,
+        search=search,
+        date_filter=date_filter
+    )
+    if ids is not None:
+        query = query.filter(Task.id.in_(ids))
+    matched = query.subquery()
+    return Task.id.in_(select(matched.c.id))
+
+
+def _target_counters(db: Session, target: ColumnElement) -> List[Tuple[stats.CounterKey, int]]:
+    """目标行按计数键分组的行数，同时锁定目标行直到事务结束
+
+    计数表按这次读取的结果增量调整，读取与随后的 UPDATE/DELETE 之间目标行不能被其他事务修改，
+    否则并发修改计数键（如同时切换完成状态）会使计数表偏离实际行数：
+    MySQL 使用 SELECT ... FOR UPDATE（InnoDB 允许与 GROUP BY 一起使用，锁定扫描到的行）；
+    SQLite 的写事务本身串行，读取后其他连接先提交时，本事务的写入会因数据库已被修改而失败，不会写入错误的增量。
+    """
+    query = (
+        db.query(Task.category, Task.priority, Task.is_completed, func.count(Task.id))
+        .filter(target)
+        .group_by(Task.category, Task.priority, Task.is_completed)
+    )
+    if db.get_bind().dialect.name == "mysql":
+        query = query.with_for_update()
+    rows = query.all()
+    return [(stats.counter_key(category, priority, is_completed), count) for category, priority, is_completed, count in rows]
+
+
+def _target_ids(db: Session, target: ColumnElement) -> List[int]:
+    return [task_id for (task_id,) in db.query(Task.id).filter(target)]
+
+
+def batch_update_tasks(db: Session, changes: dict, ids: Optional[List[int]] = None, **filters: Any) -> int:
+    """将 changes 应用到 ID 列表和/或筛选条件（is_completed、category、search、date_filter）选中的所有任务
+
+    在一个事务中执行一条 UPDATE（set-based，不逐行加载），计数表按变化前后的计数键增量调整
+    （分组计数时锁定目标行，见 _target_counters）。
+
+    Returns:
+        更新的任务数
+    """
+    target = _batch_target(db, ids, **filters)
+    deltas = []
+    for key, count in _target_counters(db, target):
+        category, priority, is_completed = key
+        new_key = stats.counter_key(
+            changes.get("category", category or None),
+            changes.get("priority", priority or None),
+            changes.get("is_completed", is_completed)
+        )
+        if new_key != key:
+            deltas += [(key, -count), (new_key, count)]
+    backend = search_backend.get_search_backend()
+    reindex = backend.tracks_writes and any(field in changes for field in SEARCH_FIELDS)
+    # 需要同步进程内搜索索引时，支持 UPDATE ... RETURNING 的数据库直接取回更新后的搜索字段；
+    # 否则（MySQL）先记下目标 ID，提交后再分批查询
+    returning = reindex and db.get_bind().dialect.update_returning
+    task_ids = _target_ids(db, target) if reindex and not returning else []
+
+    stmt = Task.__table__.update().where(target).values(**changes)
+    rows: List[Any] = []
+    if returning:
+        rows = list(db.execute(stmt.returning(Task.id, Task.title, Task.description, Task.category)))
+        affected = len(rows)
+    else:
+        affected = db.execute(stmt).rowcount  # type: ignore[attr-defined]
+    if affected:
+        stats.bump_task_counters(db, deltas)
+        version.bump_version(db)
+    db.commit()
+    if rows:
+        backend.index_tasks(rows)
+    for start in range(0, len(task_ids), 1000):
+        chunk = task_ids[start:start + 1000]
+        backend.index_tasks(
+            db.execute(select(Task.id, Task.title, Task.description, Task.category).where(Task.id.in_(chunk))).all()
+        )
+    if affected:
+        cache.invalidate_cache()
+        changefeed.publish_refresh("batch")
+    return affected
+
+
+def batch_delete_tasks(db: Session, ids: Optional[List[int]] = None, **filters: Any) -> int:
+    """删除 ID 列表和/或筛选条件选中的所有任务（一条 DELETE，一个事务）
+
+    Returns:
+        删除的任务数
+    """
+    target = _batch_target(db, ids, **filters)
+    deltas = [(key, -count) for key, count in _target_counters(db, target)]
+    backend = search_backend.get_search_backend()
+    task_ids = _target_ids(db, target) if backend.tracks_writes else []
+    sync.record_tombstones(db, select(Task.id).where(target))
+
+    result = db.execute(Task.__table__.delete().where(target))
+    affected = result.rowcount  # type: ignore[attr-defined]
+    if affected:
+        stats.bump_task_counters(db, deltas)
+        version.bump_version(db)
+    db.commit()
+    if task_ids:
+        backend.remove_tasks(task_ids)
+    if affected:
+        cache.invalidate_cache()
+        changefeed.publish_refresh("batch")
+    return affected
+
+
+def task_row(task: TaskCreate, is_completed: Optional[bool] = False) -> dict:
+    """将 TaskCreate 转换为 INSERT 参数（默认值与 create_task 一致）
+
+    is_completed 应已校验为布尔值（见 api.tasks._parse_import_record），None 表示未完成；
+    其他值一律视为未完成，不按真假值转换。
+    """
+    return {
+        "title": task.title,
+        "description": task.description,
+        "category": task.category or "Misc",
+        "priority": task.priority or 2,
+        "due_date": task.due_date,
+        "is_completed": is_completed is True,
+    }
+
+
+def _insert_chunk(db: Session, rows: List[dict]) -> List[Tuple[int, datetime, datetime]]:
+    """插入一批任务，返回每行的 (id, created_at, updated_at)，顺序与 rows 一致
+
+    自增 ID 按 VALUES 的顺序分配，因此按 ID 升序排列即与 rows 一一对应。
+    - 支持 executemany + RETURNING 的数据库（SQLite 3.35+、PostgreSQL、MariaDB）：
+      多行 INSERT ... RETURNING，一次往返插入并取回生成的主键和时间戳
+    - MySQL（以及不支持 RETURNING 的旧版 SQLite）：单条多行 INSERT，同一语句内的自增 ID 连续分配
+      （auto_increment_increment 为 1），由 lastrowid 推算出 ID 范围，再用一次范围查询取回时间戳
+    """
+    table = Task.__table__
+    conn = db.connection()
+    columns = (table.c.id, table.c.created_at, table.c.updated_at)
+    if conn.dialect.insert_executemany_returning:
+        # 使用 Core 语句：ORM 批量插入要求 RETURNING 按参数顺序返回，在 SQLite 上会退化为逐行执行
+        created = sorted(tuple(row) for row in conn.execute(insert(table).returning(*columns), rows))
+    else:
+        result = conn.execute(insert(table).values(rows))
+        # MySQL 的 LAST_INSERT_ID 为语句插入的第一行 ID，SQLite 的 last_insert_rowid 为最后一行 ID
+        first_id = result.lastrowid
+        if conn.dialect.name == "sqlite":
+            first_id -= len(rows) - 1
+        created = [
+            tuple(row) for row in conn.execute(
+                select(*columns)
+                .where(table.c.id.between(first_id, first_id + len(rows) - 1))
+                .order_by(table.c.id)
+            )
+        ]
+    if len(created) != len(rows):
+        raise RuntimeError(f"批量插入的自增 ID 不连续：预期 {len(rows)} 行，实际取回 {len(created)} 行")
+    return created  # type: ignore[return-value]
+
+
+def _created_tasks(rows: List[dict], created: List[Tuple[int, datetime, datetime]]) -> List[Task]:
+    """由插入参数和取回的 (id, created_at, updated_at) 构造 Task 对象（不属于任何会话）"""
+    return [
+        Task(id=task_id, created_at=created_at, updated_at=updated_at, **row)
+        for row, (task_id, created_at, updated_at) in zip(rows, created)
+    ]
+
+
+def _bump_row_counters(db: Session, rows: List[dict]) -> None:
+    stats.bump_task_counters(db, [
+        (stats.counter_key(row["category"], row["priority"], row["is_completed"]), 1) for row in rows
+    ])
+
+
+def bulk_insert_tasks(
+    db: Session,
+    tasks: List[TaskCreate],
+    tasks_data: Optional[List[dict]] = None,
+    batch_size: Optional[int] = None
+) -> Tuple[List[Task], List[dict]]:
+    """按批次批量插入任务，所有批次在同一事务中提交
+
+    不经过 ORM 的逐行 flush 和提交后的逐行 refresh，返回的 Task 对象由插入参数和
+    RETURNING 结果直接构造（不属于任何会话）。
+
     Args:
         db: 数据库会话
         tasks: TaskCreate 对象列表
         tasks_data: 原始任务数据字典列表（用于获取 is_completed 等额外字段）
+        batch_size: 每批行数，默认取 Settings.IMPORT_BATCH_SIZE
+
+    Returns:
+        (创建的任务列表, 每批耗时 [{"rows": 行数, "seconds": 耗时}])
     """
-    db_tasks = []
-    for i, task in enumerate(tasks):
-        # 从原始数据中获取 is_completed（如果存在）
-        is_completed = False
-        if tasks_data and i < len(tasks_data):
-            is_completed = tasks_data[i].get('is_completed', False)
-        
-        db_task = Task(
-            title=task.title,
-            description=task.description,
-            category=task.category or "Misc",
-            priority=task.priority or 2,
-            due_date=task.due_date,
-            is_completed=is_completed
-        )
-        db.add(db_task)
-        db_tasks.append(db_task)
-    
+    batch_size = max(batch_size or settings.IMPORT_BATCH_SIZE, 1)
+    rows = [
+        task_row(task, tasks_data[i].get("is_completed", False) if tasks_data and i < len(tasks_data) else False)
+        for i, task in enumerate(tasks)
+    ]
+
+    db_tasks: List[Task] = []
+    timings: List[dict] = []
+    for offset in range(0, len(rows), batch_size):
+        chunk = rows[offset:offset + batch_size]
+        started = time.perf_counter()
+        created = _insert_chunk(db, chunk)
+        elapsed = time.perf_counter() - started
+        timings.append({"rows": len(chunk), "seconds": round(elapsed, 6)})
+        logger.info(f"批量插入第 {len(timings)} 批：{len(chunk)} 行，耗时 {elapsed * 1000:.1f}ms")
+        db_tasks.extend(_created_tasks(chunk, created))
+
+    _bump_row_counters(db, rows)
+    version.bump_version(db)
     db.commit()
-    # 刷新所有任务以获取ID
-    for db_task in db_tasks:
-        db.refresh(db_task)
+    search_backend.get_search_backend().index_tasks(db_tasks)
+    cache.invalidate_cache()
+    changefeed.publish_refresh("import")
+    return db_tasks, timings
+
+
+def insert_tasks_chunk(db: Session, rows: List[dict]) -> List[Task]:
+    """插入一批任务并立即提交（流式导入逐批调用，已提交的批次不受后续错误影响）
+
+    Args:
+        db: 数据库会话
+        rows: 由 task_row 生成的 INSERT 参数
+    """
+    db_tasks = _created_tasks(rows, _insert_chunk(db, rows))
+    _bump_row_counters(db, rows)
+    version.bump_version(db)
+    db.commit()
+    search_backend.get_search_backend().index_tasks(db_tasks)
+    cache.invalidate_cache()
+    changefeed.publish_refresh("import")
+    return db_tasks
+
+
+def create_tasks_batch(
+    db: Session,
+    tasks: List[TaskCreate],
+    tasks_data: Optional[List[dict]] = None,
+    batch_size: Optional[int] = None
+) -> List[Task]:
+    """批量创建任务（按批次批量插入，见 bulk_insert_tasks）
     
+    Args:
+        db: 数据库会话
+        tasks: TaskCreate 对象列表
+        tasks_data: 原始任务数据字典列表（用于获取 is_completed 等额外字段）
+        batch_size: 每批行数，默认取 Settings.IMPORT_BATCH_SIZE
+    """
+    db_tasks, _ = bulk_insert_tasks(db, tasks, tasks_data=tasks_data, batch_size=batch_size)
     return db_tasks
@@ -0,0 +1,54 @@
+# backend/app/crud/version.py
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..models.task import TableVersion
+
+# 任务表在 table_versions 中的名称
+TASKS = "tasks"
+
+
+def _utcnow() -> datetime:
+    # 按秒记录，与 HTTP 日期（Last-Modified / If-Modified-Since）的精度一致
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+def bump_version(db: Session, name: str = TASKS) -> None:
+    """表版本号加一（在调用方提交事务之前执行，与写操作处于同一事务中）"""
+    now = _utcnow()
+    dialect = db.get_bind().dialect.name
+    values = {"name": name, "version": 1, "updated_at": now}
+
+    if dialect == "mysql":
+        stmt = mysql_insert(TableVersion).values(**values)
+        db.execute(stmt.on_duplicate_key_update(version=TableVersion.version + 1, updated_at=now))
+        return
+    if dialect == "sqlite":
+        stmt = sqlite_insert(TableVersion).values(**values)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["name"],
+            set_={"version": TableVersion.version + 1, "updated_at": now}
+        ))
+        return
+
+    # 其他数据库：先 UPDATE，没有命中再 INSERT
+    result = db.execute(
+        update(TableVersion)
+        .where(TableVersion.name == name)
+        .values(version=TableVersion.version + 1, updated_at=now)
+    )
+    if result.rowcount == 0:  # type: ignore[attr-defined]
+        db.add(TableVersion(**values))
+
+
+def get_version(db: Session, name: str = TASKS) -> Tuple[int, Optional[datetime]]:
+    """获取表版本号和最近一次写操作的时间（UTC）；从未写过时为 (0, None)"""
+    row = db.query(TableVersion.version, TableVersion.updated_at).filter(TableVersion.name == name).first()
+    if row is None:
+        return 0, None
+    return row[0], row[1]
@@ -1,47 +1,52 @@
 # backend/app/main.py
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-import time
-import logging
 
-from .core.database import engine, Base
-from .models import task  # 导入模型以注册到 Base
 from .core.config import settings
-from .api import tasks
+from .core.database import replicas
+from .core.metrics import MetricsMiddleware
+from .core.profiling import PROFILE_ID_HEADER, ProfilingMiddleware
+from .core.replicas import READ_YOUR_WRITES_HEADER, ReadYourWritesMiddleware, monitor
+from .api import tasks, admin, health, metrics
+from . import startup
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# 等待数据库就绪并创建表
-def init_db():
-    """初始化数据库，带重试机制"""
-    max_retries = 30
-    retry_delay = 2
-    
-    for attempt in range(max_retries):
-        try:
-            logger.info(f"尝试连接数据库 (第 {attempt + 1}/{max_retries} 次)...")
-            Base.metadata.create_all(bind=engine)
-            logger.info("数据库连接成功，表创建完成")
-            return
-        except Exception as e:
-            if attempt < max_retries - 1:
-                logger.warning(f"数据库连接失败: {e}，{retry_delay}秒后重试...")
-                time.sleep(retry_delay)
-            else:
-                logger.error(f"数据库连接失败，已达到最大重试次数: {e}")
-                raise
-
-# 初始化数据库
-init_db()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """启动时在后台等待数据库就绪并初始化（见 app/startup.py），不阻塞端口监听"""
+    background = [asyncio.create_task(startup.initialize())]
+    if replicas:
+        # 定期检查只读副本的健康状态
+        background.append(asyncio.create_task(monitor(replicas, settings.DB_REPLICA_CHECK_INTERVAL)))
+    yield
+    for background_task in background:
+        background_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await background_task
+
 
 app = FastAPI(
     title="Todo List API",
     version="1.0.0",
-    description="RESTful API for Todo List application."
+    description="RESTful API for Todo List application.",
+    lifespan=lifespan
 )
 
+# 初始化完成前拒绝业务请求（添加在 CORS 之前，503 响应也带 CORS 头）
+app.add_middleware(startup.StartupGateMiddleware)
+
+# 配置了只读副本时，写请求的响应带上读己之写的截止时间
+if replicas:
+    app.add_middleware(ReadYourWritesMiddleware, replica_set=replicas)
+
 # 配置 CORS 中间件
 app.add_middleware(
     CORSMiddleware,
@@ -49,10 +54,25 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        tasks.NEXT_CURSOR_HEADER, tasks.SERVER_TIMING_HEADER, tasks.CACHE_STATUS_HEADER, "ETag", READ_YOUR_WRITES_HEADER,
+        PROFILE_ID_HEADER
+    ],  # 允许前端读取分页游标、导入耗时、缓存命中、ETag、读己之写截止时间、剖析编号响应头
 )
 
+# 按需性能剖析（带有效剖析标记的请求才采样）
+if settings.PROFILING_TOKEN:
+    app.add_middleware(ProfilingMiddleware)
+
+# 请求指标（最外层，包括启动期间被拒绝的请求和 CORS 预检）
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # 注册路由
 app.include_router(tasks.router)
+app.include_router(admin.router)
+app.include_router(health.router)
+app.include_router(metrics.router)
 
 @app.get("/")
 def read_root():
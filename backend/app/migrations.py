@@ -0,0 +1,116 @@
+# backend/app/migrations.py
+"""
+数据库结构迁移
+
+create_all 只会创建缺失的表，不会修改已有的表。已有数据库升级到新版本时，
+需要的列、索引变更按顺序写在 MIGRATIONS 中，执行过的迁移记录在 schema_migrations 表里，
+每个迁移只执行一次。新建的数据库由 create_all 直接建成最新结构，迁移检测到无需变更后只做记录。
+
+执行方式：应用启动时自动执行，也可以单独执行 `python -m app.cli migrate`
+（STARTUP_MIGRATE=off 时应用启动只检查迁移是否已执行完）。
+"""
+import logging
+from typing import Callable, List, Tuple
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, delete, func, inspect, select, text, update
+from sqlalchemy.engine import Connection, Engine
+
+from .models.task import TableVersion, Task, TaskCounter, task_fulltext_index
+
+logger = logging.getLogger(__name__)
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("name", String(100), primary_key=True),
+    Column("applied_at", DateTime, default=func.now()),
+)
+
+
+def _drop_index(conn: Connection, table_name: str, index_name: str) -> None:
+    if index_name not in {index["name"] for index in inspect(conn).get_indexes(table_name)}:
+        return
+    if conn.dialect.name == "mysql":
+        conn.execute(text(f"DROP INDEX {index_name} ON {table_name}"))
+    else:
+        conn.execute(text(f"DROP INDEX {index_name}"))
+
+
+def _create_missing_indexes(conn: Connection, table) -> None:
+    """创建模型中声明但数据库中还不存在的索引（全文索引由搜索后端负责）"""
+    existing = {index["name"] for index in inspect(conn).get_indexes(table.name)}
+    for index in table.indexes:
+        if index.name not in existing and index is not task_fulltext_index:
+            logger.info(f"创建索引 {index.name} ...")
+            index.create(bind=conn)
+
+
+def _0001_composite_indexes(conn: Connection) -> None:
+    """增加 has_due_date 生成列，用与查询匹配的组合索引替换 category/priority 单列索引"""
+    columns = {column["name"] for column in inspect(conn).get_columns(Task.__tablename__)}
+    if "has_due_date" not in columns:
+        conn.execute(text(
+            f"ALTER TABLE {Task.__tablename__} ADD COLUMN has_due_date BOOLEAN "
+            "GENERATED ALWAYS AS (due_date IS NOT NULL) VIRTUAL"
+        ))
+    # 单列索引已是组合索引的前缀，不再需要
+    _drop_index(conn, Task.__tablename__, "ix_tasks_category")
+    _drop_index(conn, Task.__tablename__, "ix_tasks_priority")
+    _create_missing_indexes(conn, Task.__table__)
+
+
+def _0002_updated_at_index(conn: Connection) -> None:
+    """增加 (updated_at, id) 索引，供增量同步按更新时间范围扫描"""
+    _create_missing_indexes(conn, Task.__table__)
+
+
+def _0003_priority_not_null(conn: Connection) -> None:
+    """优先级改为非空：已有的 NULL 填为默认值 2（NULL 无法作为游标分页的排序键参与范围比较）
+
+    有行被修改时清空计数表（启动时由 ensure_task_counters 按新值重建）并增加表版本号，使缓存和 ETag 失效。
+    SQLite 不支持修改已有列的约束，只填充数据；新建的数据库由 create_all 建成 NOT NULL。
+    """
+    filled = conn.execute(update(Task.__table__).where(Task.priority.is_(None)).values(priority=2)).rowcount
+    if filled:
+        logger.info(f"已将 {filled} 个任务的空优先级填为 2")
+        conn.execute(delete(TaskCounter.__table__))
+        conn.execute(
+            update(TableVersion.__table__).where(TableVersion.name == Task.__tablename__).values(version=TableVersion.version + 1)
+        )
+    if conn.dialect.name == "mysql":
+        conn.execute(text(f"ALTER TABLE {Task.__tablename__} MODIFY priority INTEGER NOT NULL DEFAULT 2"))
+
+
+# 按顺序执行的迁移列表：(名称, 迁移函数)，已发布的迁移不要修改或删除
+MIGRATIONS: List[Tuple[str, Callable[[Connection], None]]] = [
+    ("0001_composite_indexes", _0001_composite_indexes),
+    ("0002_updated_at_index", _0002_updated_at_index),
+    ("0003_priority_not_null", _0003_priority_not_null),
+]
+
+
+def run_migrations(engine: Engine) -> List[str]:
+    """执行所有尚未执行的迁移，返回本次执行的迁移名称"""
+    _metadata.create_all(bind=engine)
+    applied_now = []
+    with engine.connect() as conn:
+        applied = set(conn.execute(select(schema_migrations.c.name)).scalars())
+    for name, migrate in MIGRATIONS:
+        if name in applied:
+            continue
+        logger.info(f"执行数据库迁移 {name} ...")
+        with engine.begin() as conn:
+            migrate(conn)
+            conn.execute(schema_migrations.insert().values(name=name))
+        applied_now.append(name)
+    return applied_now
+
+
+def pending_migrations(engine: Engine) -> List[str]:
+    """尚未执行的迁移名称（schema_migrations 表不存在时为全部迁移）"""
+    with engine.connect() as conn:
+        if not inspect(conn).has_table(schema_migrations.name):
+            return [name for name, _ in MIGRATIONS]
+        applied = set(conn.execute(select(schema_migrations.c.name)).scalars())
+    return [name for name, _ in MIGRATIONS if name not in applied]
@@ -1,7 +1,15 @@
 # backend/app/models/task.py
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, func, Date
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, func, Date, UniqueConstraint, Index, Computed
+from sqlalchemy.dialects import sqlite
 from ..core.database import Base
 
+# SQLite 的 CURRENT_TIMESTAMP 只精确到秒（"YYYY-MM-DD HH:MM:SS"），
+# 绑定参数时使用相同的格式，保证按时间比较（如游标分页）的结果正确
+TimestampType = DateTime().with_variant(
+    sqlite.DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"),
+    "sqlite"
+)
+
 
 class Task(Base):
     """任务数据模型"""
@@ -11,10 +19,84 @@ class Task(Base):
     title = Column(String(255), index=True, nullable=False)  # 标题（必填）
     description = Column(String(1000), default=None, nullable=True)  # 描述（可选）
 
-    category = Column(String(50), index=True, default="Misc")  # 任务分类
-    priority = Column(Integer, default=2, index=True)  # 优先级：1=高，2=中，3=低
+    category = Column(String(50), default="Misc")  # 任务分类（索引见下方组合索引）
+    # 优先级：1=高，2=中，3=低（索引见下方组合索引）；不允许为空，游标分页以它作为排序键
+    priority = Column(Integer, nullable=False, default=2)
     due_date = Column(Date, default=None, nullable=True, index=True)  # 截止日期
+    # 是否有截止日期（由数据库根据 due_date 生成），用于“无截止日期排最后”的排序可以走索引
+    has_due_date = Column(Boolean, Computed("due_date IS NOT NULL"))
     is_completed = Column(Boolean, default=False)  # 完成状态
 
-    created_at = Column(DateTime, default=func.now())  # 创建时间
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())  # 更新时间
\ No newline at end of file
+    created_at = Column(TimestampType, default=func.now())  # 创建时间
+    updated_at = Column(TimestampType, default=func.now(), onupdate=func.now())  # 更新时间
+
+    # 组合索引：与 crud.task.get_tasks 的“筛选 + 排序”组合一一对应，使列表查询无需额外排序（filesort）
+    # 截止日期排序（默认）：有截止日期的在前 -> 截止日期 -> 优先级 -> 创建时间倒序
+    __table_args__ = (
+        Index("ix_tasks_due_order",
+              has_due_date.desc(), due_date, priority, created_at.desc(), id.desc()),
+        Index("ix_tasks_category_due_order",
+              category, has_due_date.desc(), due_date, priority, created_at.desc(), id.desc()),
+        Index("ix_tasks_completed_due_order",
+              is_completed, has_due_date.desc(), due_date, priority, created_at.desc(), id.desc()),
+        # 优先级排序：优先级 -> 创建时间倒序
+        Index("ix_tasks_priority_order", priority, created_at.desc(), id.desc()),
+        Index("ix_tasks_category_priority_order", category, priority, created_at.desc(), id.desc()),
+        # 创建时间排序
+        Index("ix_tasks_created_order", created_at.desc(), id.desc()),
+        # 增量同步：按 (updated_at, id) 范围扫描变更
+        Index("ix_tasks_updated_order", updated_at, id),
+    )
+
+
+# MySQL 全文索引（ngram 分词器支持中文），仅在 MySQL 上创建，供搜索使用
+task_fulltext_index = Index(
+    "ft_tasks_search",
+    Task.title, Task.description, Task.category,
+    mysql_prefix="FULLTEXT",
+    mysql_with_parser="ngram",
+).ddl_if(dialect="mysql")
+
+
+class TaskCounter(Base):
+    """任务计数表：按 (分类, 优先级, 完成状态) 维护任务数量
+
+    由 crud 写操作在同一事务内增量维护，统计接口直接读取该表，无需扫描 tasks 表。
+    为保证唯一约束生效，空分类存为 ""，空优先级存为 0。
+    """
+    __tablename__ = "task_counters"
+    __table_args__ = (
+        UniqueConstraint("category", "priority", "is_completed", name="uq_task_counters_key"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    category = Column(String(50), nullable=False, default="")  # 任务分类
+    priority = Column(Integer, nullable=False, default=0)  # 优先级
+    is_completed = Column(Boolean, nullable=False, default=False)  # 完成状态
+    count = Column(Integer, nullable=False, default=0)  # 任务数量
+
+
+class TableVersion(Base):
+    """表版本号：每次写操作在同一事务内递增，用于生成 ETag / Last-Modified
+
+    读取只需按主键查询一行，不依赖被版本化的表的大小。
+    """
+    __tablename__ = "table_versions"
+
+    name = Column(String(50), primary_key=True)  # 表名
+    version = Column(BigInteger, nullable=False, default=0)  # 版本号，每次写操作加一
+    updated_at = Column(TimestampType, nullable=True)  # 最近一次写操作的时间（UTC）
+
+
+class TaskTombstone(Base):
+    """已删除任务的记录（墓碑），供增量同步（GET /tasks/changes）告知客户端哪些任务被删除
+
+    由 crud 删除操作在同一事务内写入，同一 ID 再次删除时更新删除时间；超过保留期的记录在启动时清理。
+    """
+    __tablename__ = "task_tombstones"
+    __table_args__ = (
+        Index("ix_task_tombstones_deleted_order", "deleted_at", "task_id"),
+    )
+
+    task_id = Column(Integer, primary_key=True, autoincrement=False)  # 被删除的任务 ID
+    deleted_at = Column(TimestampType, nullable=False, default=func.now())  # 删除时间（数据库时间，与 tasks.updated_at 一致）
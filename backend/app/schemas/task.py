@@ -1,6 +1,6 @@
 # backend/app/schemas/task.py
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, Field, ConfigDict, model_validator
+from typing import List, Literal, Optional
 from datetime import datetime, date
 
 
@@ -27,6 +27,14 @@ class TaskUpdate(BaseModel):
     due_date: Optional[date] = None
     is_completed: Optional[bool] = None
 
+    @model_validator(mode="after")
+    def _check_not_null(self) -> "TaskUpdate":
+        """标题和优先级在数据库中不允许为空：可以不传，但不能显式传 null"""
+        for name in ("title", "priority"):
+            if name in self.model_fields_set and getattr(self, name) is None:
+                raise ValueError(f"{name} 不能为 null")
+        return self
+
 
 class Task(TaskBase):
     """任务响应模型"""
@@ -36,3 +44,74 @@ class Task(TaskBase):
     is_completed: bool
     created_at: datetime
     updated_at: datetime
+
+
+class CategoryStat(BaseModel):
+    """按分类统计"""
+    category: Optional[str]
+    total: int
+    completed: int
+
+
+class PriorityStat(BaseModel):
+    """按优先级统计"""
+    priority: int
+    total: int
+    completed: int
+
+
+class TaskStats(BaseModel):
+    """任务统计响应模型"""
+    total: int = Field(..., description="任务总数")
+    completed: int = Field(..., description="已完成任务数")
+    overdue: int = Field(..., description="已过期（未完成且截止日期早于今天）的任务数")
+    categories: List[str] = Field(..., description="数据库中实际存在的分类列表")
+    category_stats: List[CategoryStat] = Field(..., description="按分类统计，按任务数降序")
+    priority_stats: List[PriorityStat] = Field(..., description="按优先级统计，按优先级升序")
+
+
+class ImportRowError(BaseModel):
+    """导入失败的单条记录"""
+    row: int = Field(..., description="记录序号（JSON 数组中的位置或 NDJSON 行号，从 1 开始）")
+    error: str = Field(..., description="失败原因")
+
+
+class ImportSummary(BaseModel):
+    """流式导入结果汇总"""
+    imported: int = Field(..., description="成功导入的任务数")
+    failed: int = Field(..., description="校验失败的记录数")
+    errors: List[ImportRowError] = Field(..., description="失败记录明细（最多返回前若干条）")
+    errors_truncated: bool = Field(False, description="失败记录数超过返回上限时为 true")
+    batches: int = Field(..., description="插入批次数")
+    elapsed_seconds: float = Field(..., description="导入总耗时（秒）")
+
+
+class TaskFilter(BaseModel):
+    """批量操作的筛选条件（含义与 GET /tasks/ 的同名参数相同）"""
+    is_completed: Optional[bool] = None
+    category: Optional[str] = None
+    search: Optional[str] = None
+    date_filter: Optional[str] = Field(None, description="overdue, today, tomorrow, this_week, this_month, no_due_date")
+
+
+class TaskBatchRequest(BaseModel):
+    """批量更新/完成/删除请求：ids 和 filter 至少指定一个，同时指定时取交集"""
+    action: Literal["update", "complete", "delete"] = Field(..., description="update=按 changes 更新，complete=标记完成，delete=删除")
+    ids: Optional[List[int]] = Field(None, max_length=10000, description="任务 ID 列表")
+    filter: Optional[TaskFilter] = Field(None, description="筛选条件")
+    changes: Optional[TaskUpdate] = Field(None, description="action=update 时要修改的字段")
+
+
+class TaskBatchResult(BaseModel):
+    """批量操作结果"""
+    action: str
+    affected: int = Field(..., description="实际更新或删除的任务数")
+    requested: Optional[int] = Field(None, description="请求中的 ID 数量（按 ID 操作时）")
+
+
+class TaskChanges(BaseModel):
+    """增量同步结果"""
+    changes: List[Task] = Field(..., description="水位线之后新增或更新的任务（按更新时间排序）")
+    deleted: List[int] = Field(..., description="水位线之后删除的任务 ID")
+    watermark: str = Field(..., description="新的水位线，下次同步时作为 since 传入")
+    has_more: bool = Field(..., description="为 true 时还有更多变更，应立即用新水位线继续获取")
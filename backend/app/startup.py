@@ -0,0 +1,179 @@
+# backend/app/startup.py
+"""
+应用启动初始化和健康状态
+
+初始化（等待数据库、建表和迁移、搜索后端、缓存、统计计数）不再在导入 app.main 时同步执行，
+而是由 lifespan 启动为后台任务：进程立即开始监听端口，数据库暂不可用时按指数退避重试，
+重试间隔用 asyncio.sleep 等待，阻塞的数据库操作放到线程中执行，不阻塞事件循环。
+
+- 存活（GET /health/live）：进程在运行即为存活；初始化失败（重试次数耗尽或初始化出错）后不再存活，由编排系统重启进程
+- 就绪（GET /health/ready）：初始化完成且数据库当前可连接。初始化完成前，除健康检查和接口文档外的请求直接返回 503
+
+STARTUP_MIGRATE=off 时启动不执行建表和迁移，只等待 `python -m app.cli migrate` 执行完（迁移未完成视为数据库未就绪）。
+"""
+import asyncio
+import logging
+import time
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .core.cache import setup_cache
+from .core.config import settings
+from .core.database import Base, SessionLocal, async_engine, engine
+from .migrations import pending_migrations, run_migrations
+from .models import task  # noqa: F401  导入模型以注册到 Base
+from . import crud
+
+logger = logging.getLogger(__name__)
+
+
+class StartupState:
+    """启动进度，耗时均从导入本模块（进程开始加载应用）时算起"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.ready = False
+        self.failed = False
+        self.attempts = 0
+        self.last_error: Optional[str] = None
+        self.ready_seconds: Optional[float] = None  # 初始化完成的耗时
+        self.first_request_seconds: Optional[float] = None  # 开始处理第一个业务请求的耗时
+
+    def elapsed(self) -> float:
+        return round(time.perf_counter() - self.started_at, 3)
+
+    def as_dict(self) -> dict:
+        return {
+            "ready": self.ready,
+            "failed": self.failed,
+            "attempts": self.attempts,
+            "last_error": self.last_error,
+            "uptime_seconds": self.elapsed(),
+            "ready_seconds": self.ready_seconds,
+            "first_request_seconds": self.first_request_seconds,
+        }
+
+
+state = StartupState()
+
+
+def setup_schema(bind: Engine) -> List[str]:
+    """建表并执行尚未执行的迁移，返回本次执行的迁移名称（启动时和 `python -m app.cli migrate` 共用）"""
+    Base.metadata.create_all(bind=bind)
+    return run_migrations(bind)
+
+
+def _prepare_database() -> None:
+    """确认数据库可连接并且表结构是最新的；失败时抛出异常，由调用方重试"""
+    if settings.STARTUP_MIGRATE == "auto":
+        setup_schema(engine)
+    elif settings.STARTUP_MIGRATE == "off":
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        pending = pending_migrations(engine)
+        if pending:
+            raise RuntimeError(f"等待执行数据库迁移（python -m app.cli migrate）: {', '.join(pending)}")
+    else:
+        raise ValueError(f"未知的 STARTUP_MIGRATE: {settings.STARTUP_MIGRATE}")
+
+
+def _setup_services() -> None:
+    # 选择搜索后端并创建全文索引（MySQL FULLTEXT / SQLite FTS5）
+    crud.search.setup_search_backend(engine)
+
+    # 任务列表缓存（进程内 LRU / Redis）
+    setup_cache()
+
+    # 计数表为空但已有任务时（如从旧版本升级）自动重建统计计数；清理超过保留期的删除记录
+    db = SessionLocal()
+    try:
+        crud.stats.ensure_task_counters(db)
+        crud.sync.prune_tombstones(db, settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    finally:
+        db.close()
+
+
+async def initialize() -> None:
+    """等待数据库就绪并完成初始化（在 lifespan 中作为后台任务运行）"""
+    max_attempts = settings.STARTUP_MAX_ATTEMPTS
+    delay = settings.STARTUP_RETRY_DELAY
+    while True:
+        state.attempts += 1
+        try:
+            logger.info(f"尝试连接数据库 (第 {state.attempts}/{max_attempts} 次)...")
+            await run_in_threadpool(_prepare_database)
+            break
+        except ValueError as e:
+            # 配置错误，重试无意义
+            state.last_error = str(e)
+            state.failed = True
+            logger.error(f"启动失败: {e}")
+            return
+        except Exception as e:
+            state.last_error = str(e)
+            if state.attempts >= max_attempts:
+                state.failed = True
+                logger.error(f"数据库连接失败，已达到最大重试次数: {e}")
+                return
+            logger.warning(f"数据库未就绪: {e}，{delay:g}秒后重试...")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, settings.STARTUP_RETRY_MAX_DELAY)
+
+    try:
+        await run_in_threadpool(_setup_services)
+    except Exception as e:
+        state.last_error = str(e)
+        state.failed = True
+        logger.exception(f"启动失败: {e}")
+        return
+
+    state.last_error = None
+    state.ready_seconds = state.elapsed()
+    state.ready = True
+    logger.info(f"数据库连接成功，初始化完成（耗时 {state.ready_seconds} 秒）")
+
+
+def _ping_sync() -> None:
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+async def ping_database() -> None:
+    """探测任务 API 使用的数据库连接（异步模式使用异步引擎），超过 HEALTH_CHECK_TIMEOUT 秒视为失败"""
+    if async_engine is not None:
+        async def ping():
+            async with async_engine.connect() as conn:  # type: ignore[union-attr]
+                await conn.execute(text("SELECT 1"))
+        await asyncio.wait_for(ping(), settings.HEALTH_CHECK_TIMEOUT)
+    else:
+        await asyncio.wait_for(run_in_threadpool(_ping_sync), settings.HEALTH_CHECK_TIMEOUT)
+
+
+class StartupGateMiddleware:
+    """初始化完成前拒绝业务请求（503 + Retry-After），并记录开始处理第一个业务请求的耗时"""
+
+    # 初始化完成前也可以访问的路径
+    ALWAYS_ALLOWED = ("/health/", "/metrics", "/docs", "/redoc", "/openapi.json")
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and not scope["path"].startswith(self.ALWAYS_ALLOWED):
+            if not state.ready:
+                response = JSONResponse(
+                    {"detail": "服务正在启动，数据库尚未就绪"},
+                    status_code=503,
+                    headers={"Retry-After": "1"},
+                )
+                await response(scope, receive, send)
+                return
+            if state.first_request_seconds is None:
+                state.first_request_seconds = state.elapsed()
+                logger.info(f"开始处理第一个请求（距启动 {state.first_request_seconds} 秒）")
+        await self.app(scope, receive, send)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+搜索性能基准测试
+
+比较不同搜索后端在不同数据量下的查询耗时：
+- like：LIKE '%关键词%'（全表扫描）
+- sqlite_fts5：SQLite FTS5 + trigram 分词器
+- memory_ngram：进程内 n-gram 倒排索引 + 主键查询
+
+用法（在 backend 目录下执行）：
+    python -m benchmarks.search_benchmark --sizes 10000 100000 1000000
+    python -m benchmarks.search_benchmark --sizes 10000 --json search_benchmark.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.models.task import Task
+from app.crud.search import LikeSearchBackend, NgramMemorySearchBackend, SQLiteFTS5SearchBackend
+
+from .seed_data import generate_rows
+
+# 设置输出编码为UTF-8（Windows控制台）
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+# 查询关键词：覆盖高频（约 6% 命中）/ 低频（个位数命中）/ 无命中、短词（退回 LIKE）、多关键词
+QUERIES = ["学习计划", "健身", "#4242", "周报数据 同事确认", "不存在的关键词"]
+
+
+def seed_database(url: str, n: int):
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for batch in generate_rows(n, seed=42, numbered=True):
+            conn.execute(insert(Task), batch)
+    return engine
+
+
+def time_query(engine, backend, search: str, repeat: int):
+    """返回 (中位耗时毫秒, 结果条数)"""
+    timings = []
+    count = 0
+    for _ in range(repeat):
+        with Session(engine) as db:
+            start = time.perf_counter()
+            query, _ = backend.apply(db.query(Task), search)
+            count = len(query.all())
+            timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), count
+
+
+def run(sizes, repeat: int):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            url = f"sqlite:///{os.path.join(tmp, f'bench_{n}.db')}"
+            start = time.perf_counter()
+            engine = seed_database(url, n)
+            print(f"\n== {n} 条任务（生成耗时 {time.perf_counter() - start:.1f}s）==")
+
+            backends = {}
+            for backend in (
+                LikeSearchBackend(),
+                SQLiteFTS5SearchBackend(),
+                NgramMemorySearchBackend(fallback=LikeSearchBackend(), max_candidates=max(n, 1)),
+            ):
+                start = time.perf_counter()
+                backend.setup(engine)
+                build = time.perf_counter() - start
+                backends[backend.name] = backend
+                print(f"{backend.name:<14} 索引建立 {build * 1000:10.1f} ms")
+
+            print(f"{'关键词':<12}" + "".join(f"{name:>18}" for name in backends) + f"{'结果数':>14}")
+            for search in QUERIES:
+                row = {"size": n, "query": search}
+                counts = []
+                for name, backend in backends.items():
+                    ms, count = time_query(engine, backend, search, repeat)
+                    row[name] = round(ms, 3)
+                    row[f"{name}_count"] = count
+                    counts.append(str(count))
+                results.append(row)
+                # 多关键词时 LIKE 把整个字符串当作一个子串，全文索引和内存索引则要求同时包含各关键词
+                print(
+                    f"{search:<12}"
+                    + "".join(f"{row[name]:>15.2f} ms" for name in backends)
+                    + f"{'/'.join(counts):>16}"
+                )
+            engine.dispose()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="搜索后端性能基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000], help="数据量")
+    parser.add_argument("--repeat", type=int, default=5, help="每个查询重复次数（取中位数）")
+    parser.add_argument("--json", help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已写入 {args.json}")
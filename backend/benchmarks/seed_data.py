@@ -0,0 +1,93 @@
+# backend/benchmarks/seed_data.py
+"""
+基准测试和测试共用的任务数据生成
+
+分类、优先级、截止日期、完成状态和中文标题/描述按接近真实使用的分布随机生成，随机种子固定，结果可复现。
+生成的是 tasks 表的 INSERT 参数（字典），可直接用于 Core 多行 INSERT：
+    for batch in generate_rows(n, seed=42):
+        conn.execute(insert(Task), batch)
+"""
+import random
+from datetime import date, datetime, timedelta
+from typing import Any, Iterator, List, Tuple
+
+# 分类及权重：少数几个分类占大多数任务，Misc 为未指定分类时的默认值
+CATEGORIES = [
+    ("工作", 30), ("学习", 18), ("生活", 15), ("项目A", 8), ("项目B", 6), ("购物", 6),
+    ("健康", 5), ("旅行", 3), ("娱乐", 3), ("其他", 2), ("Misc", 4),
+]
+PRIORITIES = [(1, 25), (2, 50), (3, 25)]
+VERBS = ["整理", "完成", "准备", "复习", "提交", "安排", "检查", "购买", "预约", "修改", "回复", "跟进", "评审", "更新", "学习"]
+OBJECTS = [
+    "会议纪要", "季度报告", "学习计划", "项目文档", "旅行攻略", "体检报告", "周报数据", "读书笔记", "健身计划",
+    "购物清单", "接口设计", "需求评审", "客户邮件", "年度总结", "预算表", "英语单词", "数据库迁移", "发布说明",
+]
+SUFFIXES = ["", "", "", "（紧急）", " v2", " - 第二版", "：初稿", " 🚀", " Q3", " for 张三", "（续）"]
+SENTENCES = [
+    "需要在周五之前完成。", "记得和同事确认细节。", "参考上次的模板。", "优先处理重要部分。", "完成后发邮件通知。",
+    "相关资料放在共享盘里。", "注意检查数据是否完整。", "如有问题及时沟通。", "预计需要两个小时。",
+    "This is blocked by the API review.", "会议室已经预订好了。", "别忘了带上电脑和充电器。",
+]
+SEED_BATCH_SIZE = 10000
+
+
+def weighted_choice(rng: random.Random, choices: List[Tuple[Any, int]]) -> Any:
+    return rng.choices([value for value, _ in choices], weights=[weight for _, weight in choices])[0]
+
+
+def generate_task(rng: random.Random, today: date) -> dict:
+    """生成一条任务（不含时间戳）"""
+    title = f"{rng.choice(VERBS)}{rng.choice(OBJECTS)}{rng.choice(SUFFIXES)}"
+    roll = rng.random()
+    if roll < 0.4:
+        description = None
+    elif roll < 0.85:
+        description = "".join(rng.choices(SENTENCES, k=rng.randint(1, 2)))
+    elif roll < 0.99:
+        description = "\n".join(rng.choices(SENTENCES, k=rng.randint(3, 8)))
+    else:
+        # 少量接近长度上限（1000 字符）的长描述
+        description = "".join(rng.choices(SENTENCES, k=80))[:1000]
+
+    roll = rng.random()
+    if roll < 0.25:
+        due_date = None
+    elif roll < 0.9:
+        due_date = today + timedelta(days=round(rng.gauss(7, 20)))
+    else:
+        due_date = today + timedelta(days=rng.randint(30, 365))
+    # 已过期的任务更可能已完成
+    completed_rate = 0.6 if due_date is not None and due_date < today else 0.2
+    return {
+        "title": title,
+        "description": description,
+        "category": weighted_choice(rng, CATEGORIES),
+        "priority": weighted_choice(rng, PRIORITIES),
+        "due_date": due_date,
+        "is_completed": rng.random() < completed_rate,
+    }
+
+
+def generate_rows(n: int, seed: int, start_index: int = 0, numbered: bool = False) -> Iterator[List[dict]]:
+    """按批生成 n 条任务，创建时间在过去一年内随序号递增，更新时间不早于创建时间
+
+    numbered 为 True 时标题末尾附加序号（如“ #4242”），可以构造只命中一条任务的搜索。
+    """
+    rng = random.Random(seed + start_index)
+    today = date.today()
+    now = datetime.now().replace(microsecond=0)
+    span = timedelta(days=365).total_seconds()
+    batch = []
+    for i in range(start_index, start_index + n):
+        row = generate_task(rng, today)
+        if numbered:
+            row["title"] += f" #{i}"
+        created_at = now - timedelta(seconds=span * (1 - i / max(start_index + n, 1)))
+        updated_at = min(now, created_at + timedelta(seconds=rng.randint(0, 30 * 86400)) if rng.random() < 0.3 else created_at)
+        row.update(created_at=created_at.replace(microsecond=0), updated_at=updated_at.replace(microsecond=0))
+        batch.append(row)
+        if len(batch) == SEED_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+列表序列化基准测试
+
+比较 GET /tasks/ 的两种“查询 + 序列化”路径在不同数据量下的耗时和峰值内存：
+- pydantic：查询 ORM 对象，逐行经过 Pydantic 校验后 dump_json（原实现）
+- fast：只查询所需列的行元组，直接编码为 JSON（core.serialize，orjson 可用时使用 orjson）
+
+两种路径的输出逐字节比较，不一致时报错退出。
+
+用法（在 backend 目录下执行）：
+    python -m benchmarks.serialization_benchmark --sizes 1000 10000 100000
+    python -m benchmarks.serialization_benchmark --sizes 10000 --json serialization_benchmark.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+
+from app.core import serialize
+from app.crud import task as crud_task
+from app.schemas.task import Task as TaskSchema
+from benchmarks.search_benchmark import seed_database
+
+# 设置输出编码为UTF-8（Windows控制台）
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+TASK_LIST_ADAPTER = TypeAdapter(List[TaskSchema])
+
+
+def pydantic_path(db: Session) -> bytes:
+    tasks = crud_task.tasks_query(db).all()
+    return TASK_LIST_ADAPTER.dump_json(TASK_LIST_ADAPTER.validate_python(tasks, from_attributes=True))
+
+
+def fast_path(db: Session) -> bytes:
+    return serialize.encode_task_rows(crud_task.tasks_query(db).with_entities(*crud_task.LIST_COLUMNS).all())
+
+
+PATHS = {"pydantic": pydantic_path, "fast": fast_path}
+
+
+def measure(engine, fn, repeat: int):
+    """返回 (中位耗时毫秒, 峰值内存 MB, 输出)"""
+    timings = []
+    body = b""
+    for _ in range(repeat):
+        with Session(engine) as db:
+            start = time.perf_counter()
+            body = fn(db)
+            timings.append((time.perf_counter() - start) * 1000)
+    # 峰值内存单独测一次（tracemalloc 会拖慢执行，不计入耗时）
+    with Session(engine) as db:
+        tracemalloc.start()
+        fn(db)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return statistics.median(timings), peak / 1024 / 1024, body
+
+
+def run(sizes, repeat: int):
+    results = []
+    encoder = "orjson" if serialize.orjson is not None else "json"
+    print(f"fast 路径编码器: {encoder}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            engine = seed_database(f"sqlite:///{os.path.join(tmp, f'bench_{n}.db')}", n)
+            print(f"\n== {n} 条任务 ==")
+            print(f"{'路径':<10}{'耗时':>14}{'峰值内存':>14}{'响应大小':>14}")
+            outputs = {}
+            row = {"size": n, "encoder": encoder}
+            for name, fn in PATHS.items():
+                ms, peak_mb, body = measure(engine, fn, repeat)
+                outputs[name] = body
+                row[f"{name}_ms"] = round(ms, 3)
+                row[f"{name}_peak_mb"] = round(peak_mb, 2)
+                print(f"{name:<10}{ms:>11.1f} ms{peak_mb:>11.1f} MB{len(body) / 1024:>11.0f} KB")
+            if outputs["pydantic"] != outputs["fast"]:
+                raise SystemExit("两种路径的输出不一致")
+            row["speedup"] = round(row["pydantic_ms"] / row["fast_ms"], 2)
+            print(f"加速比 {row['speedup']:.2f}x，输出一致")
+            results.append(row)
+            engine.dispose()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="列表序列化性能基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="数据量")
+    parser.add_argument("--repeat", type=int, default=5, help="每种路径重复次数（取中位数）")
+    parser.add_argument("--json", help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已写入 {args.json}")
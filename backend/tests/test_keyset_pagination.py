@@ -0,0 +1,129 @@
+# backend/tests/test_keyset_pagination.py
+"""
+游标分页：深页的查询开销不随翻页深度增长，且结果与 OFFSET 分页一致
+
+开销用 SQLite 虚拟机执行的指令数衡量（progress handler 计数），与机器负载无关，结果稳定。
+在 backend 目录下执行：python -m pytest tests
+"""
+import os
+import tempfile
+
+# 应用在导入时读取配置，必须在导入 app 之前设置
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp.name, 'keyset.db')}"
+os.environ["CACHE_BACKEND"] = "off"
+
+import base64  # noqa: E402
+import json  # noqa: E402
+
+import pytest  # noqa: E402
+from pydantic import ValidationError  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.exc import IntegrityError  # noqa: E402
+
+from app.core.database import SessionLocal, engine  # noqa: E402
+from app.crud import search as search_backend  # noqa: E402
+from app.crud import task as task_crud  # noqa: E402
+from app.models.task import Task  # noqa: E402
+from app.schemas.task import TaskUpdate  # noqa: E402
+from benchmarks.api_benchmark import seed_tasks  # noqa: E402
+
+TASKS = 20000
+PAGE_SIZE = 50
+# 进度回调的间隔（虚拟机指令数）
+STEP = 100
+
+
+@pytest.fixture(scope="module")
+def db():
+    seed_tasks(TASKS, seed=7)
+    # SQLite FTS5 全文索引，搜索结果按相关度排序
+    search_backend.setup_search_backend(engine)
+    with SessionLocal() as session:
+        yield session
+
+
+def _page_cost(db, sort_by, depth, **filters):
+    """返回 (从第 depth 行之后取一页的虚拟机指令数, 该页 ID 列表)"""
+    cursor = None
+    if depth:
+        row = task_crud.tasks_query(db, sort_by=sort_by, **filters).offset(depth - 1).limit(1).one()
+        cursor = task_crud.encode_cursor(row, sort_by)
+    steps = [0]
+
+    def count():
+        steps[0] += 1
+        return 0
+
+    raw = db.connection().connection.dbapi_connection
+    raw.set_progress_handler(count, STEP)
+    try:
+        rows, _ = task_crud.get_tasks_page(db, PAGE_SIZE, cursor=cursor, sort_by=sort_by, **filters)
+    finally:
+        raw.set_progress_handler(None, STEP)
+    return steps[0] * STEP, [task.id for task in rows]
+
+
+@pytest.mark.parametrize("sort_by, filters", [
+    (None, {}),
+    ("priority", {}),
+    ("created_at", {}),
+    (None, {"is_completed": False}),
+    ("priority", {"category": "工作"}),
+])
+def test_deep_pages_do_not_scale_with_depth(db, sort_by, filters):
+    total = task_crud.tasks_query(db, sort_by=sort_by, **filters).count()
+    first_cost, _ = _page_cost(db, sort_by, 0, **filters)
+    for depth in (total // 2, total * 9 // 10, total - PAGE_SIZE * 2):
+        cost, ids = _page_cost(db, sort_by, depth, **filters)
+        expected = [
+            task.id for task in
+            task_crud.tasks_query(db, sort_by=sort_by, **filters).offset(depth).limit(PAGE_SIZE)
+        ]
+        assert ids == expected
+        # 逐行过滤到深度 depth 至少需要 depth 次比较；按段在索引中定位时开销与第一页相当
+        assert cost < first_cost * 3, (depth, cost, first_cost)
+
+
+def _walk(db, sort_by, **filters):
+    """按 X-Next-Cursor 逐页读取全部结果，返回 (ID 列表, 第一个游标的排序模式)"""
+    ids, cursor, mode = [], None, None
+    while True:
+        rows, cursor = task_crud.get_tasks_page(db, PAGE_SIZE, cursor=cursor, sort_by=sort_by, **filters)
+        ids += [task.id for task in rows]
+        if cursor is None:
+            return ids, mode
+        mode = mode or task_crud.decode_cursor(cursor, sort_by, ranked="search" in filters)["mode"]
+
+
+@pytest.mark.parametrize("sort_by, filters", [
+    (None, {"search": "体检报告"}),
+    ("relevance", {"search": "学习计划", "category": "学习"}),
+    ("priority", {"search": "体检报告"}),
+])
+def test_search_cursor_pages_match_offset(db, sort_by, filters):
+    ids, mode = _walk(db, sort_by, **filters)
+    expected = [task.id for task in task_crud.tasks_query(db, sort_by=sort_by, **filters)]
+    assert len(expected) > PAGE_SIZE * 2
+    assert mode == ("priority" if sort_by == "priority" else "relevance")
+    assert ids == expected
+
+
+def test_priority_is_never_null(db):
+    # 优先级是排序键：更新时不能显式置空，数据库层面也不允许
+    with pytest.raises(ValidationError):
+        TaskUpdate.model_validate({"priority": None})
+    assert TaskUpdate.model_validate({"title": "x"}).model_dump(exclude_unset=True) == {"title": "x"}
+    with pytest.raises(IntegrityError):
+        db.execute(insert(Task).values(title="x", priority=None))
+    db.rollback()
+
+    # 伪造的空优先级游标按无效游标处理（接口返回 400），而不是生成 priority > NULL 的查询
+    for sort_by in ("priority", None):
+        rows, cursor = task_crud.get_tasks_page(db, 1, sort_by=sort_by)
+        assert cursor is not None
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        payload["p"] = None
+        forged = base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii").rstrip("=")
+        with pytest.raises(ValueError):
+            task_crud.get_tasks_page(db, 1, cursor=forged, sort_by=sort_by)
@@ -0,0 +1,44 @@
+# backend/tests/test_query_plans.py
+"""
+索引回归检查：常用列表查询（crud.query_plans.COMMON_QUERY_SHAPES）的执行计划中不应出现全表扫描或额外排序
+
+与 `python -m app.cli check-query-plans` 相同的检查，在临时 SQLite 数据库上建表、执行迁移并写入数据后执行 EXPLAIN。
+在 backend 目录下执行：python -m pytest tests
+"""
+import os
+import tempfile
+
+# 应用在导入时读取配置，必须在导入 app 之前设置（本测试使用自己的引擎，不使用应用的数据库）
+_tmp = tempfile.TemporaryDirectory()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_tmp.name, 'app.db')}")
+os.environ.setdefault("CACHE_BACKEND", "off")
+
+import pytest  # noqa: E402
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.crud.query_plans import COMMON_QUERY_SHAPES, check_query_plans  # noqa: E402
+from app.models.task import Task  # noqa: E402
+from app.startup import setup_schema  # noqa: E402
+from benchmarks.seed_data import generate_rows  # noqa: E402
+
+TASKS = 5000
+
+
+@pytest.fixture(scope="module")
+def db():
+    engine = create_engine(f"sqlite:///{os.path.join(_tmp.name, 'plans.db')}")
+    setup_schema(engine)
+    with engine.begin() as conn:
+        for rows in generate_rows(TASKS, seed=3):
+            conn.execute(insert(Task), rows)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def test_common_queries_use_indexes(db):
+    results = check_query_plans(db)
+    assert [shape for shape, _, _ in results] == COMMON_QUERY_SHAPES
+    problems = {str(shape or "默认"): problems for shape, _, problems in results if problems}
+    assert problems == {}